@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+API-call and wall-time benchmarks for the automation scripts.
+
+Each entry point runs against a fresh fake repository (see
+scripts/fake_github_server.py) seeded with 10, 100 and 1,000 open PRs. The
+fake server counts requests and bytes per endpoint; ``time.sleep`` is
+replaced with a virtual clock, so mergeability polling costs no real time
+but is still reported as sleep time.
+
+Results are written as JSON. Pass ``--compare`` with an earlier result file
+to print the change in API calls per run, so a regression in API efficiency
+shows up between commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10 100 1000]
+        [--scripts auto_merge_prs ...] [--output results.json]
+        [--compare baseline.json] [--latency 0.0]
+"""
+
+import argparse
+import atexit
+import contextlib
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import github_client  # noqa: E402
+from fake_github_server import FakeClock, FakeRepository, start_server  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_OUTPUT = REPO_ROOT / "benchmarks" / "results" / "latest.json"
+# Large enough that client-side pacing never kicks in during a benchmark.
+BENCHMARK_RATE_LIMIT = 1_000_000
+
+# Entry point -> (command-line arguments, stdin). The date matches the first
+# seeded contribution PR so advanced_code_review has work to do.
+SCENARIOS = {
+    "auto_merge_prs": ([], ""),
+    "resolve_conflicts": (["--auto-resolve"], ""),
+    "pr_status_report": ([], ""),
+    "review_and_merge_prs": (["--auto-merge"], "yes\n"),
+    "close_old_prs": ([], ""),
+    "advanced_code_review": ([], ""),
+}
+# Scenarios seeded with main moved past every PR, so some are conflicted and
+# the rest behind; otherwise resolve_conflicts finds nothing to do.
+STALE_SCENARIOS = {"resolve_conflicts"}
+BENCHMARK_ENV = {
+    "GH_TOKEN3": "benchmark",
+    "GITHUB_HTTP_CACHE": "off",
+    "GITHUB_METRICS_DIR": "off",
+    "GITHUB_MERGE_CHECKPOINT": "off",
+    "GITHUB_PR_STORE": "off",
+    "GITHUB_PR_WAREHOUSE": "off",
+    "GITHUB_REPOSITORY": "ramincsy/Auto",
+    "GITHUB_REPOSITORY_OWNER": "ramincsy",
+    "GITHUB_REPOSITORY_NAME": "Auto",
+    "year": "2026",
+    "month": "04",
+    "day": "02",
+}
+
+
+def reset_clients() -> None:
+    """Close shared clients so every run starts with a cold session."""
+    for client in github_client._clients.values():
+        atexit.unregister(client.close)
+        client.session.close()
+    github_client._clients.clear()
+
+
+def run_scenario(script: str, size: int, seed: int = 1, latency: float = 0.0) -> Dict:
+    """Run one entry point against ``size`` seeded PRs and return its metrics."""
+    args, stdin = SCENARIOS[script]
+    clock = FakeClock()
+    repo = FakeRepository(clock=clock.time)
+    repo.seed(size, seed=seed, main_moved=script in STALE_SCENARIOS)
+    server = start_server(repo, latency=latency, rate_limit=BENCHMARK_RATE_LIMIT)
+    module = importlib.import_module(script)
+
+    env = dict(BENCHMARK_ENV, GITHUB_API_URL=server.url)
+    output = io.StringIO()
+    exit_code = 0
+    reset_clients()
+    started = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch.dict(os.environ, env))
+            stack.enter_context(mock.patch.object(time, "sleep", clock.sleep))
+            stack.enter_context(mock.patch.object(sys, "argv", [script, *args]))
+            stack.enter_context(mock.patch.object(sys, "stdin", io.StringIO(stdin)))
+            stack.enter_context(contextlib.redirect_stdout(output))
+            # Some entry points return a count from main(); only SystemExit
+            # carries an exit code.
+            try:
+                module.main()
+            except SystemExit as exc:
+                if exc.code is None or isinstance(exc.code, int):
+                    exit_code = exc.code or 0
+                else:
+                    exit_code = 1
+        wall_time = time.perf_counter() - started
+    finally:
+        reset_clients()
+        server.shutdown()
+        server.server_close()
+
+    stats = server.stats.as_dict()
+    prs = repo.prs.values()
+    return {
+        "script": script,
+        "prs": size,
+        "exit_code": exit_code,
+        "wall_time": round(wall_time, 4),
+        "sleep_time": round(clock.slept, 3),
+        "requests": stats["total_requests"],
+        "rate_limit_cost": stats["rate_limit_cost"],
+        "bytes_in": stats["bytes_in"],
+        "bytes_out": stats["bytes_out"],
+        "merged": sum(1 for pr in prs if pr.merged),
+        "closed": sum(1 for pr in prs if pr.state == "closed" and not pr.merged),
+        "endpoints": stats["endpoints"],
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: List[Dict], baseline: Dict) -> None:
+    """Print the change in requests and sleep time against ``baseline``."""
+    previous = {(run["script"], run["prs"]): run for run in baseline.get("runs", [])}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for run in results:
+        old = previous.get((run["script"], run["prs"]))
+        if old is None:
+            continue
+        delta = run["requests"] - old["requests"]
+        sleep_delta = run["sleep_time"] - old["sleep_time"]
+        print(
+            f"  {run['script']:<22} {run['prs']:>5} PRs  "
+            f"requests {old['requests']} -> {run['requests']} ({delta:+d})  "
+            f"sleep {old['sleep_time']:.0f}s -> {run['sleep_time']:.0f}s "
+            f"({sleep_delta:+.0f}s)"
+        )
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--scripts", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", type=Path, help="earlier result file")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("📊 Running API benchmarks...\n")
+    runs = []
+    for size in args.sizes:
+        for script in args.scripts:
+            run = run_scenario(script, size, seed=args.seed, latency=args.latency)
+            runs.append(run)
+            print(
+                f"  {script:<22} {size:>5} PRs  {run['requests']:>6} requests  "
+                f"{run['bytes_out'] / 1024:>9.1f} KiB  "
+                f"sleep {run['sleep_time']:>7.0f}s  wall {run['wall_time']:.2f}s"
+            )
+
+    report = {
+        "commit": git_commit(),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "latency": args.latency,
+        "seed": args.seed,
+        "runs": runs,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        compare(runs, json.loads(args.compare.read_text()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
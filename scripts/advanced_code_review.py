@@ -11,25 +11,19 @@ for contribution PRs, including code quality checks and suggestions.
 
 import os
 import sys
-import requests
 from datetime import datetime
 
+from github_client import (
+    GitHubAPIError,
+    get_client,
+    get_github_token,
+    map_concurrent,
+)
 
-def get_github_token():
-    """Get GitHub token from environment."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if token and not os.environ.get("GH_TOKEN3"):
-        print(
-            "⚠️ Warning: Using fallback GitHub token. Set GH_TOKEN3 to a personal access token so reviews and PR creation count on your GitHub profile."
-        )
-    if not token:
-        print("❌ Error: No GitHub token found.")
-        sys.exit(1)
-    return token
+FALLBACK_TOKEN_WARNING = (
+    "Using fallback GitHub token. Set GH_TOKEN3 to a personal access token so "
+    "reviews and PR creation count on your GitHub profile."
+)
 
 
 def get_repo_info():
@@ -69,34 +63,24 @@ def get_date_string():
 
 def get_contribution_prs(owner, repo, token, date_str, limit=None):
     """Get contribution PRs for today."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls"
 
-    params = {"state": "open", "per_page": 100}
+    params = {"state": "open"}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code != 200:
-            print(f"❌ Error fetching PRs: {response.status_code}")
-            return []
-
-        all_prs = response.json()
-
-        # Filter for contribution PRs from today
+        # Filter for contribution PRs from today, stopping once the limit is hit
         contribution_prs = []
-        for pr in all_prs:
+        for pr in get_client(token).paginate(url, params=params):
             title = pr.get("title", "")
             if "Contribution #" in title and date_str in title:
                 contribution_prs.append(pr)
-
-        # Limit if specified
-        if limit and len(contribution_prs) > limit:
-            contribution_prs = contribution_prs[:limit]
+                if limit and len(contribution_prs) >= limit:
+                    break
 
         return contribution_prs
+    except GitHubAPIError as e:
+        print(f"❌ Error fetching PRs: {e.response.status_code}")
+        return []
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         return []
@@ -104,14 +88,10 @@ def get_contribution_prs(owner, repo, token, date_str, limit=None):
 
 def analyze_pr_changes(owner, repo, token, pr_number):
     """Analyze the changes in a PR."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_client(token).get(url)
         if response.status_code != 200:
             return None
 
@@ -177,24 +157,21 @@ It provides structural analysis but does not replace human code review for corre
     return comment
 
 
-def submit_advanced_review(owner, repo, token, pr_number, pr_title):
+def submit_advanced_review(owner, repo, token, pr_number, pr_title, analysis=None):
     """Submit an advanced code review."""
-    # Analyze the PR changes
-    analysis = analyze_pr_changes(owner, repo, token, pr_number)
+    # Analyze the PR changes unless the caller already did
+    if analysis is None:
+        analysis = analyze_pr_changes(owner, repo, token, pr_number)
 
     # Generate review comment
     review_body = generate_review_comment(analysis, pr_title)
 
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
 
     data = {"event": "COMMENT", "body": review_body}
 
     try:
-        response = requests.post(url, json=data, headers=headers, timeout=30)
+        response = get_client(token).post(url, json=data)
         if response.status_code == 200:
             print(f"    ✅ Advanced review submitted for PR #{pr_number}")
             return True
@@ -211,7 +188,7 @@ def submit_advanced_review(owner, repo, token, pr_number, pr_title):
 
 def main():
     """Main function."""
-    token = get_github_token()
+    token = get_github_token(fallback_warning=FALLBACK_TOKEN_WARNING)
     owner, repo = get_repo_info()
     date_str = get_date_string()
 
@@ -237,13 +214,20 @@ def main():
 
     reviewed_count = 0
 
+    # Analyze all PRs in parallel, then submit reviews one at a time
+    analyses = map_concurrent(
+        lambda pr: analyze_pr_changes(owner, repo, token, pr["number"]), prs
+    )
+
     # Review each PR
-    for pr in prs:
+    for pr, analysis in zip(prs, analyses):
         pr_number = pr["number"]
         pr_title = pr["title"]
         print(f"  Analyzing PR #{pr_number}: {pr_title}")
 
-        if submit_advanced_review(owner, repo, token, pr_number, pr_title):
+        if submit_advanced_review(
+            owner, repo, token, pr_number, pr_title, analysis=analysis
+        ):
             reviewed_count += 1
 
     if reviewed_count > 0:
@@ -1,31 +1,55 @@
 #!/usr/bin/env python3
 """
 Auto-merge daily pull requests in a conflict-aware order.
+
+Usage:
+    python scripts/auto_merge_prs.py [--plan-only] [--merge-train] [--local-check]
+        [--local-resolve] [--optimistic] [--native-auto-merge]
+
+PRs are grouped into batches with disjoint changed files (see
+merge_planner.py). Use --plan-only to print the plan and its predicted
+cost without merging anything.
+
+With --merge-train the PR heads are first merged locally in plan order and
+pushed to main in one push (see merge_train.py); only PRs that conflict
+locally go through the API.
+
+With --local-check each batch is checked against origin/main with
+git merge-tree (see conflict_check.py): PRs that merge cleanly are merged
+without waiting on GitHub's mergeable flag, and conflicting PRs are
+reported without an update-branch call.
+
+With --local-resolve, conflicted PRs are first merged with main locally
+and pushed back to their branches (see local_update.py).
+
+With --optimistic no PR is probed for mergeability first: each one not
+known to be behind or conflicted is merged with its head SHA pinned, and
+only a 405 or 409 response sends it through update-branch and polling.
+
+With --native-auto-merge, GitHub's auto-merge is enabled in one batched
+GraphQL pass on every PR that can merge on its own (see
+native_auto_merge.py). GitHub merges those as soon as they qualify; only
+PRs it refuses auto-merge for, and PRs that need a branch update, go
+through the loop. The repository must allow auto-merge.
+
+The work is done by the merge pipeline (see merge_pipeline.py); this
+script runs it over every daily PR and prints the summary. Work that does
+not fit before the deadline is checkpointed and resumed by the next run
+(see merge_scheduler.py).
 """
 
 import os
 import sys
-import time
-from datetime import datetime, timezone
-from typing import Dict, List
-
-import requests
 
+from github_client import get_github_token
+from merge_pipeline import MergePipeline
+from merge_tracker import CONFLICT, DEFERRED, FAILED, MERGED
+from native_auto_merge import AUTO_MERGE
 
-def get_github_token() -> str:
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if token and not os.environ.get("GH_TOKEN3"):
-        print(
-            "⚠️ Warning: Using fallback GitHub token. Set GH_TOKEN3 to a personal access token for deterministic workflow behavior."
-        )
-    if not token:
-        print("Error: No GitHub token found.")
-        sys.exit(1)
-    return token
+FALLBACK_TOKEN_WARNING = (
+    "Using fallback GitHub token. Set GH_TOKEN3 to a personal access token "
+    "for deterministic workflow behavior."
+)
 
 
 def get_repo_info() -> tuple[str, str]:
@@ -36,200 +60,55 @@ def get_repo_info() -> tuple[str, str]:
     return tuple(repo.split("/", 1))
 
 
-def get_headers(token: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
-
-def get_open_prs(owner: str, repo: str, token: str) -> List[Dict]:
-    response = requests.get(
-        f"https://api.github.com/repos/{owner}/{repo}/pulls",
-        headers=get_headers(token),
-        params={"state": "open", "per_page": 100},
-        timeout=30,
-    )
-    if response.status_code != 200:
-        print(f"Error fetching PRs: {response.status_code}")
-        sys.exit(1)
-    return response.json()
-
-
-def is_daily_pr(pr: Dict) -> bool:
-    title = pr.get("title", "")
-    return any(
-        marker in title
-        for marker in [
-            "Daily Update",
-            "daily-contribution",
-            "Contribution #",
-            "Contribution ",
-        ]
-    )
-
-
-def pr_sort_key(pr: Dict) -> datetime:
-    created_at = pr.get("created_at")
-    if not created_at:
-        return datetime.max.replace(tzinfo=timezone.utc)
-    return datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-
-
-def check_pr_details(owner: str, repo: str, pr_number: int, token: str) -> Dict:
-    try:
-        response = requests.get(
-            f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}",
-            headers=get_headers(token),
-            timeout=30,
-        )
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                "mergeable": data.get("mergeable"),
-                "mergeable_state": data.get("mergeable_state"),
-                "draft": data.get("draft", False),
-            }
-    except requests.exceptions.RequestException as exc:
-        print(f"Network error checking PR #{pr_number}: {exc}")
-    return {"mergeable": False, "mergeable_state": "unknown", "draft": False}
-
-
-def update_pr_branch(owner: str, repo: str, pr_number: int, token: str) -> bool:
-    headers = get_headers(token)
-    headers["Accept"] = "application/vnd.github.z3950-preview+json"
-    try:
-        response = requests.post(
-            f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/update-branch",
-            headers=headers,
-            timeout=30,
-        )
-    except requests.exceptions.RequestException as exc:
-        print(f"    Network error updating branch: {exc}")
-        return False
-
-    if response.status_code in {200, 202}:
-        return True
-
-    print(f"    update-branch failed: {response.status_code}")
-    return False
-
-
-def merge_pr(owner: str, repo: str, pr_number: int, token: str) -> bool:
-    try:
-        response = requests.put(
-            f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/merge",
-            headers=get_headers(token),
-            json={"merge_method": "merge"},
-            timeout=30,
-        )
-    except requests.exceptions.RequestException as exc:
-        print(f"    Network error merging PR #{pr_number}: {exc}")
-        return False
-
-    if response.status_code == 200:
-        return True
-
-    print(f"    merge failed: {response.status_code}")
-    return False
-
-
-def wait_for_mergeable(
-    owner: str, repo: str, pr_number: int, token: str, retries: int = 4, delay: int = 5
-) -> Dict:
-    details = check_pr_details(owner, repo, pr_number, token)
-    attempts = 0
-    while attempts < retries and details["mergeable"] is None:
-        attempts += 1
-        print(f"  Waiting for PR #{pr_number} mergeability ({attempts}/{retries})...")
-        time.sleep(delay)
-        details = check_pr_details(owner, repo, pr_number, token)
-    return details
-
-
-def wait_after_update(owner: str, repo: str, pr_number: int, token: str) -> Dict:
-    details = {"mergeable": False, "mergeable_state": "unknown", "draft": False}
-    for attempt in range(1, 5):
-        print(f"  Rechecking PR #{pr_number} after branch update ({attempt}/4)...")
-        time.sleep(10)
-        details = wait_for_mergeable(owner, repo, pr_number, token, retries=2, delay=3)
-        if (
-            details.get("mergeable") is True
-            or details.get("mergeable_state") == "clean"
-        ):
-            break
-    return details
-
-
 def main() -> None:
     print("Starting auto-merge process...")
 
-    token = get_github_token()
+    token = get_github_token(fallback_warning=FALLBACK_TOKEN_WARNING)
     owner, repo = get_repo_info()
-    open_prs = get_open_prs(owner, repo, token)
-    daily_prs = sorted((pr for pr in open_prs if is_daily_pr(pr)), key=pr_sort_key)
+    plan_only = "--plan-only" in sys.argv
+
+    pipeline = MergePipeline(
+        owner,
+        repo,
+        token,
+        local_check="--local-check" in sys.argv,
+        local_resolve="--local-resolve" in sys.argv,
+        merge_train="--merge-train" in sys.argv,
+        optimistic="--optimistic" in sys.argv,
+        native_auto_merge="--native-auto-merge" in sys.argv,
+    )
+    report = pipeline.run(plan_only=plan_only)
 
-    if not daily_prs:
+    if not report.prs:
         print("No daily contribution PRs to merge.")
         return
+    if plan_only:
+        return
 
-    print(f"Found {len(daily_prs)} daily contribution PR(s).")
-
-    merged_count = 0
-    failed_count = 0
-    conflict_count = 0
-
-    for pr in daily_prs:
-        pr_number = pr["number"]
-        print(f"Checking PR #{pr_number}: {pr['title']}")
-
-        details = wait_for_mergeable(owner, repo, pr_number, token)
-        if details.get("draft"):
-            print(f"  PR #{pr_number} is a draft. Skipping.")
-            continue
-
-        mergeable = details.get("mergeable")
-        mergeable_state = details.get("mergeable_state")
-
-        if mergeable_state in {"dirty", "behind"} or mergeable is False:
-            print(f"  PR #{pr_number} needs branch update (state: {mergeable_state})")
-            if update_pr_branch(owner, repo, pr_number, token):
-                details = wait_after_update(owner, repo, pr_number, token)
-                mergeable = details.get("mergeable")
-                mergeable_state = details.get("mergeable_state")
-            else:
-                failed_count += 1
-                if mergeable_state == "dirty":
-                    conflict_count += 1
-                continue
-
-        if mergeable is None:
-            print(f"  PR #{pr_number} is still being computed.")
-            failed_count += 1
-            continue
-
-        if not mergeable:
+    merged_count = report.count(MERGED)
+    conflict_count = report.count(CONFLICT)
+    failed_count = report.count(FAILED)
+    deferred_count = report.count(DEFERRED)
+    client = pipeline.client
+    if deferred_count:
+        if client.unavailable:
+            print("GitHub API keeps failing; stopped early.")
+        elif client.rate_limiter.is_low():
             print(
-                f"  PR #{pr_number} is not mergeable after retry (state: {mergeable_state})"
+                "GitHub API budget is low "
+                f"({client.rate_limiter.remaining()} requests left)."
             )
-            failed_count += 1
-            if mergeable_state == "dirty":
-                conflict_count += 1
-            continue
-
-        print(f"  Merging PR #{pr_number}...")
-        if merge_pr(owner, repo, pr_number, token):
-            print(f"  Successfully merged PR #{pr_number}")
-            merged_count += 1
-        else:
-            print(f"  Failed to merge PR #{pr_number}")
-            failed_count += 1
+        print(f"{deferred_count} PR(s) left for the next run.")
 
     print("\nAuto-merge Summary:")
     print(f"  Merged: {merged_count}")
+    if report.count(AUTO_MERGE):
+        print(f"  Left to GitHub auto-merge: {report.count(AUTO_MERGE)}")
     print(f"  Conflicts remaining: {conflict_count}")
     print(f"  Failed: {failed_count}")
-    print(f"  Total: {len(daily_prs)}")
+    if deferred_count:
+        print(f"  Deferred (rate limit or API errors): {deferred_count}")
+    print(f"  Total: {len(report.prs)}")
 
 
 if __name__ == "__main__":
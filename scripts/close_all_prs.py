@@ -8,75 +8,36 @@ import sys
 
 import requests
 
-
-def get_github_token():
-    """Get GitHub token from environment variables."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if not token:
-        print("Error: No GitHub token found.")
-        print("Please set GH_TOKEN3, GITHUB_TOKEN, or GH_TOKEN environment variable.")
-        print("\nExample:")
-        print("  export GH_TOKEN3='your_token_here'")
-        print("  python scripts/close_all_prs.py")
-        sys.exit(1)
-    return token
+from github_client import GitHubAPIError, get_client, get_github_token
 
 
 def get_open_prs(owner, repo, token):
     """Fetch all open pull requests."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-    params = {"state": "open", "per_page": 100}
-
-    all_prs = []
-    page = 1
-
-    while True:
-        params["page"] = page
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-        except requests.exceptions.RequestException as exc:
-            print(f"Network error fetching PRs: {exc}")
-            sys.exit(1)
-
-        if response.status_code != 200:
-            print(f"Error fetching PRs: {response.status_code}")
-            try:
-                print(response.json())
-            except ValueError:
-                print(response.text)
-            sys.exit(1)
-
-        prs = response.json()
-        if not prs:
-            break
-
-        all_prs.extend(prs)
-        page += 1
-        if len(prs) < 100:
-            break
+    url = f"/repos/{owner}/{repo}/pulls"
+    params = {"state": "open"}
 
-    return all_prs
+    try:
+        return list(get_client(token).paginate(url, params=params))
+    except GitHubAPIError as exc:
+        response = exc.response
+        print(f"Error fetching PRs: {response.status_code}")
+        try:
+            print(response.json())
+        except ValueError:
+            print(response.text)
+        sys.exit(1)
+    except requests.exceptions.RequestException as exc:
+        print(f"Network error fetching PRs: {exc}")
+        sys.exit(1)
 
 
 def close_pr(owner, repo, pr_number, token):
     """Close a specific pull request."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}"
     data = {"state": "closed"}
 
     try:
-        response = requests.patch(url, headers=headers, json=data, timeout=30)
+        response = get_client(token).patch(url, json=data)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
@@ -107,8 +68,15 @@ def main():
 
     closed_count = 0
     failed_count = 0
+    rate_limiter = get_client(token).rate_limiter
     for pr in open_prs:
         pr_number = pr["number"]
+        if rate_limiter.is_low():
+            print(
+                f"\nGitHub API budget is low ({rate_limiter.remaining()} requests "
+                "left). Stopping; run the script again after the rate limit resets."
+            )
+            break
         print(f"Closing PR #{pr_number}...", end=" ")
         if close_pr(owner, repo, pr_number, token):
             print("OK")
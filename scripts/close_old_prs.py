@@ -11,21 +11,9 @@ Use --dry-run to see what would be closed without actually closing.
 
 import os
 import sys
-import requests
 from datetime import datetime, timedelta, timezone
 
-
-def get_github_token():
-    """Get GitHub token from environment."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if not token:
-        print("❌ Error: No GitHub token found.")
-        sys.exit(1)
-    return token
+from github_client import GitHubAPIError, get_client, get_github_token
 
 
 def get_repo_info():
@@ -37,34 +25,28 @@ def get_repo_info():
 
 def get_old_contribution_prs(owner, repo, token, days_old=7):
     """Get contribution PRs older than specified days."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
-    params = {"state": "open", "per_page": 100}
+    url = f"/repos/{owner}/{repo}/pulls"
+    # Oldest first, so listing can stop at the first PR newer than the cutoff.
+    params = {"state": "open", "sort": "created", "direction": "asc"}
 
     cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code != 200:
-            print(f"❌ Error fetching PRs: {response.status_code}")
-            return []
-
-        all_prs = response.json()
         old_prs = []
 
-        for pr in all_prs:
+        for pr in get_client(token).paginate(url, params=params):
             created_at_str = pr["created_at"].replace("Z", "+00:00")
             created_at = datetime.fromisoformat(created_at_str)
-            if created_at < cutoff_date:
-                title = pr.get("title", "")
-                if "Daily Update" in title or "Contribution #" in title:
-                    old_prs.append(pr)
+            if created_at >= cutoff_date:
+                break
+            title = pr.get("title", "")
+            if "Daily Update" in title or "Contribution #" in title:
+                old_prs.append(pr)
 
         return old_prs
+    except GitHubAPIError as e:
+        print(f"❌ Error fetching PRs: {e.response.status_code}")
+        return []
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         return []
@@ -76,16 +58,11 @@ def close_pr(owner, repo, token, pr_number, pr_title, dry_run=False):
         print(f"    [DRY RUN] Would close PR #{pr_number}: {pr_title}")
         return True
 
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}"
     data = {"state": "closed"}
 
     try:
-        response = requests.patch(url, json=data, headers=headers, timeout=30)
+        response = get_client(token).patch(url, json=data)
         if response.status_code == 200:
             print(f"    ✅ Closed PR #{pr_number}: {pr_title}")
             return True
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Predict merge conflicts locally instead of waiting on GitHub.
+
+GitHub computes ``mergeable`` in the background and returns ``null`` until it
+is done, so the merge scripts poll every PR for seconds at a time. With the
+PR head SHAs from the listing, ``git merge-tree --write-tree`` (git 2.38+)
+answers the same question in milliseconds, in the Actions checkout, without
+touching the working tree:
+
+- exit 0: the head merges cleanly into ``origin/main``
+- exit 1: the merge conflicts
+
+Anything else is ambiguous and left to the API: a head that could not be
+fetched or no longer matches the listed SHA, a git without
+``--write-tree``, or a merge-tree error.
+
+Usage:
+    checker = LocalConflictChecker()
+    if checker.fetch(prs):
+        predictions = checker.predict_all(prs)  # {number: "clean" | ...}
+    checker.close()
+"""
+
+from typing import Dict, List, Optional
+
+from git_ops import (
+    DEFAULT_BASE,
+    DEFAULT_REMOTE,
+    delete_pr_heads,
+    fetch_base,
+    fetch_pr_heads,
+    run_git_process,
+)
+
+# Predictions, named after the mergeable_state GitHub would report.
+CLEAN = "clean"
+DIRTY = "dirty"
+
+
+def merge_tree(
+    base_sha: str, head_sha: str, cwd: Optional[str] = None
+) -> Optional[str]:
+    """Return CLEAN or DIRTY for merging ``head_sha`` into ``base_sha``."""
+    returncode, _, _ = run_git_process(
+        ["merge-tree", "--write-tree", "--no-messages", base_sha, head_sha], cwd
+    )
+    if returncode == 0:
+        return CLEAN
+    if returncode == 1:
+        return DIRTY
+    return None
+
+
+class LocalConflictChecker:
+    """Fetch PR heads once and predict their mergeability against the base."""
+
+    def __init__(
+        self,
+        remote: str = DEFAULT_REMOTE,
+        base: str = DEFAULT_BASE,
+        cwd: Optional[str] = None,
+    ):
+        self.remote = remote
+        self.base = base
+        self.cwd = cwd
+        self.base_sha: Optional[str] = None
+        self.heads: Dict[int, str] = {}
+
+    def fetch(self, prs: List[Dict]) -> bool:
+        """Fetch the base and the heads of ``prs``; False if git cannot help."""
+        self.base_sha = fetch_base(self.remote, self.base, self.cwd)
+        if not self.base_sha:
+            return False
+        if merge_tree(self.base_sha, self.base_sha, self.cwd) != CLEAN:
+            print("  git merge-tree --write-tree is unavailable (needs git 2.38+)")
+            self.base_sha = None
+            return False
+        self.heads = fetch_pr_heads([pr["number"] for pr in prs], self.remote, self.cwd)
+        return True
+
+    def refresh_base(self) -> None:
+        """Fetch the base again after merges moved it."""
+        if self.base_sha:
+            self.base_sha = fetch_base(self.remote, self.base, self.cwd)
+
+    def predict(self, pr: Dict) -> Optional[str]:
+        """Return CLEAN, DIRTY, or None when only GitHub can tell."""
+        sha = self.heads.get(pr["number"])
+        expected = pr.get("head", {}).get("sha") or pr.get("head_sha")
+        if not self.base_sha or not sha or (expected and sha != expected):
+            return None
+        return merge_tree(self.base_sha, sha, self.cwd)
+
+    def predict_all(self, prs: List[Dict]) -> Dict[int, Optional[str]]:
+        """Predict every PR in ``prs`` and print how many were decided."""
+        predictions = {pr["number"]: self.predict(pr) for pr in prs}
+        values = list(predictions.values())
+        print(
+            f"Local check: {values.count(CLEAN)} clean, "
+            f"{values.count(DIRTY)} conflicting, "
+            f"{values.count(None)} left to GitHub"
+        )
+        return predictions
+
+    def close(self) -> None:
+        delete_pr_heads(list(self.heads), self.cwd)
+        self.heads = {}
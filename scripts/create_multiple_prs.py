@@ -11,25 +11,14 @@ Default:
 
 import os
 import sys
-import requests
 from datetime import datetime
 
+from github_client import get_client, get_github_token
 
-def get_github_token():
-    """Get GitHub token from environment."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if token and not os.environ.get("GH_TOKEN3"):
-        print(
-            "⚠️ Warning: Using fallback GitHub token. Set GH_TOKEN3 to a personal access token so contributions count on your GitHub profile."
-        )
-    if not token:
-        print("❌ Error: No GitHub token found.")
-        sys.exit(1)
-    return token
+FALLBACK_TOKEN_WARNING = (
+    "Using fallback GitHub token. Set GH_TOKEN3 to a personal access token so "
+    "contributions count on your GitHub profile."
+)
 
 
 def get_repo_info():
@@ -95,11 +84,7 @@ def create_pr_for_contribution(owner, repo, token, date_str, index):
     Returns:
         PR number if successful, None otherwise
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls"
 
     # Create unique branch name for each contribution
     branch_name = f"contribution-{date_str}-{index}"
@@ -149,17 +134,15 @@ Review the generated content before merging.
 
     try:
         # Check if branch exists first
-        branch_url = (
-            f"https://api.github.com/repos/{owner}/{repo}/branches/{branch_name}"
-        )
-        branch_response = requests.get(branch_url, headers=headers, timeout=10)
+        branch_url = f"/repos/{owner}/{repo}/branches/{branch_name}"
+        branch_response = get_client(token).get(branch_url, timeout=10)
 
         if branch_response.status_code != 200:
             print(f"  ⏭️  Branch '{branch_name}' does not exist (skipped)")
             return None
 
         # Create PR
-        response = requests.post(url, json=data, headers=headers, timeout=10)
+        response = get_client(token).post(url, json=data, timeout=10)
 
         if response.status_code == 201:
             pr_data = response.json()
@@ -182,7 +165,7 @@ Review the generated content before merging.
 
 def main():
     """Main function."""
-    token = get_github_token()
+    token = get_github_token(fallback_warning=FALLBACK_TOKEN_WARNING)
     owner, repo = get_repo_info()
     date_str = get_date_string()
     count = get_bulk_count()
@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub API, for offline testing and benchmarking.
+
+Serves the REST and GraphQL endpoints the merge scripts use from an
+in-memory repository: pull request listings and files (with Link
+pagination), details, merge, update-branch, reviews, branches, the open-PR
+GraphQL snapshot and the ``enablePullRequestAutoMerge`` mutation. Responses
+carry ETags and X-RateLimit headers like the real API.
+
+Mergeability is computed asynchronously the way GitHub does it: after a PR
+is opened or updated, or after ``main`` moves, ``mergeable`` is ``null``
+for ``--mergeable-delay`` seconds. A PR is ``dirty`` when ``main`` gained a
+commit touching one of its files since it branched, ``blocked`` while it
+waits on a required review or check (``pr.blocked``), ``behind`` when ``main``
+moved otherwise, and ``clean`` when it is up to date.
+
+PRs with auto-merge enabled are merged by the server as soon as they are
+``clean``, checked before every request. As on GitHub, auto-merge cannot be
+enabled on a PR that is already clean or is a draft, or when the repository
+does not allow it (``allow_auto_merge``).
+
+Usage:
+    python scripts/fake_github_server.py [--prs 100] [--port 8765]
+        [--mergeable-delay 3] [--latency 0.05] [--seed 1]
+
+    GITHUB_API_URL=http://127.0.0.1:8765 GH_TOKEN3=fake \\
+        GITHUB_REPOSITORY=ramincsy/Auto python scripts/auto_merge_prs.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+DEFAULT_OWNER = "ramincsy"
+DEFAULT_REPO = "Auto"
+RATE_LIMIT = 5000
+RATE_WINDOW = 3600
+START_TIME = datetime(2026, 4, 1, tzinfo=timezone.utc)
+# Benchmarks replace time.sleep with a virtual clock; latency stays real.
+_real_sleep = time.sleep
+
+# (method, route template, pattern) for every endpoint the scripts call.
+ROUTES = [
+    ("GET", "/repos/{owner}/{repo}", r"^/repos/[^/]+/[^/]+$"),
+    ("GET", "/repos/{owner}/{repo}/pulls", r"^/repos/[^/]+/[^/]+/pulls$"),
+    ("GET", "/repos/{owner}/{repo}/pulls/{n}", r"^/repos/[^/]+/[^/]+/pulls/\d+$"),
+    ("PATCH", "/repos/{owner}/{repo}/pulls/{n}", r"^/repos/[^/]+/[^/]+/pulls/\d+$"),
+    (
+        "GET",
+        "/repos/{owner}/{repo}/pulls/{n}/files",
+        r"^/repos/[^/]+/[^/]+/pulls/\d+/files$",
+    ),
+    (
+        "PUT",
+        "/repos/{owner}/{repo}/pulls/{n}/merge",
+        r"^/repos/[^/]+/[^/]+/pulls/\d+/merge$",
+    ),
+    (
+        "POST",
+        "/repos/{owner}/{repo}/pulls/{n}/update-branch",
+        r"^/repos/[^/]+/[^/]+/pulls/\d+/update-branch$",
+    ),
+    (
+        "GET",
+        "/repos/{owner}/{repo}/pulls/{n}/reviews",
+        r"^/repos/[^/]+/[^/]+/pulls/\d+/reviews$",
+    ),
+    (
+        "POST",
+        "/repos/{owner}/{repo}/pulls/{n}/reviews",
+        r"^/repos/[^/]+/[^/]+/pulls/\d+/reviews$",
+    ),
+    (
+        "GET",
+        "/repos/{owner}/{repo}/branches/{branch}",
+        r"^/repos/[^/]+/[^/]+/branches/.+$",
+    ),
+    ("POST", "/graphql", r"^/graphql$"),
+]
+
+
+class FakeClock:
+    """Virtual clock; ``sleep`` advances time instead of blocking."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.slept = 0.0
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.now += max(seconds, 0.0)
+            self.slept += max(seconds, 0.0)
+
+
+def iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_sha(*parts) -> str:
+    return hashlib.sha1("/".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class FakePullRequest:
+    """In-memory pull request state."""
+
+    def __init__(self, number: int, title: str, head_ref: str, files: List[str]):
+        self.number = number
+        self.title = title
+        self.head_ref = head_ref
+        self.files = list(files)
+        self.draft = False
+        self.state = "open"
+        self.merged = False
+        self.head_sha = make_sha("head", number, 0)
+        self.revision = 0
+        self.base_index = 0
+        self.created_at = 0.0
+        self.updated_at = 0.0
+        self.closed_at: Optional[float] = None
+        self.merged_at: Optional[float] = None
+        self.ready_at = 0.0
+        self.reviews: List[Dict] = []
+        self.node_id = f"PR_{number}"
+        self.auto_merge_method: Optional[str] = None
+        # Waiting on a required review or check.
+        self.blocked = False
+
+
+class FakeRepository:
+    """In-memory repository with ``main`` history and pull requests."""
+
+    def __init__(
+        self,
+        owner: str = DEFAULT_OWNER,
+        name: str = DEFAULT_REPO,
+        mergeable_delay: float = 3.0,
+        strict: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.owner = owner
+        self.name = name
+        self.mergeable_delay = mergeable_delay
+        # Mirrors branch protection requiring branches to be up to date.
+        self.strict = strict
+        self.allow_auto_merge = True
+        self.clock = clock
+        self.epoch = clock()
+        self.main: List[Dict] = [{"sha": make_sha("main", 0), "files": set()}]
+        self.prs: Dict[int, FakePullRequest] = {}
+        self.lock = threading.RLock()
+
+    # -- state -------------------------------------------------------------
+
+    def timestamp(self, moment: float) -> str:
+        return iso(START_TIME + timedelta(seconds=moment - self.epoch))
+
+    @property
+    def main_sha(self) -> str:
+        return self.main[-1]["sha"]
+
+    def add_pr(
+        self,
+        title: str,
+        files: List[str],
+        head_ref: Optional[str] = None,
+        created_offset: float = 0.0,
+        draft: bool = False,
+    ) -> FakePullRequest:
+        with self.lock:
+            number = len(self.prs) + 1
+            pr = FakePullRequest(number, title, head_ref or f"pr-{number}", files)
+            pr.draft = draft
+            pr.base_index = len(self.main) - 1
+            pr.created_at = pr.updated_at = self.clock() + created_offset
+            pr.ready_at = self.clock() + self.mergeable_delay
+            self.prs[number] = pr
+            return pr
+
+    def seed(
+        self,
+        count: int,
+        seed: int = 1,
+        readme_share: float = 0.3,
+        main_moved: bool = False,
+    ) -> None:
+        """Create ``count`` open daily and contribution PRs.
+
+        About ``readme_share`` of them also touch README.md, so merging one
+        leaves the others conflicted, as with the real daily PRs. With
+        ``main_moved``, main gains a README.md commit after they branched:
+        those PRs start ``dirty`` and the rest ``behind``.
+        """
+        rng = random.Random(seed)
+        for index in range(count):
+            day = START_TIME + timedelta(hours=12 * index)
+            date = day.strftime("%Y-%m-%d")
+            period = "morning" if day.hour < 12 else "afternoon"
+            offset = -(count - index) * 12 * 3600.0
+            if index % 4 == 3:
+                title = f"Contribution #{index} - {date}"
+                head_ref = f"contribution-{date}-{index}"
+                files = [
+                    f"updates/{date[:4]}/{date[5:7]}/{date[8:]}-contribution-{index}.md"
+                ]
+            else:
+                title = f"Daily Update - {date} ({period})"
+                head_ref = f"daily-contribution-{date}-{period}-{index}"
+                files = [f"updates/{date[:4]}/{date[5:7]}/{date[8:]}-{period}.md"]
+            if rng.random() < readme_share:
+                files.append("README.md")
+            self.add_pr(title, files, head_ref=head_ref, created_offset=offset)
+        if main_moved:
+            self.advance_main(["README.md"], "Update README")
+        # Seeded PRs start with mergeability already computed.
+        for pr in self.prs.values():
+            pr.ready_at = self.clock()
+
+    def touched_since(self, pr: FakePullRequest) -> Set[str]:
+        touched: Set[str] = set()
+        for commit in self.main[pr.base_index + 1 :]:
+            touched |= commit["files"]
+        return touched
+
+    def mergeability(self, pr: FakePullRequest, force: bool = False) -> Tuple:
+        """Return ``(mergeable, mergeable_state)`` as GitHub reports them."""
+        if pr.state != "open":
+            return False, "unknown"
+        if not force and self.clock() < pr.ready_at:
+            return None, "unknown"
+        if self.touched_since(pr) & set(pr.files):
+            return False, "dirty"
+        if pr.draft:
+            return True, "draft"
+        if pr.blocked:
+            return True, "blocked"
+        if pr.base_index < len(self.main) - 1 and self.strict:
+            return True, "behind"
+        return True, "clean"
+
+    def advance_main(self, files: List[str], message: str) -> str:
+        sha = make_sha("main", len(self.main), message)
+        self.main.append({"sha": sha, "files": set(files)})
+        ready_at = self.clock() + self.mergeable_delay
+        for other in self.prs.values():
+            if other.state == "open":
+                other.ready_at = ready_at
+        return sha
+
+    def merge(self, pr: FakePullRequest, sha: Optional[str]) -> Tuple[int, Dict]:
+        if pr.state != "open":
+            return 405, {"message": "Pull Request is not mergeable"}
+        if sha and sha != pr.head_sha:
+            return 409, {
+                "message": "Head branch was modified. Review and try the merge again."
+            }
+        mergeable, state = self.mergeability(pr, force=True)
+        if not mergeable or state == "draft":
+            return 405, {"message": "Pull Request is not mergeable"}
+        if state == "behind":
+            return 405, {"message": "Head branch is out of date"}
+        if state == "blocked":
+            return 405, {"message": "At least 1 approving review is required"}
+        merge_sha = self.advance_main(pr.files, f"Merge pull request #{pr.number}")
+        pr.state = "closed"
+        pr.merged = True
+        pr.closed_at = pr.merged_at = pr.updated_at = self.clock()
+        return 200, {
+            "sha": merge_sha,
+            "merged": True,
+            "message": "Pull Request successfully merged",
+        }
+
+    def enable_auto_merge(
+        self, pr: FakePullRequest, expected_sha: Optional[str], method: str
+    ) -> Optional[str]:
+        """Enable auto-merge on ``pr``; return an error message on failure."""
+        if not self.allow_auto_merge:
+            return "Auto merge is not allowed for this repository"
+        if pr.state != "open" or pr.draft:
+            return "Pull request is not in the correct state to enable auto-merge"
+        if expected_sha and expected_sha != pr.head_sha:
+            return "Head sha didn't match expected head sha"
+        if self.mergeability(pr) == (True, "clean"):
+            return "Pull request is in clean status"
+        pr.auto_merge_method = method.lower()
+        pr.updated_at = self.clock()
+        return None
+
+    def run_auto_merge(self) -> None:
+        """Merge every PR with auto-merge enabled that has become clean."""
+        for pr in sorted(self.prs.values(), key=lambda pr: pr.number):
+            if (
+                pr.state == "open"
+                and pr.auto_merge_method
+                and self.mergeability(pr) == (True, "clean")
+            ):
+                self.merge(pr, None)
+
+    def update_branch(
+        self, pr: FakePullRequest, expected_sha: Optional[str]
+    ) -> Tuple[int, Dict]:
+        if pr.state != "open":
+            return 422, {"message": "Pull request is closed"}
+        if expected_sha and expected_sha != pr.head_sha:
+            return 422, {"message": "expected head sha didn't match current head ref."}
+        if self.touched_since(pr) & set(pr.files):
+            return 422, {"message": "merge conflict between base and head"}
+        if pr.base_index < len(self.main) - 1:
+            pr.revision += 1
+            pr.head_sha = make_sha("head", pr.number, pr.revision)
+            pr.base_index = len(self.main) - 1
+            pr.updated_at = self.clock()
+            pr.ready_at = self.clock() + self.mergeable_delay
+        return 202, {"message": "Updating pull request branch.", "url": ""}
+
+    # -- serializers -------------------------------------------------------
+
+    def pr_summary(self, pr: FakePullRequest) -> Dict:
+        base = f"https://github.com/{self.owner}/{self.name}"
+        return {
+            "number": pr.number,
+            "title": pr.title,
+            "state": pr.state,
+            "draft": pr.draft,
+            "user": {"login": "auto-bot"},
+            "created_at": self.timestamp(pr.created_at),
+            "updated_at": self.timestamp(pr.updated_at),
+            "closed_at": self.timestamp(pr.closed_at) if pr.closed_at else None,
+            "merged_at": self.timestamp(pr.merged_at) if pr.merged_at else None,
+            "html_url": f"{base}/pull/{pr.number}",
+            "head": {"ref": pr.head_ref, "sha": pr.head_sha},
+            "base": {"ref": "main", "sha": self.main[pr.base_index]["sha"]},
+            "node_id": pr.node_id,
+            "auto_merge": (
+                {"merge_method": pr.auto_merge_method} if pr.auto_merge_method else None
+            ),
+        }
+
+    def pr_detail(self, pr: FakePullRequest) -> Dict:
+        mergeable, state = self.mergeability(pr)
+        data = self.pr_summary(pr)
+        data.update(
+            {
+                "merged": pr.merged,
+                "mergeable": mergeable,
+                "mergeable_state": state,
+                "changed_files": len(pr.files),
+            }
+        )
+        return data
+
+    def pr_node(self, pr: FakePullRequest) -> Dict:
+        mergeable, state = self.mergeability(pr)
+        return {
+            "id": pr.node_id,
+            "number": pr.number,
+            "title": pr.title,
+            "createdAt": self.timestamp(pr.created_at),
+            "isDraft": pr.draft,
+            "mergeable": {True: "MERGEABLE", False: "CONFLICTING"}.get(
+                mergeable, "UNKNOWN"
+            ),
+            "mergeStateStatus": state.upper(),
+            "headRefName": pr.head_ref,
+            "headRefOid": pr.head_sha,
+            "url": f"https://github.com/{self.owner}/{self.name}/pull/{pr.number}",
+            "author": {"login": "auto-bot"},
+            "autoMergeRequest": (
+                {"mergeMethod": pr.auto_merge_method.upper()}
+                if pr.auto_merge_method
+                else None
+            ),
+            "files": {
+                "totalCount": len(pr.files),
+                "nodes": [{"path": path} for path in pr.files[:100]],
+            },
+        }
+
+
+class RequestStats:
+    """Server-side request counters, grouped by route template."""
+
+    def __init__(self):
+        self.requests: Counter = Counter()
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.bytes_in: Counter = Counter()
+        self.bytes_out: Counter = Counter()
+        self.rate_limited_cost = 0
+        self._lock = threading.Lock()
+
+    def record(self, route: str, status: int, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            self.requests[route] += 1
+            self.statuses[route][str(status)] += 1
+            self.bytes_in[route] += bytes_in
+            self.bytes_out[route] += bytes_out
+            if status != 304:
+                self.rate_limited_cost += 1
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "total_requests": sum(self.requests.values()),
+                "rate_limit_cost": self.rate_limited_cost,
+                "bytes_in": sum(self.bytes_in.values()),
+                "bytes_out": sum(self.bytes_out.values()),
+                "endpoints": {
+                    route: {
+                        "requests": count,
+                        "statuses": dict(self.statuses[route]),
+                        "bytes_in": self.bytes_in[route],
+                        "bytes_out": self.bytes_out[route],
+                    }
+                    for route, count in sorted(self.requests.items())
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.statuses.clear()
+            self.bytes_in.clear()
+            self.bytes_out.clear()
+            self.rate_limited_cost = 0
+
+
+def match_route(method: str, path: str) -> Optional[str]:
+    for route_method, template, pattern in ROUTES:
+        if route_method == method and re.match(pattern, path):
+            return f"{method} {template}"
+    return None
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Dispatch API requests to the server's ``FakeRepository``."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY every
+    # keep-alive response waits on the client's delayed ACK.
+    disable_nagle_algorithm = True
+    server: "FakeGitHubServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler API
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        split = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        route = match_route(method, split.path) or f"{method} (unmatched)"
+
+        if self.server.latency:
+            _real_sleep(self.server.latency)
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            body = {}
+
+        repo = self.server.repo
+        with repo.lock:
+            status, payload, headers = self.server.respond(
+                method, split.path, query, body
+            )
+
+        data = json.dumps(payload).encode()
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if (
+            method == "GET"
+            and status == 200
+            and self.headers.get("If-None-Match") == etag
+        ):
+            status, data = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if method == "GET":
+            self.send_header("ETag", etag)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        for name, value in self.server.rate_limit_headers(split.path, status).items():
+            self.send_header(name, value)
+        # Record before the headers go out: a response without a body (a
+        # 304) is complete for the client as soon as they arrive.
+        self.server.stats.record(route, status, len(raw_body), len(data))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """HTTP server bound to one ``FakeRepository``."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        repo: FakeRepository,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        latency: float = 0.0,
+        rate_limit: int = RATE_LIMIT,
+    ):
+        super().__init__(address, FakeGitHubHandler)
+        self.repo = repo
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.stats = RequestStats()
+        self.remaining = {"core": rate_limit, "graphql": rate_limit, "search": 30}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rate_limit_headers(self, path: str, status: int) -> Dict[str, str]:
+        resource = "graphql" if path == "/graphql" else "core"
+        if path.startswith("/search/"):
+            resource = "search"
+        if status != 304:
+            self.remaining[resource] = max(self.remaining[resource] - 1, 0)
+        limit = 30 if resource == "search" else self.rate_limit
+        return {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(self.remaining[resource]),
+            "X-RateLimit-Reset": str(int(self.repo.clock()) + RATE_WINDOW),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def respond(self, method: str, path: str, query: Dict, body: Dict) -> Tuple:
+        """Return ``(status, payload, extra headers)`` for one request."""
+        repo = self.repo
+        repo.run_auto_merge()
+        if path == "/graphql" and method == "POST":
+            return self.handle_graphql(body)
+
+        prefix = f"/repos/{repo.owner}/{repo.name}"
+        if not path.startswith(prefix):
+            return 404, {"message": "Not Found"}, {}
+        rest = path[len(prefix) :]
+
+        if rest == "" and method == "GET":
+            return 200, self.repo_info(), {}
+        if rest == "/pulls" and method == "GET":
+            return self.list_pulls(path, query)
+        if rest.startswith("/branches/") and method == "GET":
+            return self.get_branch(rest[len("/branches/") :])
+
+        match = re.match(r"^/pulls/(\d+)(/[a-z-]+)?$", rest)
+        if not match or int(match.group(1)) not in repo.prs:
+            return 404, {"message": "Not Found"}, {}
+        pr = repo.prs[int(match.group(1))]
+        action = match.group(2) or ""
+
+        if action == "" and method == "GET":
+            return 200, repo.pr_detail(pr), {}
+        if action == "" and method == "PATCH":
+            if body.get("state") == "closed" and pr.state == "open":
+                pr.state = "closed"
+                pr.closed_at = pr.updated_at = repo.clock()
+            return 200, repo.pr_detail(pr), {}
+        if action == "/files" and method == "GET":
+            files = [
+                {
+                    "filename": path,
+                    "status": "added",
+                    "additions": 10,
+                    "deletions": 0,
+                    "changes": 10,
+                }
+                for path in pr.files
+            ]
+            return self.paginate(path, query, files)
+        if action == "/merge" and method == "PUT":
+            status, payload = repo.merge(pr, body.get("sha"))
+            return status, payload, {}
+        if action == "/update-branch" and method == "POST":
+            status, payload = repo.update_branch(pr, body.get("expected_head_sha"))
+            return status, payload, {}
+        if action == "/reviews" and method == "GET":
+            return 200, pr.reviews, {}
+        if action == "/reviews" and method == "POST":
+            review = {"id": len(pr.reviews) + 1, "state": body.get("event", "COMMENT")}
+            pr.reviews.append(review)
+            return 200, review, {}
+        return 404, {"message": "Not Found"}, {}
+
+    def repo_info(self) -> Dict:
+        repo = self.repo
+        return {
+            "name": repo.name,
+            "full_name": f"{repo.owner}/{repo.name}",
+            "owner": {"login": repo.owner},
+            "stargazers_count": 0,
+            "default_branch": "main",
+            "html_url": f"https://github.com/{repo.owner}/{repo.name}",
+        }
+
+    def get_branch(self, name: str) -> Tuple:
+        repo = self.repo
+        if name == "main":
+            return 200, {"name": "main", "commit": {"sha": repo.main_sha}}, {}
+        for pr in repo.prs.values():
+            if pr.head_ref == name and not pr.merged:
+                return 200, {"name": name, "commit": {"sha": pr.head_sha}}, {}
+        return 404, {"message": "Branch not found"}, {}
+
+    def list_pulls(self, path: str, query: Dict) -> Tuple:
+        state = query.get("state", "open")
+        prs = [
+            pr for pr in self.repo.prs.values() if state == "all" or pr.state == state
+        ]
+        sort_key = "updated_at" if query.get("sort") == "updated" else "created_at"
+        descending = query.get("direction", "desc") == "desc"
+        prs.sort(key=lambda pr: (getattr(pr, sort_key), pr.number), reverse=descending)
+
+        status, page, headers = self.paginate(path, query, prs)
+        return status, [self.repo.pr_summary(pr) for pr in page], headers
+
+    def paginate(self, path: str, query: Dict, items: List) -> Tuple:
+        """Return one page of ``items`` with a ``Link: rel="next"`` header."""
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = max(int(query.get("page", 1)), 1)
+        start = (page - 1) * per_page
+
+        headers = {}
+        if start + per_page < len(items):
+            next_query = dict(query, page=page + 1, per_page=per_page)
+            headers["Link"] = f'<{self.url}{path}?{urlencode(next_query)}>; rel="next"'
+        return 200, items[start : start + per_page], headers
+
+    def handle_graphql(self, body: Dict) -> Tuple:
+        query = body.get("query", "")
+        variables = body.get("variables") or {}
+        if query.lstrip().startswith("mutation"):
+            return self.handle_mutation(query, variables)
+        if "pullRequests" not in query:
+            return (
+                200,
+                {"errors": [{"message": "Unsupported query for fake server"}]},
+                {},
+            )
+        if (
+            variables.get("owner") != self.repo.owner
+            or variables.get("repo") != self.repo.name
+        ):
+            return 200, {"data": {"repository": None}}, {}
+
+        open_prs = sorted(
+            (pr for pr in self.repo.prs.values() if pr.state == "open"),
+            key=lambda pr: (pr.created_at, pr.number),
+        )
+        start = int(variables.get("cursor") or 0)
+        page = open_prs[start : start + 100]
+        end = start + len(page)
+        connection = {
+            "pageInfo": {"hasNextPage": end < len(open_prs), "endCursor": str(end)},
+            "nodes": [self.repo.pr_node(pr) for pr in page],
+        }
+        return 200, {"data": {"repository": {"pullRequests": connection}}}, {}
+
+    def handle_mutation(self, query: str, variables: Dict) -> Tuple:
+        """Run aliased ``enablePullRequestAutoMerge(input: $var)`` fields."""
+        data: Dict = {}
+        errors = []
+        by_node_id = {pr.node_id: pr for pr in self.repo.prs.values()}
+        fields = re.findall(
+            r"(\w+)\s*:\s*enablePullRequestAutoMerge\(input:\s*\$(\w+)\)", query
+        )
+        if not fields:
+            return (
+                200,
+                {"errors": [{"message": "Unsupported mutation for fake server"}]},
+                {},
+            )
+        for alias, name in fields:
+            params = variables.get(name) or {}
+            pr = by_node_id.get(params.get("pullRequestId"))
+            if pr is None:
+                error = "Could not resolve to a node with the global id"
+            else:
+                error = self.repo.enable_auto_merge(
+                    pr,
+                    params.get("expectedHeadOid"),
+                    params.get("mergeMethod", "MERGE"),
+                )
+            if error:
+                data[alias] = None
+                errors.append({"message": error, "path": [alias]})
+            else:
+                data[alias] = {"pullRequest": {"number": pr.number}}
+        payload = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        return 200, payload, {}
+
+
+def start_server(
+    repo: FakeRepository,
+    port: int = 0,
+    latency: float = 0.0,
+    rate_limit: int = RATE_LIMIT,
+) -> FakeGitHubServer:
+    """Start a server for ``repo`` on a background thread and return it."""
+    server = FakeGitHubServer(
+        repo, ("127.0.0.1", port), latency=latency, rate_limit=rate_limit
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--prs", type=int, default=100, help="open PRs to seed")
+    parser.add_argument("--mergeable-delay", type=float, default=3.0)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    repo = FakeRepository(mergeable_delay=args.mergeable_delay)
+    repo.seed(args.prs, seed=args.seed)
+    server = FakeGitHubServer(repo, ("127.0.0.1", args.port), latency=args.latency)
+
+    print(f"🧪 Fake GitHub API for {repo.owner}/{repo.name} with {args.prs} open PR(s)")
+    print(f"   export GITHUB_API_URL={server.url}")
+    print(f"   export GITHUB_REPOSITORY={repo.owner}/{repo.name}")
+    print("   export GH_TOKEN3=fake GITHUB_HTTP_CACHE=off")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping fake GitHub API.")
+        print(json.dumps(server.stats.as_dict(), indent=2))
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Thin wrappers around the git command line for the merge scripts.
+
+Commands take an argument list rather than a shell string, so PR titles and
+branch names never pass through a shell.
+"""
+
+import contextlib
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_REMOTE = "origin"
+DEFAULT_BASE = "main"
+# Local refs that hold fetched PR heads while a script works on them.
+PR_HEAD_PREFIX = "refs/pr-heads"
+# Refspecs per fetch, to keep the command line short.
+FETCH_CHUNK = 100
+# Used when the checkout has no committer configured (as on Actions runners).
+BOT_NAME = "github-actions[bot]"
+BOT_EMAIL = "41898282+github-actions[bot]@users.noreply.github.com"
+
+
+def run_git_process(
+    args: List[str], cwd: Optional[str] = None, env: Optional[dict] = None
+) -> Tuple[int, str, str]:
+    """Run ``git <args>`` and return ``(returncode, stdout, stderr)``.
+
+    A git binary that cannot be started is reported as return code -1.
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            cwd=cwd or os.getcwd(),
+            env=dict(os.environ, **env) if env else None,
+        )
+    except OSError as e:
+        return -1, "", str(e)
+    return result.returncode, result.stdout.strip(), result.stderr.strip()
+
+
+def run_git(
+    args: List[str], cwd: Optional[str] = None, env: Optional[dict] = None
+) -> Tuple[bool, str, str]:
+    """Run ``git <args>`` and return ``(success, stdout, stderr)``."""
+    returncode, stdout, stderr = run_git_process(args, cwd, env)
+    return returncode == 0, stdout, stderr
+
+
+def rev_parse(ref: str, cwd: Optional[str] = None) -> Optional[str]:
+    """Return the commit SHA ``ref`` points at, or None if it does not exist."""
+    success, stdout, _ = run_git(
+        ["rev-parse", "--verify", "-q", f"{ref}^{{commit}}"], cwd
+    )
+    return stdout if success and stdout else None
+
+
+def is_shallow(cwd: Optional[str] = None) -> bool:
+    success, stdout, _ = run_git(["rev-parse", "--is-shallow-repository"], cwd)
+    return success and stdout == "true"
+
+
+def identity_args(cwd: Optional[str] = None) -> List[str]:
+    """Return ``-c user.*`` options when no committer identity is configured."""
+    success, stdout, _ = run_git(["config", "user.email"], cwd)
+    if success and stdout:
+        return []
+    return ["-c", f"user.name={BOT_NAME}", "-c", f"user.email={BOT_EMAIL}"]
+
+
+def pr_head_ref(number: int) -> str:
+    return f"{PR_HEAD_PREFIX}/{number}"
+
+
+def fetch_base(
+    remote: str = DEFAULT_REMOTE, base: str = DEFAULT_BASE, cwd: Optional[str] = None
+) -> Optional[str]:
+    """Fetch ``base`` into ``refs/remotes/<remote>/<base>`` and return its SHA.
+
+    A shallow checkout is deepened, since merges need the merge base.
+    """
+    fetch = ["fetch", "--no-tags", "--quiet"]
+    if is_shallow(cwd):
+        fetch.append("--unshallow")
+    success, _, stderr = run_git(
+        [*fetch, remote, f"+refs/heads/{base}:refs/remotes/{remote}/{base}"], cwd
+    )
+    if not success:
+        print(f"  Could not fetch {remote}/{base}: {stderr}")
+        return None
+    return rev_parse(f"refs/remotes/{remote}/{base}", cwd)
+
+
+def fetch_pr_heads(
+    numbers: List[int], remote: str = DEFAULT_REMOTE, cwd: Optional[str] = None
+) -> Dict[int, str]:
+    """Fetch ``refs/pull/<n>/head`` for ``numbers``; return the fetched SHAs.
+
+    Only the PR refs are fetched (no tags, no branches), in chunks of
+    ``FETCH_CHUNK`` refspecs. Remove the refs with ``delete_pr_heads``.
+    """
+    fetch = ["fetch", "--no-tags", "--quiet", remote]
+    for start in range(0, len(numbers), FETCH_CHUNK):
+        chunk = numbers[start : start + FETCH_CHUNK]
+        refspecs = [f"+refs/pull/{n}/head:{pr_head_ref(n)}" for n in chunk]
+        if not run_git([*fetch, *refspecs], cwd)[0]:
+            # One missing ref fails the whole fetch; retry the chunk singly.
+            for refspec in refspecs:
+                run_git([*fetch, refspec], cwd)
+
+    heads = {}
+    for number in numbers:
+        sha = rev_parse(pr_head_ref(number), cwd)
+        if sha:
+            heads[number] = sha
+    return heads
+
+
+def delete_pr_heads(numbers: List[int], cwd: Optional[str] = None) -> None:
+    for number in numbers:
+        run_git(["update-ref", "-d", pr_head_ref(number)], cwd)
+
+
+@contextlib.contextmanager
+def temporary_worktree(commit: str, cwd: Optional[str] = None) -> Iterator[str]:
+    """Check ``commit`` out, detached, in a throwaway worktree.
+
+    The caller's checkout is left untouched. Raises ``RuntimeError`` if the
+    worktree cannot be created.
+    """
+    workdir = tempfile.mkdtemp(prefix="git-worktree-")
+    tree = os.path.join(workdir, "tree")
+    try:
+        success, _, stderr = run_git(["worktree", "add", "--detach", tree, commit], cwd)
+        if not success:
+            raise RuntimeError(f"could not create a worktree: {stderr}")
+        yield tree
+    finally:
+        run_git(["worktree", "remove", "--force", tree], cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Commit statistics for the whole repository in one streamed history walk.
+
+validate_system.py used to run ``git log --all --oneline`` twice, once to
+count commits and once to count PR merges, holding the full output in
+memory each time. ``collect_git_stats`` runs one ``git log --all`` with a
+compact format and reads it line by line, computing in the same pass:
+
+- total commits and merge commits,
+- merged PRs (commits titled "Merge pull request"),
+- commits per day (committer date),
+- commits with a ``Co-authored-by`` trailer.
+
+The results are cached in ``.cache/git-stats.json`` with the tip SHAs of
+every ref (``git rev-parse --all``) they were computed for. With the same
+tips the cache is returned without walking anything. When refs only moved
+forward, only the commits reachable from the new tips and not from the old
+ones are walked and added. If any old commit is no longer reachable
+(history rewritten, branch deleted), the history is walked again from
+scratch.
+
+Environment Variables:
+    GIT_STATS_CACHE: cache path, or "off" to disable
+        (defaults to .cache/git-stats.json)
+"""
+
+import json
+import os
+import subprocess
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from git_ops import run_git
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "git-stats.json")
+CACHE_FORMAT_VERSION = 1
+FIELD_SEPARATOR = "\x1f"
+# One line per commit: SHA, parents, committer date, co-authors, subject.
+LOG_FORMAT = FIELD_SEPARATOR.join(
+    [
+        "%H",
+        "%P",
+        "%cd",
+        "%(trailers:key=Co-authored-by,valueonly,separator=%x2C)",
+        "%s",
+    ]
+)
+MERGED_PR_PREFIX = "Merge pull request"
+
+
+def get_cache_path() -> Optional[str]:
+    """Return the configured cache file, or None when caching is off."""
+    path = os.environ.get("GIT_STATS_CACHE", DEFAULT_CACHE_PATH).strip()
+    if path.lower() in {"", "0", "off", "false", "no"}:
+        return None
+    return path
+
+
+def empty_stats() -> Dict:
+    return {
+        "total_commits": 0,
+        "merge_commits": 0,
+        "merged_prs": 0,
+        "co_authored_commits": 0,
+        "commits_per_day": {},
+    }
+
+
+def get_tips(cwd: Optional[str] = None) -> Optional[List[str]]:
+    """Return the sorted, distinct SHAs every ref points at."""
+    success, stdout, _ = run_git(["rev-parse", "--all"], cwd)
+    if not success:
+        return None
+    return sorted(set(stdout.split()))
+
+
+def stream_log(revisions: List[str], cwd: Optional[str] = None) -> Iterable[str]:
+    """Yield one formatted line per commit in ``revisions``, as git prints it."""
+    process = subprocess.Popen(
+        [
+            "git",
+            "log",
+            "--date=short",
+            f"--format={LOG_FORMAT}",
+            *revisions,
+            "--",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        cwd=cwd or os.getcwd(),
+    )
+    try:
+        for line in process.stdout:
+            yield line.rstrip("\n")
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"git log {' '.join(revisions)} failed")
+
+
+def add_commits(stats: Dict, lines: Iterable[str]) -> Dict:
+    """Fold formatted log lines into ``stats`` and return it."""
+    per_day = Counter(stats["commits_per_day"])
+    for line in lines:
+        fields = line.split(FIELD_SEPARATOR, 4)
+        if len(fields) < 5:
+            continue
+        _, parents, day, co_authors, subject = fields
+        stats["total_commits"] += 1
+        if len(parents.split()) > 1:
+            stats["merge_commits"] += 1
+        if subject.startswith(MERGED_PR_PREFIX):
+            stats["merged_prs"] += 1
+        if co_authors.strip():
+            stats["co_authored_commits"] += 1
+        per_day[day] += 1
+    stats["commits_per_day"] = dict(sorted(per_day.items()))
+    return stats
+
+
+def load_cache(path: Optional[str]) -> Optional[Dict]:
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != CACHE_FORMAT_VERSION:
+        return None
+    return data
+
+
+def save_cache(path: Optional[str], tips: List[str], stats: Dict) -> None:
+    if not path:
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_FORMAT_VERSION, "tips": tips, "stats": stats}, f)
+    os.replace(tmp_path, path)
+
+
+def only_moved_forward(
+    old_tips: List[str], tips: List[str], cwd: Optional[str] = None
+) -> bool:
+    """True if every commit reachable from ``old_tips`` still is from ``tips``."""
+    success, stdout, _ = run_git(
+        ["rev-list", "--count", *old_tips, "--not", *tips, "--"], cwd
+    )
+    return success and stdout == "0"
+
+
+def collect_git_stats(cwd: Optional[str] = None) -> Optional[Dict]:
+    """Return commit statistics for every ref, or None outside a git repo."""
+    tips = get_tips(cwd)
+    if tips is None:
+        return None
+    if not tips:
+        return empty_stats()  # no commits yet
+
+    path = get_cache_path()
+    cached = load_cache(path)
+    if cached and cached["tips"] == tips:
+        return cached["stats"]
+
+    try:
+        if cached and only_moved_forward(cached["tips"], tips, cwd):
+            revisions = tips + [f"^{sha}" for sha in cached["tips"]]
+            stats = add_commits(cached["stats"], stream_log(revisions, cwd))
+        else:
+            stats = add_commits(empty_stats(), stream_log(tips, cwd))
+    except (OSError, RuntimeError):
+        return None
+    save_cache(path, tips, stats)
+    return stats
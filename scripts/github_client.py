@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Shared GitHub API client for the automation scripts.
+
+Every script talks to GitHub through one pooled ``requests.Session`` so a long
+merge run reuses a handful of keep-alive connections instead of opening a new
+TLS connection per call. Its own messages (retries, rate-limit waits,
+warnings) go to stderr, so stdout carries only a script's output, such as
+a JSON report.
+
+Usage:
+    from github_client import get_client, get_github_token
+
+    token = get_github_token()
+    client = get_client(token)
+    response = client.get(f"/repos/{owner}/{repo}/pulls", params={"state": "open"})
+
+Environment Variables:
+    GH_TOKEN3, GITHUB_TOKEN, or GH_TOKEN: GitHub token (checked in that order)
+    GITHUB_API_URL: REST API base URL (defaults to https://api.github.com)
+    GITHUB_GRAPHQL_URL: GraphQL endpoint (defaults to $GITHUB_API_URL/graphql)
+    GITHUB_HTTP_CACHE: conditional-request cache file, or "off"
+        (see http_cache.py)
+    GITHUB_RATE_LIMIT_RESERVE, GITHUB_RATE_LIMIT_MAX_WAIT: see rate_limit.py
+    GITHUB_API_CONCURRENCY: parallel read-only requests (default 8)
+    GITHUB_RETRY_ATTEMPTS, GITHUB_CIRCUIT_THRESHOLD, ...: see retry.py
+    GITHUB_METRICS_DIR: per-endpoint metrics output, or "off"
+        (see http_metrics.py)
+"""
+
+import atexit
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache, get_cache_path
+from http_metrics import HttpMetrics, get_metrics_dir
+from rate_limit import RateLimiter, resource_for_url
+from retry import (
+    RETRYABLE_STATUSES,
+    TRANSIENT_ERRORS,
+    CircuitBreaker,
+    RetryPolicy,
+)
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONCURRENCY = 8
+DEFAULT_POOL_SIZE = 10
+RATE_LIMIT_RETRIES = 2
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_clients: Dict[str, "GitHubClient"] = {}
+
+
+class GitHubAPIError(requests.exceptions.RequestException):
+    """GitHub answered with an unexpected status; ``response`` holds it."""
+
+
+def get_github_token(fallback_warning: Optional[str] = None) -> str:
+    """Get GitHub token from environment variables.
+
+    Tokens are checked in the order GH_TOKEN3 → GITHUB_TOKEN → GH_TOKEN.
+    When ``fallback_warning`` is given it is printed if GH_TOKEN3 is not set.
+    """
+    token = (
+        os.environ.get("GH_TOKEN3")
+        or os.environ.get("GITHUB_TOKEN")
+        or os.environ.get("GH_TOKEN")
+    )
+    if token and fallback_warning and not os.environ.get("GH_TOKEN3"):
+        print(f"⚠️ Warning: {fallback_warning}", file=sys.stderr)
+    if not token:
+        print("❌ Error: No GitHub token found.", file=sys.stderr)
+        print(
+            "Please set GH_TOKEN3, GITHUB_TOKEN, or GH_TOKEN environment variable.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return token
+
+
+def get_api_url() -> str:
+    """Return the REST API base URL without a trailing slash."""
+    return os.environ.get("GITHUB_API_URL", DEFAULT_API_URL).rstrip("/")
+
+
+def get_concurrency() -> int:
+    """Return how many read-only requests may run in parallel."""
+    try:
+        return max(
+            1, int(os.environ.get("GITHUB_API_CONCURRENCY", DEFAULT_CONCURRENCY))
+        )
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+def map_concurrent(
+    func: Callable[[T], R], items: Iterable[T], max_workers: Optional[int] = None
+) -> List[R]:
+    """Apply ``func`` to ``items`` on a thread pool and return results in order.
+
+    Meant for read-only API calls through the shared client: the session pool
+    is sized to match, and rate-limit accounting is shared between threads.
+    Keep writes (merges, branch updates, reviews) sequential.
+    """
+    items = list(items)
+    workers = min(max_workers or get_concurrency(), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
+
+def get_headers(token: str) -> Dict[str, str]:
+    """Get default headers for GitHub API requests."""
+    return {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github.v3+json",
+    }
+
+
+class GitHubClient:
+    """Thin wrapper around a pooled ``requests.Session`` for the GitHub API."""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: Optional[str] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        cache: Optional[HttpCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[HttpMetrics] = None,
+        metrics_dir: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_url = (api_url or get_api_url()).rstrip("/")
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.metrics = metrics
+        self.metrics_dir = metrics_dir
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.session = requests.Session()
+        self.session.headers.update(get_headers(token))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url(self, path: str) -> str:
+        """Resolve an API path such as ``/repos/o/r/pulls`` to a full URL."""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def request(
+        self, method: str, path: str, retry: Optional[bool] = None, **kwargs
+    ) -> requests.Response:
+        """Send a request through the pooled session.
+
+        Reads are retried on network errors and 5xx responses; writes only
+        when ``retry=True``, which callers pass for writes that are safe to
+        repeat (a merge or branch update pinned to an expected head SHA).
+
+        Raises ``requests.exceptions.RequestException`` on network errors, just
+        like the bare ``requests`` calls this replaces, and its subclass
+        ``CircuitOpenError`` while the circuit breaker is open.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.url(path)
+        retry = self.retry_policy.should_retry(method, retry)
+        if method != "GET" or self.cache is None:
+            return self._send(method, url, retry, **kwargs)
+
+        key = self.cache_key(url, kwargs.pop("params", None))
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.cache.conditional_headers(key))
+        response = self._send(method, key, retry, headers=headers, **kwargs)
+        if response.status_code == 304:
+            return self.cache.replay(key, response)
+        self.cache.store(key, response)
+        return response
+
+    def _send(self, method: str, url: str, retry: bool, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures when ``retry`` is set."""
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            try:
+                response = self._send_once(method, url, **kwargs)
+            except requests.exceptions.RequestException as exc:
+                self.circuit_breaker.record_failure()
+                if not isinstance(exc, TRANSIENT_ERRORS) or not self._can_retry(
+                    retry, attempt
+                ):
+                    raise
+                failure = type(exc).__name__
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    self.circuit_breaker.record_success()
+                    return response
+                self.circuit_breaker.record_failure()
+                if not self._can_retry(retry, attempt):
+                    return response
+                failure = f"HTTP {response.status_code}"
+            attempt += 1
+            delay = self.retry_policy.backoff(attempt)
+            print(
+                f"🔁 {method} {url.split('?', 1)[0]} failed ({failure}); "
+                f"retry {attempt}/{self.retry_policy.attempts} in {delay:.1f}s...",
+                file=sys.stderr,
+            )
+            self.retry_policy.sleep(delay)
+
+    def _can_retry(self, retry: bool, attempt: int) -> bool:
+        # Stop retrying once the breaker opens and hand back the last failure.
+        return (
+            retry
+            and attempt < self.retry_policy.attempts
+            and not self.circuit_breaker.is_open()
+        )
+
+    def _send_once(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one request, waiting out rate limits before and after."""
+        resource = resource_for_url(url)
+        attempt = 0
+        while True:
+            self.rate_limiter.wait_for_budget(resource)
+            started = time.perf_counter()
+            response = self.session.request(method, url, **kwargs)
+            if self.metrics is not None:
+                self.metrics.record(
+                    method,
+                    url,
+                    response.status_code,
+                    time.perf_counter() - started,
+                    len(response.request.body or b""),
+                    len(response.content),
+                )
+            self.rate_limiter.update(response, resource)
+            delay = self.rate_limiter.retry_delay(response)
+            if delay is None or attempt >= RATE_LIMIT_RETRIES:
+                return response
+            attempt += 1
+            print(
+                f"⏳ Rate limited by GitHub; retrying in {delay:.0f}s...",
+                file=sys.stderr,
+            )
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict] = None) -> str:
+        """Return the fully encoded URL used as the cache key."""
+        return requests.Request("GET", url, params=params).prepare().url
+
+    @property
+    def unavailable(self) -> bool:
+        """True while the circuit breaker is refusing requests."""
+        return self.circuit_breaker.is_open()
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", path, **kwargs)
+
+    def paginate(
+        self, path: str, params: Optional[Dict] = None, per_page: int = 100
+    ) -> Iterator[Dict]:
+        """Yield items from a list endpoint, following ``Link: rel="next"``.
+
+        Pages are fetched lazily, so a caller that stops iterating early never
+        requests the remaining pages. Raises ``GitHubAPIError`` on a non-200
+        page.
+        """
+        params = dict(params or {})
+        params.setdefault("per_page", per_page)
+        url: Optional[str] = path
+        while url:
+            response = self.get(url, params=params)
+            if response.status_code != 200:
+                raise GitHubAPIError(
+                    f"GET {url} returned {response.status_code}", response=response
+                )
+            yield from response.json()
+            url = response.links.get("next", {}).get("url")
+            # The next link already carries the query string.
+            params = None
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """Run a GraphQL query and return the decoded response body.
+
+        The body holds ``data`` and, on failure, ``errors``. A non-200 status
+        is reported as ``{"errors": [...]}`` so callers only check one place.
+        """
+        url = os.environ.get("GITHUB_GRAPHQL_URL") or f"{self.api_url}/graphql"
+        # Queries only read, so they are as safe to retry as a GET.
+        is_query = not query.lstrip().startswith("mutation")
+        response = self.post(
+            url, json={"query": query, "variables": variables or {}}, retry=is_query
+        )
+        if response.status_code != 200:
+            return {"errors": [{"message": f"HTTP {response.status_code}"}]}
+        try:
+            return response.json()
+        except ValueError:
+            return {"errors": [{"message": "Invalid JSON response"}]}
+
+    def close(self) -> None:
+        if self.cache is not None:
+            try:
+                self.cache.save()
+            except OSError as exc:
+                print(f"⚠️ Warning: could not save HTTP cache: {exc}", file=sys.stderr)
+        if self.metrics is not None:
+            self.metrics.print_summary()
+            if self.metrics_dir:
+                try:
+                    self.metrics.write(self.metrics_dir)
+                except OSError as exc:
+                    print(
+                        f"⚠️ Warning: could not write API metrics: {exc}",
+                        file=sys.stderr,
+                    )
+        self.session.close()
+
+
+def get_client(token: str) -> GitHubClient:
+    """Return the shared client for ``token``, creating it on first use."""
+    client = _clients.get(token)
+    if client is None:
+        cache_path = get_cache_path()
+        cache = HttpCache(cache_path) if cache_path else None
+        pool_size = max(DEFAULT_POOL_SIZE, get_concurrency())
+        client = GitHubClient(
+            token,
+            pool_size=pool_size,
+            cache=cache,
+            metrics=HttpMetrics(),
+            metrics_dir=get_metrics_dir(),
+        )
+        _clients[token] = client
+        atexit.register(client.close)
+    return client
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Persistent conditional-request cache for GitHub REST reads.
+
+GitHub answers a request carrying ``If-None-Match`` / ``If-Modified-Since``
+with ``304 Not Modified`` when nothing changed. A 304 has no body and does
+not count against the rate limit, so the scheduled runs only pay for PRs
+that actually moved since the previous run.
+
+The cache is an LRU of URL → (validators, headers, body), bounded by entry
+count and total body size, and saved as a single JSON file so the Actions
+cache can restore it between runs.
+
+Environment Variables:
+    GITHUB_HTTP_CACHE: cache file path, or "off" to disable
+        (defaults to .cache/github-http-cache.json)
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "github-http-cache.json")
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+CACHE_FORMAT_VERSION = 1
+
+# Response headers worth replaying from a cached entry.
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+def get_cache_path() -> Optional[str]:
+    """Return the configured cache file, or None when caching is disabled."""
+    path = os.environ.get("GITHUB_HTTP_CACHE", DEFAULT_CACHE_PATH).strip()
+    if path.lower() in {"", "0", "off", "false", "no"}:
+        return None
+    return path
+
+
+class HttpCache:
+    """Size-bounded LRU of validated GET responses, persisted as JSON."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def load(self) -> None:
+        """Load entries from disk, ignoring a missing or unreadable file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            return
+        for key, entry in data.get("entries", []):
+            self._put(key, entry)
+        self.dirty = False
+
+    def save(self) -> None:
+        """Write entries to disk, oldest first, if anything changed."""
+        if not self.path or not self.dirty:
+            return
+        with self._lock:
+            data = {
+                "version": CACHE_FORMAT_VERSION,
+                "entries": list(self.entries.items()),
+            }
+            self.dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Return validator headers for ``key``, or an empty dict."""
+        with self._lock:
+            entry = self.entries.get(key)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Remember a 200 response if it carries a validator."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {
+                name: response.headers[name]
+                for name in STORED_HEADERS
+                if name in response.headers
+            },
+            "body": response.text,
+        }
+        with self._lock:
+            self._put(key, entry)
+
+    def replay(self, key: str, response: requests.Response) -> requests.Response:
+        """Turn a 304 into the cached 200 response for ``key``."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return response
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        cached = requests.Response()
+        cached.status_code = 200
+        cached.reason = "OK (cached)"
+        cached.headers = CaseInsensitiveDict(entry["headers"])
+        cached.headers.update(response.headers)
+        cached._content = entry["body"].encode("utf-8")
+        cached.encoding = "utf-8"
+        cached.url = response.url
+        cached.request = response.request
+        cached.elapsed = response.elapsed
+        cached.from_cache = True
+        return cached
+
+    def _put(self, key: str, entry: Dict) -> None:
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= len(old["body"])
+        self.entries[key] = entry
+        self.total_bytes += len(entry["body"])
+        self.dirty = True
+        while self.entries and (
+            len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= len(evicted["body"])
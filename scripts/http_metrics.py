@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Per-endpoint instrumentation for the shared GitHub API client.
+
+Every request is recorded under its endpoint template (for example
+``PUT /repos/{owner}/{repo}/pulls/{n}/merge``) with its status code, latency,
+bytes sent and received, and rate-limit cost. At exit the client prints the
+endpoints that took the most time to stderr, so it never mixes with a
+script's own output such as a JSON report, and writes the full summary twice:
+
+- ``http-metrics-<script>.json`` with counts, status codes, latency
+  percentiles and bytes per endpoint
+- ``http-metrics-<script>.prom`` in the Prometheus textfile format, with a
+  latency histogram per endpoint
+
+Environment Variables:
+    GITHUB_METRICS_DIR: directory for the summaries, or "off" to disable
+        (defaults to .cache/metrics)
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_METRICS_DIR = os.path.join(".cache", "metrics")
+# Upper bounds in seconds for the Prometheus latency histogram.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PERCENTILES = (50, 90, 99)
+
+_TEMPLATE_RULES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"/branches/.+$"), "/branches/{branch}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{n}"),
+]
+
+
+def get_metrics_dir() -> Optional[str]:
+    """Return the configured metrics directory, or None when disabled."""
+    path = os.environ.get("GITHUB_METRICS_DIR", DEFAULT_METRICS_DIR).strip()
+    if path.lower() in {"", "0", "off", "false", "no"}:
+        return None
+    return path
+
+
+def endpoint_template(method: str, url: str) -> str:
+    """Return ``"METHOD /path/{n}"`` for a request URL."""
+    path = urlsplit(url).path.rstrip("/") or "/"
+    for pattern, replacement in _TEMPLATE_RULES:
+        path = pattern.sub(replacement, path)
+    return f"{method} {path}"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class EndpointStats:
+    """Counters and latency samples for one endpoint template."""
+
+    def __init__(self):
+        self.count = 0
+        self.statuses: Counter = Counter()
+        self.latencies: List[float] = []
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rate_limit_cost = 0
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.latencies)
+
+    def bucket_counts(self) -> List[int]:
+        """Return cumulative counts for each of ``LATENCY_BUCKETS``."""
+        return [
+            sum(1 for latency in self.latencies if latency <= bound)
+            for bound in LATENCY_BUCKETS
+        ]
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            "total_time": round(self.total_time, 4),
+            "latency": {
+                f"p{pct}": round(percentile(self.latencies, pct), 4)
+                for pct in PERCENTILES
+            },
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "rate_limit_cost": self.rate_limit_cost,
+        }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class HttpMetrics:
+    """Collect per-endpoint request metrics; safe to share between threads."""
+
+    def __init__(self, script: Optional[str] = None):
+        self.script = script or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        elapsed: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record one request; 304 responses cost no rate limit."""
+        endpoint = endpoint_template(method, url)
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.count += 1
+            stats.statuses[status] += 1
+            stats.latencies.append(elapsed)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if status != 304:
+                stats.rate_limit_cost += 1
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            endpoints = {
+                name: stats.as_dict() for name, stats in sorted(self.endpoints.items())
+            }
+        return {
+            "script": self.script,
+            "total_requests": sum(e["count"] for e in endpoints.values()),
+            "total_time": round(sum(e["total_time"] for e in endpoints.values()), 4),
+            "rate_limit_cost": sum(e["rate_limit_cost"] for e in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        script = _label(self.script)
+        lines = [
+            "# HELP github_api_requests_total GitHub API requests by status.",
+            "# TYPE github_api_requests_total counter",
+        ]
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            for name, stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f'github_api_requests_total{{script="{script}",'
+                        f'endpoint="{_label(name)}",status="{status}"}} {count}'
+                    )
+
+            lines += [
+                "# HELP github_api_request_duration_seconds GitHub API latency.",
+                "# TYPE github_api_request_duration_seconds histogram",
+            ]
+            for name, stats in endpoints:
+                labels = f'script="{script}",endpoint="{_label(name)}"'
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts()):
+                    lines.append(
+                        "github_api_request_duration_seconds_bucket"
+                        f'{{{labels},le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    "github_api_request_duration_seconds_bucket"
+                    f'{{{labels},le="+Inf"}} {stats.count}'
+                )
+                lines.append(
+                    f"github_api_request_duration_seconds_sum{{{labels}}} "
+                    f"{stats.total_time:.6f}"
+                )
+                lines.append(
+                    f"github_api_request_duration_seconds_count{{{labels}}} "
+                    f"{stats.count}"
+                )
+
+            for metric, attribute, help_text in (
+                ("github_api_sent_bytes_total", "bytes_sent", "Request bytes."),
+                ("github_api_received_bytes_total", "bytes_received", "Body bytes."),
+                (
+                    "github_api_rate_limit_cost_total",
+                    "rate_limit_cost",
+                    "Requests billed against the rate limit.",
+                ),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for name, stats in endpoints:
+                    lines.append(
+                        f'{metric}{{script="{script}",endpoint="{_label(name)}"}} '
+                        f"{getattr(stats, attribute)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str) -> List[str]:
+        """Write the JSON and Prometheus summaries and return their paths."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"http-metrics-{self.script}")
+        outputs = [
+            (f"{base}.json", json.dumps(self.as_dict(), indent=2) + "\n"),
+            (f"{base}.prom", self.to_prometheus()),
+        ]
+        for path, content in outputs:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return [path for path, _ in outputs]
+
+    def print_summary(self, limit: int = 5) -> None:
+        """Print the endpoints that took the most time to stderr."""
+        summary = self.as_dict()
+        if not summary["total_requests"]:
+            return
+        print(
+            f"\n📈 API usage: {summary['total_requests']} requests, "
+            f"{summary['total_time']:.1f}s, "
+            f"rate-limit cost {summary['rate_limit_cost']}",
+            file=sys.stderr,
+        )
+        ranked = sorted(
+            summary["endpoints"].items(),
+            key=lambda item: item[1]["total_time"],
+            reverse=True,
+        )
+        for name, stats in ranked[:limit]:
+            print(
+                f"  {name}: {stats['count']} calls, {stats['total_time']:.1f}s, "
+                f"p50 {stats['latency']['p50'] * 1000:.0f}ms, "
+                f"p99 {stats['latency']['p99'] * 1000:.0f}ms",
+                file=sys.stderr,
+            )
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Bring conflicted PR branches up to date locally instead of via the API.
+
+Almost every ``dirty`` daily PR conflicts only in the daily sections at the
+end of README.md. GitHub's ``update-branch`` cannot resolve that, so those
+PRs used to fail update after update. Here each head is merged with
+``origin/main`` in a throwaway worktree using the README union driver (see
+readme_merge.py) and pushed back to its branch:
+
+- the merge is the same one ``update-branch`` would make, so the push is a
+  fast-forward and never forced,
+- a push is rejected if the branch moved since it was listed,
+- PRs with real conflicts are left untouched for the API path.
+
+Pushing needs ``contents: write``.
+"""
+
+from typing import Dict, List, Optional
+
+from git_ops import (
+    DEFAULT_BASE,
+    DEFAULT_REMOTE,
+    delete_pr_heads,
+    fetch_base,
+    fetch_pr_heads,
+    identity_args,
+    rev_parse,
+    run_git,
+    temporary_worktree,
+)
+from readme_merge import driver_args
+
+
+def update_branch(
+    pr: Dict, sha: str, base_sha: str, tree: str, remote: str, base: str
+) -> Optional[str]:
+    """Merge ``base_sha`` into the PR head and push it; return the new head."""
+    head_ref = pr["head_ref"]
+    run_git(["checkout", "--quiet", "--force", "--detach", sha], tree)
+    success, _, _ = run_git(
+        [
+            *identity_args(tree),
+            *driver_args(),
+            "merge",
+            "--no-edit",
+            "-m",
+            f"Merge branch '{base}' into {head_ref}",
+            base_sha,
+        ],
+        tree,
+    )
+    if not success:
+        run_git(["merge", "--abort"], tree)
+        print(f"  PR #{pr['number']}: conflicts beyond the README daily log")
+        return None
+    new_sha = rev_parse("HEAD", tree)
+    if new_sha == sha:
+        return None  # already up to date; nothing for a push to fix
+    success, _, stderr = run_git(
+        ["push", "--quiet", remote, f"{new_sha}:refs/heads/{head_ref}"], tree
+    )
+    if not success:
+        print(f"  PR #{pr['number']}: push to {head_ref} rejected: {stderr}")
+        return None
+    print(f"  PR #{pr['number']}: merged {base} locally and pushed {new_sha[:12]}")
+    return new_sha
+
+
+def update_branches_locally(
+    prs: List[Dict],
+    remote: str = DEFAULT_REMOTE,
+    base: str = DEFAULT_BASE,
+    cwd: Optional[str] = None,
+) -> Dict[int, str]:
+    """Update ``prs`` (``number``, ``head_ref``, ``head_sha``) with ``base``.
+
+    Returns the new head SHA of every PR that was updated and pushed.
+    """
+    prs = [pr for pr in prs if pr.get("head_ref") not in {None, "unknown"}]
+    if not prs:
+        return {}
+    print(f"Updating {len(prs)} conflicted PR branch(es) locally...")
+    base_sha = fetch_base(remote, base, cwd)
+    if not base_sha:
+        return {}
+    heads = fetch_pr_heads([pr["number"] for pr in prs], remote, cwd)
+    updated: Dict[int, str] = {}
+    try:
+        with temporary_worktree(base_sha, cwd) as tree:
+            for pr in prs:
+                sha = heads.get(pr["number"])
+                if not sha or (pr.get("head_sha") and sha != pr["head_sha"]):
+                    continue
+                new_sha = update_branch(pr, sha, base_sha, tree, remote, base)
+                if new_sha:
+                    updated[pr["number"]] = new_sha
+    except RuntimeError as exc:
+        print(f"  {exc}")
+    finally:
+        delete_pr_heads(list(heads), cwd)
+    return updated
@@ -3,26 +3,20 @@
 Legacy helper to merge open daily contribution PRs.
 
 Prefer scripts/auto_merge_prs.py for the active merge flow.
+
+Usage:
+    python scripts/merge_daily_updates.py [--optimistic]
+
+With --optimistic each PR is merged straight away with its head SHA
+pinned, skipping the mergeability check. A 405 (not mergeable) or 409
+(head moved) falls back to checking the PR and merging it as before.
 """
 
 import os
 import sys
-import requests
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 
-# GitHub API base URL
-GITHUB_API_BASE = "https://api.github.com"
-
-
-def get_github_token() -> str:
-    """Get GitHub token from environment variable."""
-    token = os.getenv("GH_TOKEN3") or os.getenv("GITHUB_TOKEN") or os.getenv("GH_TOKEN")
-    if not token:
-        print(
-            "Error: GH_TOKEN3, GITHUB_TOKEN, or GH_TOKEN environment variable not set"
-        )
-        sys.exit(1)
-    return token
+from github_client import GitHubAPIError, get_client, get_github_token
 
 
 def get_repo_info() -> tuple[str, str]:
@@ -32,26 +26,18 @@ def get_repo_info() -> tuple[str, str]:
     return owner, repo
 
 
-def get_headers(token: str) -> Dict[str, str]:
-    """Get headers for GitHub API requests."""
-    return {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
-
 def get_open_prs(owner: str, repo: str, token: str) -> List[Dict[str, Any]]:
     """Get all open pull requests."""
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls"
-    params = {"state": "open", "per_page": 100}  # Assuming not too many PRs
-    response = requests.get(url, headers=get_headers(token), params=params, timeout=30)
+    url = f"/repos/{owner}/{repo}/pulls"
+    params = {"state": "open"}
 
-    if response.status_code != 200:
+    try:
+        return list(get_client(token).paginate(url, params=params))
+    except GitHubAPIError as exc:
+        response = exc.response
         print(f"Error fetching PRs: {response.status_code} - {response.text}")
         return []
 
-    return response.json()
-
 
 def is_daily_update_pr(pr: Dict[str, Any]) -> bool:
     """Check if PR title contains 'Daily Update'."""
@@ -60,8 +46,8 @@ def is_daily_update_pr(pr: Dict[str, Any]) -> bool:
 
 def check_pr_mergeable(owner: str, repo: str, token: str, pr_number: int) -> bool:
     """Check if a PR is mergeable."""
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{pr_number}"
-    response = requests.get(url, headers=get_headers(token), timeout=30)
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}"
+    response = get_client(token).get(url)
 
     if response.status_code != 200:
         print(
@@ -73,26 +59,63 @@ def check_pr_mergeable(owner: str, repo: str, token: str, pr_number: int) -> boo
     return pr_data.get("mergeable", False)
 
 
-def merge_pr(owner: str, repo: str, token: str, pr_number: int, pr_title: str) -> bool:
-    """Merge a pull request."""
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{pr_number}/merge"
+def merge_pr(
+    owner: str,
+    repo: str,
+    token: str,
+    pr_number: int,
+    pr_title: str,
+    sha: Optional[str] = None,
+) -> int:
+    """Merge a pull request and return the response status code.
+
+    With ``sha`` GitHub only merges that exact head.
+    """
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}/merge"
     data = {"merge_method": "merge"}  # or "squash", "rebase"
-    response = requests.put(url, headers=get_headers(token), json=data, timeout=30)
+    if sha:
+        data["sha"] = sha
+    response = get_client(token).put(url, json=data, retry=sha is not None)
 
     if response.status_code == 200:
         print(f"Successfully merged PR #{pr_number}: {pr_title}")
-        return True
+    elif sha and response.status_code in {405, 409}:
+        print(
+            f"PR #{pr_number} could not be merged as is "
+            f"({response.status_code}); checking it first."
+        )
     else:
         print(
             f"Failed to merge PR #{pr_number}: {response.status_code} - {response.text}"
         )
+    return response.status_code
+
+
+def merge_daily_pr(
+    owner: str, repo: str, token: str, pr: Dict[str, Any], optimistic: bool
+) -> bool:
+    """Merge one daily PR; return True if it was merged."""
+    pr_number = pr["number"]
+    pr_title = pr["title"]
+    sha = pr.get("head", {}).get("sha")
+    if optimistic and sha:
+        status = merge_pr(owner, repo, token, pr_number, pr_title, sha)
+        if status == 200:
+            return True
+        if status not in {405, 409}:
+            return False
+
+    if not check_pr_mergeable(owner, repo, token, pr_number):
+        print(f"PR #{pr_number} is not mergeable.")
         return False
+    return merge_pr(owner, repo, token, pr_number, pr_title) == 200
 
 
 def main():
     """Main function to merge daily update PRs."""
     token = get_github_token()
     owner, repo = get_repo_info()
+    optimistic = "--optimistic" in sys.argv
 
     print("Fetching open pull requests...")
     open_prs = get_open_prs(owner, repo, token)
@@ -114,18 +137,11 @@ def main():
     failed_count = 0
 
     for pr in daily_prs:
-        pr_number = pr["number"]
-        pr_title = pr["title"]
-
-        print(f"Checking PR #{pr_number}: {pr_title}")
+        print(f"Checking PR #{pr['number']}: {pr['title']}")
 
-        if check_pr_mergeable(owner, repo, token, pr_number):
-            if merge_pr(owner, repo, token, pr_number, pr_title):
-                merged_count += 1
-            else:
-                failed_count += 1
+        if merge_daily_pr(owner, repo, token, pr, optimistic):
+            merged_count += 1
         else:
-            print(f"PR #{pr_number} is not mergeable.")
             failed_count += 1
 
     print("\nSummary:")
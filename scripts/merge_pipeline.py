@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+One pass over the daily PRs: discover, classify, update, await, merge, report.
+
+The auto-merge workflow used to run resolve_conflicts.py and then
+auto_merge_prs.py. Each listed every PR and fetched its details, and both
+could update the same branch. The pipeline lists PRs once and hands each
+PR dict from stage to stage in memory:
+
+1. discover: list open PRs from the state store, the GraphQL snapshot or
+   REST, keep the daily ones, oldest first,
+2. classify: settle each PR's mergeable state from the local check, the
+   listing or cached verdicts, and a details call only for the rest,
+3. update: merge main into conflicted branches locally (``local_resolve``)
+   and plan batches with disjoint files (see merge_planner.py),
+4. await and merge: optionally push a merge train, then per batch let
+   MergeTracker fire update-branch, poll GitHub and merge each PR as soon
+   as it is clean, starting only the work that fits before the deadline
+   (see merge_scheduler.py),
+5. report: record outcomes in the state store and the PR warehouse (see
+   pr_warehouse.py), checkpoint the work left for the next run and return
+   the outcomes.
+
+A ``clean`` verdict GitHub gave for the current main is used like a local
+prediction until the run merges something, so those PRs merge without
+another poll.
+
+With ``optimistic`` the mergeable probe is skipped altogether: classify
+makes no details calls, and every PR not known to be behind or conflicted
+is merged straight away with ``sha`` pinned to its known head. A 405 (not
+mergeable, usually behind) or 409 (head moved) sends the PR back to the
+tracker's usual path: poll, update-branch, merge; any other refusal is a
+failure. A clean PR then costs one request instead of two. Once a PR has
+been reported ``behind`` (branches must be up to date) and the run has
+moved main, later PRs are behind too, so the guess is no longer made.
+
+``auto_merge_prs.py`` runs every stage over every daily PR;
+``resolve_conflicts.py`` classifies and, with ``--auto-resolve``, runs the
+rest over the PRs that are behind or conflicted.
+
+With ``native_auto_merge`` the merge stage first enables GitHub's
+auto-merge on every PR that can merge on its own (see
+native_auto_merge.py); GitHub merges those when they qualify, and only
+the PRs it refuses go on to update and merge. Combined with ``optimistic``
+only PRs known to be ``blocked`` or ``unstable`` are offered.
+
+Usage:
+    pipeline = MergePipeline(owner, repo, token, local_check=True)
+    report = pipeline.run()
+    print(report.count(MERGED))
+"""
+
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from conflict_check import CLEAN, LocalConflictChecker
+from github_client import GitHubAPIError, get_client, map_concurrent
+from local_update import update_branches_locally
+from merge_planner import MergePlan, plan_merges
+from merge_tracker import (
+    CONFLICT,
+    DEFERRED,
+    FAILED,
+    MERGED,
+    STALE_STATES,
+    MergeTracker,
+)
+from merge_scheduler import (
+    Checkpoint,
+    MergeScheduler,
+    get_checkpoint_path,
+    get_deadline,
+)
+from merge_train import run_merge_train
+from native_auto_merge import (
+    AUTO_MERGE,
+    WAITING_STATES,
+    enable_auto_merge,
+    print_result,
+)
+from pr_snapshot import fetch_open_pr_snapshot
+from pr_store import get_store, load_open_prs
+from pr_warehouse import get_warehouse
+
+
+def get_open_prs(owner: str, repo: str, token: str) -> List[Dict]:
+    try:
+        return list(
+            get_client(token).paginate(
+                f"/repos/{owner}/{repo}/pulls", params={"state": "open"}
+            )
+        )
+    except GitHubAPIError as exc:
+        print(f"Error fetching PRs: {exc.response.status_code}")
+        sys.exit(1)
+
+
+def get_pr_files(owner: str, repo: str, pr_number: int, token: str) -> Optional[List]:
+    try:
+        return [
+            item["filename"]
+            for item in get_client(token).paginate(
+                f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
+            )
+        ]
+    except requests.exceptions.RequestException as exc:
+        print(f"Network error listing files for PR #{pr_number}: {exc}")
+        return None
+
+
+def is_daily_pr(pr: Dict) -> bool:
+    title = pr.get("title", "")
+    return any(
+        marker in title
+        for marker in [
+            "Daily Update",
+            "daily-contribution",
+            "Contribution #",
+            "Contribution ",
+        ]
+    )
+
+
+def pr_sort_key(pr: Dict) -> datetime:
+    created_at = pr.get("created_at")
+    if not created_at:
+        return datetime.max.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+
+
+def get_pr(owner: str, repo: str, pr_number: int, token: str) -> Dict:
+    try:
+        response = get_client(token).get(f"/repos/{owner}/{repo}/pulls/{pr_number}")
+        if response.status_code == 200:
+            return response.json()
+    except requests.exceptions.RequestException as exc:
+        print(f"Network error checking PR #{pr_number}: {exc}")
+    return {}
+
+
+def update_pr_branch(
+    owner: str,
+    repo: str,
+    pr_number: int,
+    token: str,
+    expected_head_sha: Optional[str] = None,
+) -> bool:
+    # With the expected head SHA a repeated request cannot update twice,
+    # so the client may retry it after a transient failure.
+    body = {"expected_head_sha": expected_head_sha} if expected_head_sha else None
+    try:
+        response = get_client(token).post(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/update-branch",
+            headers={"Accept": "application/vnd.github.z3950-preview+json"},
+            json=body,
+            retry=expected_head_sha is not None,
+        )
+    except requests.exceptions.RequestException as exc:
+        print(f"    Network error updating branch: {exc}")
+        return False
+
+    if response.status_code in {200, 202}:
+        return True
+
+    print(f"    update-branch failed: {response.status_code}")
+    return False
+
+
+def merge_pr(
+    owner: str,
+    repo: str,
+    pr_number: int,
+    token: str,
+    sha: Optional[str] = None,
+    merge_method: str = "merge",
+) -> Optional[int]:
+    """Return the merge response's status code, or None on a network error."""
+    # Pinning the head SHA makes the merge safe to retry.
+    data = {"merge_method": merge_method}
+    if sha:
+        data["sha"] = sha
+    try:
+        response = get_client(token).put(
+            f"/repos/{owner}/{repo}/pulls/{pr_number}/merge",
+            json=data,
+            retry=sha is not None,
+        )
+    except requests.exceptions.RequestException as exc:
+        print(f"    Network error merging PR #{pr_number}: {exc}")
+        return None
+
+    if response.status_code != 200:
+        print(f"    merge failed: {response.status_code}")
+    return response.status_code
+
+
+def needs_update(pr: Dict) -> bool:
+    """Return whether a classified PR is behind or conflicted."""
+    return pr.get("mergeable_state") in STALE_STATES
+
+
+class PipelineReport:
+    """The classified daily PRs and what the pipeline did with them."""
+
+    def __init__(self, prs: List[Dict]):
+        self.prs = prs
+        self.plan: Optional[MergePlan] = None
+        self.outcomes: Dict[int, str] = {}
+        self.forced: List[int] = []
+
+    @property
+    def conflicted(self) -> List[Dict]:
+        return [pr for pr in self.prs if needs_update(pr)]
+
+    @property
+    def ready(self) -> List[Dict]:
+        return [
+            pr
+            for pr in self.prs
+            if pr.get("mergeable") is True and pr.get("mergeable_state") == "clean"
+        ]
+
+    @property
+    def checking(self) -> List[Dict]:
+        ready = {pr["number"] for pr in self.ready}
+        return [
+            pr for pr in self.prs if not needs_update(pr) and pr["number"] not in ready
+        ]
+
+    def count(self, outcome: str) -> int:
+        return list(self.outcomes.values()).count(outcome)
+
+
+class MergePipeline:
+    """Carry the daily PRs from one listing through every stage."""
+
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        token: str,
+        is_daily: Callable[[Dict], bool] = is_daily_pr,
+        local_check: bool = False,
+        local_resolve: bool = False,
+        merge_train: bool = False,
+        force_merge: bool = False,
+        checkpoint: bool = True,
+        optimistic: bool = False,
+        native_auto_merge: bool = False,
+    ):
+        self.owner = owner
+        self.repo = repo
+        self.token = token
+        self.is_daily = is_daily
+        self.local_check = local_check
+        self.local_resolve = local_resolve
+        self.merge_train = merge_train
+        self.force_merge = force_merge
+        self.optimistic = optimistic
+        self.native_auto_merge = native_auto_merge
+        self.up_to_date_required = False
+        self.client = get_client(token)
+        self.store = None
+        self.warehouse = get_warehouse(owner, repo)
+        self.from_snapshot = False
+        self.checker: Optional[LocalConflictChecker] = None
+        self.scheduler = MergeScheduler(get_deadline())
+        self.checkpoint = Checkpoint(
+            get_checkpoint_path() if checkpoint else None, f"{owner}/{repo}"
+        )
+
+    def should_stop(self) -> bool:
+        return self.client.unavailable or self.client.rate_limiter.is_low()
+
+    def run(
+        self,
+        select: Optional[Callable[[Dict], bool]] = None,
+        plan_only: bool = False,
+    ) -> PipelineReport:
+        """Run every stage; only PRs matching ``select`` are merged."""
+        report = PipelineReport(self.discover())
+        if not report.prs:
+            return report
+        if plan_only:
+            report.plan = self.plan(report.prs)
+            return report
+        self.classify(report.prs)
+        chosen = [pr for pr in report.prs if select is None or select(pr)]
+        self.merge(chosen, report)
+        return report
+
+    def discover(self) -> List[Dict]:
+        """List open PRs once and return the daily ones, oldest first.
+
+        The state store only re-reads PRs that changed; the snapshot and
+        the store carry files and head SHAs for the planner.
+        """
+        prs = load_open_prs(self.owner, self.repo, self.token)
+        if prs is None:
+            prs = fetch_open_pr_snapshot(self.owner, self.repo, self.token)
+            self.from_snapshot = prs is not None
+        if prs is None:
+            prs = get_open_prs(self.owner, self.repo, self.token)
+        self.store = get_store(self.owner, self.repo)
+        return sorted((pr for pr in prs if self.is_daily(pr)), key=pr_sort_key)
+
+    def classify(self, prs: List[Dict]) -> None:
+        """Set ``mergeable``, ``mergeable_state`` and ``predicted`` on each PR.
+
+        Snapshot entries already carry mergeability; REST listings do not,
+        and the store only has it for PRs whose head and main have not
+        moved. The rest, unless the local check decided them, need a
+        details call each, except in optimistic mode. Optimistic runs that
+        hand PRs to native auto-merge read the missing states from one
+        GraphQL snapshot instead, so PRs waiting on reviews or checks are
+        known to be ``blocked`` or ``unstable``.
+        """
+        predictions: Dict[int, Optional[str]] = {}
+        if self.local_check:
+            checker = LocalConflictChecker()
+            if checker.fetch(prs):
+                predictions = checker.predict_all(prs)
+                self.checker = checker
+            else:
+                print("Local check unavailable; using GitHub's mergeable flag.")
+                checker.close()
+
+        if not self.from_snapshot and self.optimistic and self.native_auto_merge:
+            self.read_snapshot_states(prs)
+        if not self.from_snapshot and not self.optimistic:
+            undecided = [
+                pr
+                for pr in prs
+                if predictions.get(pr["number"]) is None and pr.get("mergeable") is None
+            ]
+            fetched = map_concurrent(
+                lambda pr: get_pr(self.owner, self.repo, pr["number"], self.token),
+                undecided,
+            )
+            for pr, details in zip(undecided, fetched):
+                if not details:
+                    continue
+                pr["mergeable"] = details.get("mergeable")
+                pr["mergeable_state"] = details.get("mergeable_state")
+                pr["head"] = details.get("head") or pr.get("head", {})
+                if self.store:
+                    self.store.record_mergeability(
+                        pr["head"].get("sha"),
+                        details.get("mergeable"),
+                        details.get("mergeable_state"),
+                    )
+
+        for pr in prs:
+            pr["mergeable_state"] = pr.get("mergeable_state") or "unknown"
+            predicted = predictions.get(pr["number"])
+            # A clean local merge says nothing about "behind", which only
+            # GitHub knows; keep that state so the branch still gets updated.
+            if predicted == CLEAN and pr["mergeable_state"] == "behind":
+                predicted = None
+            pr["predicted"] = predicted
+            if predicted is not None:
+                pr["mergeable"], pr["mergeable_state"] = predicted == CLEAN, predicted
+        if any(pr["mergeable_state"] == "behind" for pr in prs):
+            self.up_to_date_required = True
+
+    def read_snapshot_states(self, prs: List[Dict]) -> None:
+        """Fill in unknown merge states from the open-PR snapshot."""
+        if all(pr.get("mergeable_state") not in (None, "unknown") for pr in prs):
+            return
+        snapshot = fetch_open_pr_snapshot(self.owner, self.repo, self.token)
+        if snapshot is None:
+            return
+        by_number = {entry["number"]: entry for entry in snapshot}
+        for pr in prs:
+            entry = by_number.get(pr["number"])
+            if (
+                entry is None
+                or pr.get("mergeable_state") not in (None, "unknown")
+                or entry["head"].get("sha") != pr.get("head", {}).get("sha")
+            ):
+                continue
+            pr["mergeable"] = entry.get("mergeable")
+            pr["mergeable_state"] = entry.get("mergeable_state")
+            if self.store:
+                self.store.record_mergeability(
+                    entry["head"].get("sha"),
+                    entry.get("mergeable"),
+                    entry.get("mergeable_state"),
+                )
+
+    def update(self, prs: List[Dict]) -> None:
+        """Merge main into conflicted branches locally, if enabled."""
+        dirty = [pr for pr in prs if pr["mergeable_state"] == "dirty"]
+        if not self.local_resolve or not dirty:
+            return
+        updated = update_branches_locally(
+            [
+                {
+                    "number": pr["number"],
+                    "head_ref": pr.get("head", {}).get("ref"),
+                    "head_sha": pr.get("head", {}).get("sha"),
+                }
+                for pr in dirty
+            ]
+        )
+        for pr in dirty:
+            if pr["number"] in updated:
+                # Main is already merged in; GitHub only has to recompute.
+                pr["head"] = dict(pr.get("head", {}), sha=updated[pr["number"]])
+                pr["mergeable"], pr["mergeable_state"] = None, "unknown"
+                pr["predicted"] = None
+
+    def plan(self, prs: List[Dict]) -> MergePlan:
+        """Resume checkpointed batches, plan the rest and print the plan."""
+        resumed = self.checkpoint.resume(prs)
+        seen = {pr["number"] for batch in resumed for pr in batch}
+        new = [pr for pr in prs if pr["number"] not in seen]
+        missing = [pr for pr in new if "files" not in pr]
+        for pr, files in zip(
+            missing,
+            map_concurrent(
+                lambda pr: get_pr_files(
+                    self.owner, self.repo, pr["number"], self.token
+                ),
+                missing,
+            ),
+        ):
+            if files is not None:
+                pr["files"] = files
+                if self.store:
+                    self.store.record_files(pr["number"], files)
+
+        plan = MergePlan(resumed + plan_merges(new).batches)
+        for line in plan.describe():
+            print(line)
+        return plan
+
+    def merge(self, prs: List[Dict], report: PipelineReport) -> None:
+        """Update, await and merge ``prs`` batch by batch; fill ``report``."""
+        if self.native_auto_merge:
+            prs = self.hand_off(prs, report)
+        if not prs:
+            return
+        self.update(prs)
+        report.plan = self.plan(prs)
+
+        # Batches hold PRs with disjoint files, so a batch merges back to back
+        # and later batches are updated once, after everything they overlap.
+        # Within a batch, update-branch goes out up front, PRs are polled
+        # together and each one merges as soon as GitHub reports it clean.
+        batches = report.plan.batches
+        if self.merge_train:
+            train = run_merge_train(
+                [pr for pr in report.plan.prs if not pr.get("draft")]
+            )
+            for number in train.merged:
+                report.outcomes[number] = MERGED
+                if self.store:
+                    self.store.record_outcome(number, MERGED)
+                if self.warehouse:
+                    self.warehouse.record_outcome(number, MERGED, "merge train")
+            batches = [
+                [pr for pr in batch if pr["number"] not in report.outcomes]
+                for batch in batches
+            ]
+            batches = [batch for batch in batches if batch]
+
+        for index, batch in enumerate(batches, 1):
+            if self.should_stop() or self.scheduler.remaining() <= 0:
+                break
+            print(f"\nBatch {index}/{len(batches)}:")
+            hints = self.hints(batch, MERGED in report.outcomes.values())
+            now, later = self.scheduler.schedule(batch, hints)
+            if now:
+                self.track(now, hints, report)
+            # Save progress after every batch in case the job is killed.
+            self.save_checkpoint(batches, report)
+            if later:
+                print(f"  {len(later)} PR(s) do not fit before the deadline")
+                break
+        if self.checker:
+            self.checker.close()
+
+        for pr in report.plan.prs:
+            report.outcomes.setdefault(pr["number"], DEFERRED)
+        self.save_checkpoint(batches, report)
+
+        if self.force_merge:
+            self.force(prs, report)
+
+    def hand_off(self, prs: List[Dict], report: PipelineReport) -> List[Dict]:
+        """Enable GitHub's auto-merge; return the PRs left for the loop."""
+        # Optimistic runs skip the probe, so most states are unknown and
+        # GitHub refuses auto-merge on the ones that are clean. Offer only
+        # PRs known to be waiting; the optimistic merge tries the rest.
+        states = WAITING_STATES if self.optimistic else None
+        result = enable_auto_merge(prs, self.token, states)
+        print_result(result)
+        for number in result.handed_off:
+            report.outcomes[number] = AUTO_MERGE
+        return [pr for pr in prs if pr["number"] not in report.outcomes]
+
+    def save_checkpoint(self, batches: List[List[Dict]], report: PipelineReport):
+        """Checkpoint every PR without a final outcome, in batch order."""
+        self.checkpoint.save(
+            [
+                [
+                    pr
+                    for pr in batch
+                    if report.outcomes.get(pr["number"], DEFERRED) == DEFERRED
+                ]
+                for batch in batches
+            ]
+        )
+
+    def hints(self, batch: List[Dict], moved: bool) -> Dict[int, Optional[str]]:
+        """Return the predicted state to hand the tracker for each PR."""
+        hints = self.known_hints(batch, moved)
+        if self.optimistic and not (moved and self.up_to_date_required):
+            # Try the merge first; a rejected one falls back to polling.
+            for pr in batch:
+                if (
+                    hints.get(pr["number"]) is None
+                    and pr.get("head", {}).get("sha")
+                    and pr["mergeable_state"] not in STALE_STATES
+                ):
+                    hints[pr["number"]] = CLEAN
+        return hints
+
+    def known_hints(self, batch: List[Dict], moved: bool) -> Dict[int, Optional[str]]:
+        if not moved:
+            # Nothing merged yet: local predictions and clean verdicts from
+            # GitHub still describe the current main.
+            return {
+                pr["number"]: pr["predicted"]
+                or (
+                    CLEAN
+                    if pr.get("mergeable") and pr["mergeable_state"] == CLEAN
+                    else None
+                )
+                for pr in batch
+            }
+        if self.checker:
+            # Earlier merges moved main; predict against where it is now.
+            self.checker.refresh_base()
+            return self.checker.predict_all(batch)
+        return {}
+
+    def track(
+        self,
+        batch: List[Dict],
+        hints: Dict[int, Optional[str]],
+        report: PipelineReport,
+    ) -> None:
+        """Run one batch through MergeTracker and record the outcomes."""
+        owner, repo, token = self.owner, self.repo, self.token
+        tracker = MergeTracker(
+            lambda number: get_pr(owner, repo, number, token),
+            lambda number, sha: update_pr_branch(owner, repo, number, token, sha),
+            lambda number, sha: merge_pr(owner, repo, number, token, sha),
+            timeout=self.scheduler.remaining(),
+            should_stop=self.should_stop,
+        )
+        for pr in batch:
+            print(f"Tracking PR #{pr['number']}: {pr['title']}")
+            tracker.add(
+                pr["number"],
+                pr["title"],
+                pr.get("head", {}).get("sha"),
+                pr["mergeable_state"],
+                hints.get(pr["number"]),
+            )
+        report.outcomes.update(tracker.run())
+        for pr, tracked in zip(batch, tracker.prs):
+            # update-branch moves the head; later stages need the new one,
+            # and the state classified for the old head no longer holds.
+            if tracked.head_sha and tracked.head_sha != pr.get("head", {}).get("sha"):
+                pr["head"] = dict(pr.get("head", {}), sha=tracked.head_sha)
+                pr["branch_updated"] = True
+            # Only updates of conflicted branches count as repairs; the
+            # rest were sent because the PR was behind.
+            if tracked.updates > tracked.repairs:
+                self.up_to_date_required = True
+            if self.store:
+                self.store.record_tracked(tracked)
+            if self.warehouse and tracked.outcome in {MERGED, CONFLICT, FAILED}:
+                self.warehouse.record_outcome(
+                    tracked.number, tracked.outcome, tracked.mergeable_state
+                )
+
+    def force(self, prs: List[Dict], report: PipelineReport) -> None:
+        """Squash-merge PRs that are still conflicted or failed."""
+        for pr in prs:
+            number = pr["number"]
+            if report.outcomes.get(number) not in {CONFLICT, FAILED}:
+                continue
+            print(f"  PR #{number} still not clean. Trying squash merge...")
+            sha = pr.get("head", {}).get("sha")
+            status = merge_pr(self.owner, self.repo, number, self.token, sha, "squash")
+            if status == 200:
+                print(f"  Successfully squash-merged PR #{number}")
+                report.outcomes[number] = MERGED
+                report.forced.append(number)
+                if self.store:
+                    self.store.record_outcome(number, MERGED)
+                if self.warehouse:
+                    self.warehouse.record_outcome(number, MERGED, "squash")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Order PRs into batches that can merge without updating each other.
+
+Two daily PRs that touch the same file (usually README.md) cannot both merge
+as they are: once one merges, the other goes ``dirty`` or ``behind`` and
+needs an update-branch round trip before GitHub will merge it. Merging
+strictly by ``created_at`` pays that round trip whenever overlapping PRs
+are interleaved, and pays it again when a PR is updated before the last
+PR it overlaps has merged.
+
+The planner groups PRs into batches whose changed files do not overlap.
+Each PR goes into the batch right after the last one holding an older PR
+it overlaps, so overlapping PRs still merge oldest first. A batch merges
+back to back; PRs in later batches are updated once, after every PR they
+overlap has merged. PRs whose file list is unknown or truncated get a
+batch of their own.
+
+Before anything is merged the plan and its predicted API and time cost are
+printed next to the cost of merging in creation order.
+"""
+
+from typing import Dict, List, Optional, Set
+
+# Rough costs used for the printed prediction.
+MERGEABLE_WAIT = 5.0  # seconds GitHub takes to recompute mergeability
+REQUEST_TIME = 0.4  # seconds per API call
+POLLS_PER_UPDATE = 2  # detail polls before an updated PR reports clean
+MAX_LISTED_BATCHES = 10
+
+
+def pr_files(pr: Dict) -> Optional[Set[str]]:
+    """Return the PR's changed files, or None if they are not all known."""
+    files = pr.get("files")
+    if files is None:
+        return None
+    if pr.get("changed_files", len(files)) > len(files):
+        return None
+    return set(files)
+
+
+class MergePlan:
+    """Batches of PRs plus the predicted cost of merging them."""
+
+    def __init__(self, batches: List[List[Dict]]):
+        self.batches = batches
+
+    @property
+    def prs(self) -> List[Dict]:
+        return [pr for batch in self.batches for pr in batch]
+
+    def cost(self) -> Dict:
+        return estimate_cost(self.batches)
+
+    def describe(self) -> List[str]:
+        """Return printable lines describing the plan and its cost."""
+        planned = self.cost()
+        baseline = estimate_creation_order(self.prs)
+        lines = [f"Merge plan: {len(self.prs)} PR(s) in {len(self.batches)} batch(es)"]
+        for index, batch in enumerate(self.batches[:MAX_LISTED_BATCHES], 1):
+            numbers = ", ".join(f"#{pr['number']}" for pr in batch)
+            lines.append(f"  Batch {index}: {numbers}")
+        if len(self.batches) > MAX_LISTED_BATCHES:
+            hidden = len(self.batches) - MAX_LISTED_BATCHES
+            lines.append(f"  ... and {hidden} more batch(es)")
+        lines.append(
+            f"Predicted: {planned['updates']} update-branch call(s), "
+            f"{planned['api_calls']} API call(s), ~{planned['seconds']:.0f}s"
+        )
+        lines.append(
+            f"Creation order: {baseline['updates']} update-branch call(s), "
+            f"{baseline['api_calls']} API call(s), ~{baseline['seconds']:.0f}s"
+        )
+        return lines
+
+
+def sorted_by_created(prs: List[Dict]) -> List[Dict]:
+    return sorted(prs, key=lambda pr: (pr.get("created_at") or "", pr["number"]))
+
+
+def plan_merges(prs: List[Dict]) -> MergePlan:
+    """Group ``prs`` (oldest first) into batches with disjoint file sets."""
+    batches: List[List[Dict]] = []
+    batch_files: List[Set[str]] = []
+    isolated: List[List[Dict]] = []
+
+    for pr in sorted_by_created(prs):
+        files = pr_files(pr)
+        if files is None:
+            isolated.append([pr])
+            continue
+        # The batch after the last one this PR overlaps, so it merges after
+        # every older PR it would otherwise conflict with.
+        target = 0
+        for index, used in enumerate(batch_files):
+            if used & files:
+                target = index + 1
+        if target < len(batches):
+            batches[target].append(pr)
+            batch_files[target] |= files
+        else:
+            batches.append([pr])
+            batch_files.append(set(files))
+
+    return MergePlan(batches + isolated)
+
+
+def estimate_cost(batches: List[List[Dict]]) -> Dict:
+    """Predict update-branch calls, API calls and time for ``batches``.
+
+    A PR needs one update if it overlaps a PR merged in an earlier batch
+    (an unknown file list counts as overlapping). Each batch that needs
+    updates waits once for GitHub to recompute mergeability.
+    """
+    merged: Set[str] = set()
+    anything_merged = False
+    updates = 0
+    waits = 0
+    for batch in batches:
+        batch_updates = 0
+        for pr in batch:
+            files = pr_files(pr)
+            if anything_merged and (files is None or files & merged):
+                batch_updates += 1
+        for pr in batch:
+            merged |= pr_files(pr) or set()
+        anything_merged = anything_merged or bool(batch)
+        updates += batch_updates
+        waits += 1 if batch_updates else 0
+    return _cost(len(batches), sum(len(batch) for batch in batches), updates, waits)
+
+
+def estimate_creation_order(prs: List[Dict]) -> Dict:
+    """Predict the cost of merging ``prs`` oldest first, without batching.
+
+    Every merge leaves the younger PRs that overlap it stale again, so a PR
+    is updated once per older PR it overlaps, and every merge of an
+    overlapped PR costs a wait.
+    """
+    ordered = sorted_by_created(prs)
+    updates = 0
+    waits = 0
+    for index, pr in enumerate(ordered):
+        files = pr_files(pr)
+        overlaps = sum(
+            1
+            for older in ordered[:index]
+            if files is None or pr_files(older) is None or files & pr_files(older)
+        )
+        updates += overlaps
+        waits += 1 if overlaps else 0
+    return _cost(len(ordered), len(ordered), updates, waits)
+
+
+def _cost(batches: int, prs: int, updates: int, waits: int) -> Dict:
+    # One detail poll and one merge per PR, plus an update and its polls.
+    api_calls = 2 * prs + updates * (1 + POLLS_PER_UPDATE)
+    return {
+        "batches": batches,
+        "updates": updates,
+        "api_calls": api_calls,
+        "seconds": api_calls * REQUEST_TIME + waits * MERGEABLE_WAIT,
+    }
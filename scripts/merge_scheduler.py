@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Fit the merge work into the job's time budget and resume it on the next run.
+
+The auto-merge job is killed after ``timeout-minutes``; a run cut off in
+the middle of a batch loses what it learned and the next run starts over.
+The scheduler works against a wall-clock deadline instead:
+
+- each PR's cost is estimated from what is known about it, using the
+  planner's timings (see merge_planner.py): a merge for a PR known to be
+  clean, a poll and a merge for one reported clean, a full update-branch
+  cycle for one that is behind or conflicted, a wait for GitHub for the
+  rest,
+- within a batch the cheapest and then oldest PRs go first, and only as
+  many as fit in the time left are started,
+- after every batch the remaining work (PRs, head SHAs, known states and
+  batch order) is written to a checkpoint, well before the deadline. A
+  PR whose branch this run updated is saved without a state.
+
+The next run resumes the checkpointed batches first, for PRs that are
+still open, and only plans the PRs that are new. A PR whose head moved
+keeps its place but loses its recorded state. The checkpoint is removed
+once a run finishes all its work.
+
+Environment Variables:
+    GITHUB_MERGE_DEADLINE: Unix time by which merging must stop
+        (defaults to now + GITHUB_MERGE_TIMEOUT; the earlier one wins)
+    GITHUB_MERGE_CHECKPOINT: checkpoint path, or "off" to disable
+        (defaults to .cache/merge-checkpoint.json)
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from merge_planner import MERGEABLE_WAIT, POLLS_PER_UPDATE, REQUEST_TIME
+from merge_tracker import STALE_STATES, get_merge_timeout
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(".cache", "merge-checkpoint.json")
+CHECKPOINT_FORMAT_VERSION = 1
+# Seconds kept back from the deadline for the checkpoint and the summary.
+SAFETY_MARGIN = 20.0
+
+
+def get_deadline(clock: Callable[[], float] = time.time) -> float:
+    """Return the wall-clock time by which merging must stop."""
+    deadline = clock() + get_merge_timeout()
+    try:
+        return min(deadline, float(os.environ["GITHUB_MERGE_DEADLINE"]))
+    except (KeyError, ValueError):
+        return deadline
+
+
+def get_checkpoint_path() -> Optional[str]:
+    """Return the configured checkpoint file, or None when it is disabled."""
+    path = os.environ.get("GITHUB_MERGE_CHECKPOINT", DEFAULT_CHECKPOINT_PATH).strip()
+    if path.lower() in {"", "0", "off", "false", "no"}:
+        return None
+    return path
+
+
+def estimate_cost(pr: Dict, predicted: Optional[str] = None) -> float:
+    """Return the estimated seconds of API work to finish ``pr``."""
+    if predicted == "dirty":
+        return 0.0  # reported as a conflict without a call
+    if predicted == "clean":
+        return REQUEST_TIME
+    state = pr.get("mergeable_state")
+    if state == "clean":
+        return 2 * REQUEST_TIME
+    if state in STALE_STATES:
+        return (POLLS_PER_UPDATE + 2) * REQUEST_TIME + MERGEABLE_WAIT
+    return (POLLS_PER_UPDATE + 1) * REQUEST_TIME + MERGEABLE_WAIT
+
+
+class MergeScheduler:
+    """Order and cut batches so the work started fits before the deadline."""
+
+    def __init__(self, deadline: float, clock: Callable[[], float] = time.time):
+        self.deadline = deadline
+        self.clock = clock
+
+    def remaining(self) -> float:
+        """Seconds left for merging, after the safety margin."""
+        return self.deadline - SAFETY_MARGIN - self.clock()
+
+    def schedule(
+        self, batch: List[Dict], hints: Dict[int, Optional[str]]
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Split ``batch`` into PRs to start now and PRs left for later.
+
+        PRs are taken cheapest first, oldest first among equals, while the
+        running total of their estimated cost fits in the time left.
+        """
+        ordered = sorted(
+            enumerate(batch),
+            key=lambda item: (
+                estimate_cost(item[1], hints.get(item[1]["number"])),
+                item[0],
+            ),
+        )
+        budget = self.remaining()
+        now: List[Dict] = []
+        later: List[Dict] = []
+        for _, pr in ordered:
+            cost = estimate_cost(pr, hints.get(pr["number"]))
+            if not later and cost <= budget:
+                now.append(pr)
+                budget -= cost
+            else:
+                later.append(pr)
+        return now, later
+
+
+class Checkpoint:
+    """Remaining merge work saved as JSON between scheduled runs."""
+
+    def __init__(self, path: Optional[str], repository: str):
+        self.path = path
+        self.repository = repository
+
+    def load(self) -> Optional[Dict]:
+        """Return the saved checkpoint, or None if there is no usable one."""
+        if not self.path:
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            data.get("version") != CHECKPOINT_FORMAT_VERSION
+            or data.get("repository") != self.repository
+        ):
+            return None
+        return data
+
+    def resume(self, prs: List[Dict]) -> List[List[Dict]]:
+        """Return the checkpointed batches, restricted to ``prs``.
+
+        PRs take their recorded state when their head has not moved since.
+        """
+        data = self.load()
+        if data is None:
+            return []
+        by_number = {pr["number"]: pr for pr in prs}
+        batches = []
+        for saved_batch in data.get("batches", []):
+            batch = []
+            for saved in saved_batch:
+                pr = by_number.pop(saved["number"], None)
+                if pr is None:
+                    continue  # merged or closed since, or not selected
+                head_sha = pr.get("head", {}).get("sha")
+                if head_sha == saved.get("head_sha") and pr.get(
+                    "mergeable_state", "unknown"
+                ) in {None, "unknown"}:
+                    pr["mergeable_state"] = saved.get("mergeable_state") or "unknown"
+                batch.append(pr)
+            if batch:
+                batches.append(batch)
+        if batches:
+            count = sum(len(batch) for batch in batches)
+            print(
+                f"Resuming {count} PR(s) in {len(batches)} batch(es) from the "
+                f"checkpoint written at {data.get('written_at', 'unknown time')}"
+            )
+        return batches
+
+    def save(self, batches: List[List[Dict]]) -> None:
+        """Write the remaining batches, or remove the file if none remain."""
+        if not self.path:
+            return
+        batches = [batch for batch in batches if batch]
+        if not batches:
+            self.clear()
+            return
+        data = {
+            "version": CHECKPOINT_FORMAT_VERSION,
+            "repository": self.repository,
+            "written_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "batches": [
+                [
+                    {
+                        "number": pr["number"],
+                        "head_sha": pr.get("head", {}).get("sha"),
+                        "mergeable_state": (
+                            None
+                            if pr.get("branch_updated")
+                            else pr.get("mergeable_state")
+                        ),
+                    }
+                    for pr in batch
+                ]
+                for batch in batches
+            ],
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
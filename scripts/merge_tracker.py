@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Track many PRs through update-branch and mergeability at once.
+
+GitHub computes ``mergeable`` in the background after a branch moves, so the
+merge scripts used to sleep a fixed 10-20 seconds per PR and handle one PR
+at a time. The tracker instead:
+
+1. fires ``update-branch`` for every conflicted PR up front,
+2. polls every PR still waiting for GitHub in one concurrent round,
+3. merges each PR as soon as it reports clean, oldest first,
+4. waits between rounds with adaptive backoff: short while PRs keep
+   changing state, longer while nothing moves.
+
+When branch protection requires branches to be up to date, every merge
+leaves the other PRs ``behind`` again and only one can merge per update.
+Those PRs are re-updated ``window`` at a time (default one), oldest first,
+so a long queue does not spend an update-branch call per PR per merge.
+
+A PR added with a ``predicted`` state from a local check (see
+conflict_check.py) skips GitHub's mergeability computation: a predicted
+``clean`` PR is merged in the first round without polling, and a predicted
+``dirty`` PR is reported as a conflict without an update-branch call that
+could only fail.
+
+Usage:
+    tracker = MergeTracker(get_details, update_branch, merge)
+    for pr in prs:
+        tracker.add(pr["number"], pr["title"])
+    outcomes = tracker.run()  # {number: "merged" | "conflict" | ...}
+
+Environment Variables:
+    GITHUB_MERGE_TIMEOUT: seconds to keep tracking before giving up
+        (default 600)
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from github_client import map_concurrent
+
+DEFAULT_TIMEOUT = 600.0
+INITIAL_DELAY = 2.0
+MAX_DELAY = 15.0
+BACKOFF_FACTOR = 1.5
+# Repeat updates in flight at once for PRs that only fell behind.
+DEFAULT_WINDOW = 1
+# Updates per PR for states other than "behind", which only means another
+# merge moved main and is always worth another update.
+MAX_UPDATES = 3
+MAX_MERGE_ATTEMPTS = 2
+# Merge refusals that mean "not yet": 405 (not mergeable, usually behind)
+# and 409 (head moved). The PR goes back to polling; any other failure
+# will not go away by waiting.
+RETRY_MERGE_STATUSES = {405, 409}
+
+# Outcomes reported by MergeTracker.run().
+MERGED = "merged"
+CONFLICT = "conflict"
+FAILED = "failed"
+SKIPPED = "skipped"
+DEFERRED = "deferred"
+
+# mergeable_state values that an update-branch can fix.
+STALE_STATES = {"behind", "dirty"}
+
+
+def get_merge_timeout() -> float:
+    try:
+        return float(os.environ.get("GITHUB_MERGE_TIMEOUT", DEFAULT_TIMEOUT))
+    except ValueError:
+        return DEFAULT_TIMEOUT
+
+
+class TrackedPR:
+    """Progress of one PR through the tracker."""
+
+    def __init__(self, number: int, title: str = "", head_sha: Optional[str] = None):
+        self.number = number
+        self.title = title
+        self.head_sha = head_sha
+        self.mergeable_state = "unknown"
+        self.stale = False
+        self.updates = 0
+        self.merge_attempts = 0
+        self.repairs = 0
+        self.predicted = False
+        self.outcome: Optional[str] = None
+
+
+class MergeTracker:
+    """Update, poll and merge a set of PRs concurrently.
+
+    ``get_details(number)`` returns the PR as the REST API does (or ``{}``
+    on error), ``update_branch(number, head_sha)`` returns True on success
+    and ``merge(number, head_sha)`` returns the merge response's status code
+    (None on a network error). Writes are issued
+    one at a time from the calling thread; only polling is concurrent.
+    """
+
+    def __init__(
+        self,
+        get_details: Callable[[int], Dict],
+        update_branch: Callable[[int, Optional[str]], bool],
+        merge: Callable[[int, Optional[str]], Optional[int]],
+        timeout: Optional[float] = None,
+        window: Optional[int] = None,
+        should_stop: Callable[[], bool] = lambda: False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        self.get_details = get_details
+        self.update_branch = update_branch
+        self.merge = merge
+        self.timeout = timeout if timeout is not None else get_merge_timeout()
+        self.window = window or DEFAULT_WINDOW
+        self.should_stop = should_stop
+        self.clock = clock
+        self.sleep = sleep
+        self.prs: List[TrackedPR] = []
+        self.slept = 0.0
+
+    def add(
+        self,
+        number: int,
+        title: str = "",
+        head_sha: Optional[str] = None,
+        mergeable_state: Optional[str] = None,
+        predicted: Optional[str] = None,
+    ) -> None:
+        """Track a PR; a known stale state sends it straight to update-branch.
+
+        ``predicted`` is a state computed locally against the current base
+        and overrides ``mergeable_state``.
+        """
+        pr = TrackedPR(number, title, head_sha)
+        self.prs.append(pr)
+        if predicted == "dirty":
+            pr.mergeable_state = predicted
+            self.finish(pr, CONFLICT, "conflicts with the base branch locally")
+        elif predicted == "clean":
+            pr.mergeable_state = predicted
+            pr.predicted = True
+        elif mergeable_state:
+            pr.mergeable_state = mergeable_state
+            pr.stale = mergeable_state in STALE_STATES
+
+    def outcomes(self) -> Dict[int, str]:
+        return {pr.number: pr.outcome or DEFERRED for pr in self.prs}
+
+    def run(self) -> Dict[int, str]:
+        """Work until every PR has an outcome, then return them by number."""
+        deadline = self.clock() + self.timeout
+        delay = INITIAL_DELAY
+        first_round = True
+        while True:
+            if self.should_stop() or self.clock() >= deadline:
+                self.defer_remaining()
+                break
+            sent = self.fire_updates()
+            if first_round:
+                sent += self.merge_predicted()
+            waiting = [pr for pr in self.prs if pr.outcome is None and not pr.stale]
+            if not waiting:
+                # Nothing left to poll; stale PRs here could not be updated.
+                self.defer_remaining()
+                break
+            if sent or not first_round:
+                self.wait(min(delay, max(deadline - self.clock(), 0.0)))
+            first_round = False
+            progressed = self.poll(waiting)
+            delay = (
+                INITIAL_DELAY if progressed else min(delay * BACKOFF_FACTOR, MAX_DELAY)
+            )
+        return self.outcomes()
+
+    def pending_updates(self) -> List[TrackedPR]:
+        return [pr for pr in self.prs if pr.outcome is None and pr.stale]
+
+    def fire_updates(self) -> int:
+        """Send update-branch for stale PRs and return how many were sent.
+
+        Conflicted PRs get their first update right away. PRs that are only
+        behind, and repeat updates, wait until fewer than ``window`` updated
+        PRs are still waiting on GitHub.
+        """
+        sent = 0
+        in_flight = sum(
+            1
+            for pr in self.prs
+            if pr.outcome is None and not pr.stale and pr.updates > 0
+        )
+        for pr in self.pending_updates():
+            if self.should_stop():
+                break
+            # "behind" is only reported when branches must be up to date, so
+            # at most one of them can merge per update of main.
+            queued = pr.updates > 0 or pr.mergeable_state == "behind"
+            if queued and in_flight >= self.window:
+                continue
+            if pr.mergeable_state != "behind":
+                if pr.repairs >= MAX_UPDATES:
+                    self.finish(pr, FAILED)
+                    continue
+                pr.repairs += 1
+            print(
+                f"  PR #{pr.number} needs branch update (state: {pr.mergeable_state})"
+            )
+            pr.updates += 1
+            sent += 1
+            if self.update_branch(pr.number, pr.head_sha):
+                pr.stale = False
+                pr.merge_attempts = 0
+                in_flight += 1
+            else:
+                self.finish(pr, CONFLICT if pr.mergeable_state == "dirty" else FAILED)
+        return sent
+
+    def merge_predicted(self) -> int:
+        """Merge PRs predicted clean without polling; return merges tried.
+
+        PRs that fail to merge (usually left behind by the merge before
+        them) are polled like any other.
+        """
+        tried = 0
+        merged = False
+        for pr in self.prs:
+            if pr.outcome is not None or not pr.predicted:
+                continue
+            if self.should_stop():
+                break
+            tried += 1
+            if self.try_merge(pr):
+                merged = True
+            elif merged:
+                break
+        return tried
+
+    def poll(self, waiting: List[TrackedPR]) -> bool:
+        """Refresh ``waiting`` PRs concurrently and act on the results.
+
+        Returns True if any PR changed state.
+        """
+        all_details = map_concurrent(lambda pr: self.get_details(pr.number), waiting)
+        progressed = False
+        merged = stop_merging = False
+        for pr, details in zip(waiting, all_details):
+            if not details:
+                continue
+            if details.get("head", {}).get("sha"):
+                pr.head_sha = details["head"]["sha"]
+            mergeable = details.get("mergeable")
+            state = details.get("mergeable_state") or "unknown"
+            previous, pr.mergeable_state = pr.mergeable_state, state
+
+            if details.get("state", "open") != "open" or details.get("merged"):
+                self.finish(pr, SKIPPED, "is no longer open")
+            elif details.get("draft"):
+                self.finish(pr, SKIPPED, "is a draft")
+            elif mergeable is None:
+                continue
+            elif mergeable and state not in STALE_STATES:
+                if stop_merging:
+                    continue
+                if self.try_merge(pr):
+                    merged = True
+                elif merged:
+                    # Main moved under the rest of this round's results;
+                    # look at them again next round.
+                    stop_merging = True
+            elif state == "dirty" and pr.updates > 0:
+                self.finish(pr, CONFLICT, "has merge conflicts")
+            else:
+                pr.stale = True
+            progressed = progressed or pr.outcome is not None or state != previous
+        return progressed
+
+    def try_merge(self, pr: TrackedPR) -> bool:
+        """Merge ``pr`` and return True if it was merged."""
+        print(f"  Merging PR #{pr.number}...")
+        pr.merge_attempts += 1
+        status = self.merge(pr.number, pr.head_sha)
+        if status == 200:
+            self.finish(pr, MERGED)
+            return True
+        if status not in RETRY_MERGE_STATUSES:
+            self.finish(
+                pr, FAILED, f"could not be merged ({status or 'network error'})"
+            )
+        elif pr.merge_attempts >= MAX_MERGE_ATTEMPTS:
+            self.finish(pr, FAILED)
+        # Otherwise poll again: the merge usually failed because another
+        # merge just left this PR behind.
+        return False
+
+    def finish(self, pr: TrackedPR, outcome: str, reason: str = "") -> None:
+        pr.outcome = outcome
+        if outcome == MERGED:
+            print(f"  Successfully merged PR #{pr.number}")
+        elif reason:
+            print(f"  PR #{pr.number} {reason}. Skipping.")
+        else:
+            print(f"  PR #{pr.number} is not mergeable (state: {pr.mergeable_state})")
+
+    def defer_remaining(self) -> None:
+        for pr in self.prs:
+            if pr.outcome is None:
+                pr.outcome = DEFERRED
+
+    def wait(self, delay: float) -> None:
+        if delay <= 0:
+            return
+        self.slept += delay
+        (self.sleep or time.sleep)(delay)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Merge many PR heads locally and push them to main in one go.
+
+Merging through the API costs an update-branch, several mergeability polls
+and a merge call per PR, and every merge leaves the overlapping PRs behind
+again. The merge train does the same work with git in the Actions checkout:
+
+1. fetch ``main`` and each PR's ``refs/pull/<n>/head`` with narrow
+   refspecs (no tags, no other branches),
+2. merge the heads one after another, in plan order, into a detached
+   worktree of ``origin/main`` with ``--no-ff`` merge commits,
+3. push the resulting commit to ``main`` once, without forcing.
+
+GitHub marks a PR as merged as soon as its head commit is reachable from
+the base branch, so the single push closes every PR in the train. A PR that
+conflicts locally, or whose head moved since it was listed, is left out of
+the train for the normal API path. If the push is rejected (``main`` moved,
+or branch protection forbids direct pushes) nothing is merged and every PR
+goes down the normal path.
+
+The checkout needs full history for the merges; a shallow checkout is
+deepened on the first fetch. Pushing needs ``contents: write``.
+
+Usage:
+    result = run_merge_train(plan.prs)
+    leftover = [pr for pr in prs if pr["number"] not in result.merged]
+"""
+
+from typing import Dict, List, Optional
+
+from git_ops import (
+    DEFAULT_BASE,
+    DEFAULT_REMOTE,
+    delete_pr_heads,
+    fetch_base,
+    fetch_pr_heads,
+    identity_args,
+    rev_parse,
+    run_git,
+    temporary_worktree,
+)
+from readme_merge import driver_args
+
+
+class TrainResult:
+    """What happened to each PR offered to the train."""
+
+    def __init__(self):
+        self.integrated: List[int] = []
+        self.conflicts: List[int] = []
+        self.skipped: List[int] = []
+        self.commit: Optional[str] = None
+        self.pushed = False
+
+    @property
+    def merged(self) -> List[int]:
+        """PRs that reached ``main``; empty unless the push succeeded."""
+        return self.integrated if self.pushed else []
+
+
+def merge_message(pr: Dict) -> str:
+    ref = pr.get("head", {}).get("ref") or f"refs/pull/{pr['number']}/head"
+    return f"Merge pull request #{pr['number']} from {ref}\n\n{pr.get('title', '')}"
+
+
+def merge_heads(prs: List[Dict], heads: Dict[int, str], tree: str, result: TrainResult):
+    """Merge each PR head into ``tree`` in order, skipping conflicts."""
+    options = identity_args(tree) + driver_args()
+    for pr in prs:
+        number = pr["number"]
+        expected = pr.get("head", {}).get("sha")
+        sha = heads.get(number)
+        if not sha or (expected and sha != expected):
+            print(f"  PR #{number}: head not fetched or moved; skipping")
+            result.skipped.append(number)
+            continue
+        success, _, _ = run_git(
+            [*options, "merge", "--no-ff", "--no-edit", "-m", merge_message(pr), sha],
+            tree,
+        )
+        if success:
+            result.integrated.append(number)
+        else:
+            run_git(["merge", "--abort"], tree)
+            print(f"  PR #{number}: conflicts locally; leaving it for the API")
+            result.conflicts.append(number)
+
+
+def push_train(
+    result: TrainResult, base_sha: str, remote: str, base: str, tree: str, push: bool
+) -> None:
+    """Record the integration commit and push it to ``base`` once."""
+    result.commit = rev_parse("HEAD", tree)
+    print(
+        f"  Integrated {len(result.integrated)} PR(s) into "
+        f"{result.commit[:12]} on top of {base_sha[:12]}"
+    )
+    if not push:
+        return
+    success, _, stderr = run_git(
+        ["push", "--quiet", remote, f"{result.commit}:refs/heads/{base}"], tree
+    )
+    if success:
+        result.pushed = True
+        print(f"  Pushed {len(result.integrated)} merge(s) to {base} in one push")
+    else:
+        print(f"  Push to {base} rejected; using the API for every PR: {stderr}")
+
+
+def run_merge_train(
+    prs: List[Dict],
+    remote: str = DEFAULT_REMOTE,
+    base: str = DEFAULT_BASE,
+    cwd: Optional[str] = None,
+    push: bool = True,
+) -> TrainResult:
+    """Merge ``prs`` in order on top of ``remote/base`` and push once."""
+    result = TrainResult()
+    numbers = [pr["number"] for pr in prs]
+    print(f"\n🚂 Merge train: fetching {len(numbers)} PR head(s)...")
+    base_sha = fetch_base(remote, base, cwd)
+    if not base_sha:
+        result.skipped = numbers
+        return result
+    heads = fetch_pr_heads(numbers, remote, cwd)
+
+    try:
+        with temporary_worktree(base_sha, cwd) as tree:
+            merge_heads(prs, heads, tree, result)
+            if result.integrated:
+                push_train(result, base_sha, remote, base, tree, push)
+    except RuntimeError as exc:
+        print(f"  {exc}")
+        result.skipped = numbers
+    finally:
+        delete_pr_heads(list(heads), cwd)
+    return result
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Hand daily PRs to GitHub's own auto-merge instead of polling them.
+
+The cron job polls every PR until it is clean. GitHub can do the waiting
+itself: with auto-merge enabled (``enablePullRequestAutoMerge``) a PR
+merges on the server as soon as it meets the branch protection rules, with
+no Actions minutes and no polling requests.
+
+One GraphQL document enables auto-merge on up to ``CHUNK_SIZE`` PRs, one
+aliased mutation field per PR, each pinned to the head SHA that was
+listed. Each field fails on its own, so the errors say which PRs GitHub
+refused: those already clean (merge them directly), drafts, PRs whose head
+moved, or every PR when the repository does not allow auto-merge. Refused
+PRs go through the normal merge loop.
+
+Only PRs that may merge without help are offered. PRs known to be behind
+or conflicted still need update-branch from the loop, and PRs known to be
+clean are merged directly since GitHub refuses auto-merge for them. PRs
+that already have auto-merge enabled are left alone, unless they are
+behind or conflicted: GitHub does not update branches by itself.
+
+Usage:
+    result = enable_auto_merge(prs, token)
+    leftover = [pr for pr in prs if pr["number"] not in result.handed_off]
+"""
+
+from typing import Dict, List, Optional, Set
+
+import requests
+
+from github_client import get_client
+from merge_tracker import STALE_STATES
+
+CHUNK_SIZE = 25
+MERGE_METHOD = "MERGE"
+# Pipeline outcome for PRs left to GitHub's auto-merge.
+AUTO_MERGE = "auto_merge"
+# States in which a PR is known to wait on checks or reviews.
+WAITING_STATES = {"blocked", "unstable"}
+
+MUTATION_FIELD = """
+  pr{index}: enablePullRequestAutoMerge(input: $pr{index}) {{
+    pullRequest {{ number }}
+  }}"""
+
+
+class AutoMergeResult:
+    """Which PRs GitHub will merge on its own, and why the rest will not."""
+
+    def __init__(self):
+        self.enabled: List[int] = []
+        self.already_enabled: List[int] = []
+        self.refused: Dict[int, str] = {}
+
+    @property
+    def handed_off(self) -> List[int]:
+        """PRs GitHub now merges without the loop."""
+        return self.already_enabled + self.enabled
+
+
+def is_eligible(pr: Dict) -> bool:
+    """True if ``pr`` can merge without the loop's help once it qualifies."""
+    if pr.get("draft") or not pr.get("node_id") or not pr.get("head", {}).get("sha"):
+        return False
+    state = pr.get("mergeable_state")
+    if state in STALE_STATES:
+        return False
+    return not (pr.get("mergeable") and state == "clean")
+
+
+def build_mutation(chunk: List[Dict]) -> tuple[str, Dict]:
+    """Return the aliased mutation document and its variables for ``chunk``."""
+    declarations = ", ".join(
+        f"$pr{index}: EnablePullRequestAutoMergeInput!" for index in range(len(chunk))
+    )
+    fields = "".join(MUTATION_FIELD.format(index=index) for index in range(len(chunk)))
+    variables = {
+        f"pr{index}": {
+            "pullRequestId": pr["node_id"],
+            "expectedHeadOid": pr["head"]["sha"],
+            "mergeMethod": MERGE_METHOD,
+        }
+        for index, pr in enumerate(chunk)
+    }
+    return f"mutation({declarations}) {{{fields}\n}}", variables
+
+
+def enable_auto_merge(
+    prs: List[Dict], token: str, states: Optional[Set[str]] = None
+) -> AutoMergeResult:
+    """Enable auto-merge on every eligible PR in as few requests as possible.
+
+    With ``states``, only PRs whose ``mergeable_state`` is one of them are
+    offered.
+    """
+    result = AutoMergeResult()
+    candidates = []
+    for pr in prs:
+        if pr.get("auto_merge"):
+            if pr.get("mergeable_state") not in STALE_STATES:
+                result.already_enabled.append(pr["number"])
+        elif is_eligible(pr) and (
+            states is None or pr.get("mergeable_state") in states
+        ):
+            candidates.append(pr)
+
+    client = get_client(token)
+    for start in range(0, len(candidates), CHUNK_SIZE):
+        chunk = candidates[start : start + CHUNK_SIZE]
+        query, variables = build_mutation(chunk)
+        try:
+            body = client.graphql(query, variables)
+        except requests.exceptions.RequestException as exc:
+            body = {"errors": [{"message": str(exc)}]}
+
+        data = body.get("data") or {}
+        errors: Dict[str, str] = {}
+        for error in body.get("errors") or []:
+            path = error.get("path") or []
+            errors[path[0] if path else ""] = error.get("message", "unknown error")
+        for index, pr in enumerate(chunk):
+            alias = f"pr{index}"
+            if data.get(alias):
+                result.enabled.append(pr["number"])
+            else:
+                # An error without a path (HTTP failure, bad document)
+                # applies to the whole chunk.
+                result.refused[pr["number"]] = errors.get(alias) or errors.get(
+                    "", "no result"
+                )
+    return result
+
+
+def print_result(result: AutoMergeResult) -> None:
+    if result.already_enabled:
+        print(f"Auto-merge already enabled on {len(result.already_enabled)} PR(s)")
+    if result.enabled:
+        numbers = ", ".join(f"#{number}" for number in result.enabled)
+        print(f"Enabled auto-merge on {len(result.enabled)} PR(s): {numbers}")
+    reasons: Dict[str, List[int]] = {}
+    for number, reason in result.refused.items():
+        reasons.setdefault(reason, []).append(number)
+    for reason, numbers in reasons.items():
+        listed = ", ".join(f"#{number}" for number in numbers)
+        print(f"Auto-merge not enabled ({reason}): {listed}")
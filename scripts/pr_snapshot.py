@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+One-query snapshot of every open pull request.
+
+The report, conflict and review scripts used to list PRs and then fetch
+details and files once per PR. A paginated GraphQL query returns the same
+fields for 100 PRs per request, so 300 open PRs cost three requests
+instead of several hundred.
+
+Snapshot entries use the REST field names the scripts already read
+(``number``, ``node_id``, ``title``, ``created_at``, ``draft``,
+``mergeable``, ``mergeable_state``, ``head.ref``, ``head.sha``,
+``user.login``, ``auto_merge``) plus ``files`` (changed paths) and
+``changed_files``.
+"""
+
+from typing import Dict, List, Optional
+
+import requests
+
+from github_client import get_client
+
+OPEN_PRS_QUERY = """
+query($owner: String!, $repo: String!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(
+      states: OPEN
+      first: 100
+      after: $cursor
+      orderBy: {field: CREATED_AT, direction: ASC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        number
+        title
+        createdAt
+        isDraft
+        mergeable
+        mergeStateStatus
+        headRefName
+        headRefOid
+        url
+        author { login }
+        autoMergeRequest { mergeMethod }
+        files(first: 100) { totalCount nodes { path } }
+      }
+    }
+  }
+}
+"""
+
+MERGEABLE_VALUES = {"MERGEABLE": True, "CONFLICTING": False}
+
+
+def normalize_pr(node: Dict) -> Dict:
+    """Convert a GraphQL pull request node to the REST-style dict."""
+    files = node.get("files") or {}
+    author = node.get("author") or {}
+    auto_merge = node.get("autoMergeRequest")
+    return {
+        "number": node.get("number"),
+        "node_id": node.get("id"),
+        "title": node.get("title", ""),
+        "created_at": node.get("createdAt", ""),
+        "draft": node.get("isDraft", False),
+        "mergeable": MERGEABLE_VALUES.get(node.get("mergeable")),
+        "mergeable_state": (node.get("mergeStateStatus") or "unknown").lower(),
+        "head": {"ref": node.get("headRefName"), "sha": node.get("headRefOid")},
+        "html_url": node.get("url"),
+        "user": {"login": author.get("login", "ghost")},
+        "auto_merge": (
+            {"merge_method": (auto_merge.get("mergeMethod") or "").lower()}
+            if auto_merge
+            else None
+        ),
+        "files": [item["path"] for item in files.get("nodes") or []],
+        "changed_files": files.get("totalCount", 0),
+    }
+
+
+def fetch_open_pr_snapshot(owner: str, repo: str, token: str) -> Optional[List[Dict]]:
+    """Return every open PR with mergeability and files, oldest first.
+
+    Returns None if the query fails so callers can fall back to REST.
+    """
+    client = get_client(token)
+    snapshot: List[Dict] = []
+    cursor = None
+
+    while True:
+        try:
+            body = client.graphql(
+                OPEN_PRS_QUERY, {"owner": owner, "repo": repo, "cursor": cursor}
+            )
+        except requests.exceptions.RequestException as exc:
+            print(f"GraphQL snapshot failed: {exc}")
+            return None
+
+        if body.get("errors"):
+            print(f"GraphQL snapshot failed: {body['errors'][0].get('message')}")
+            return None
+
+        repository = (body.get("data") or {}).get("repository")
+        if repository is None:
+            print("GraphQL snapshot failed: repository not found")
+            return None
+
+        connection = repository["pullRequests"]
+        snapshot.extend(normalize_pr(node) for node in connection["nodes"])
+
+        page_info = connection["pageInfo"]
+        if not page_info["hasNextPage"]:
+            return snapshot
+        cursor = page_info["endCursor"]
@@ -6,48 +6,44 @@ Shows current health and status of the auto-merge system.
 Helps identify issues and provides actionable recommendations.
 
 Usage:
-    python scripts/pr_status_report.py
+    python scripts/pr_status_report.py [--format text|json]
+        [--snapshot FILE [--refresh]] [--window-hours 24]
+
+The report is rendered from a snapshot: repository info, every open daily
+PR with its mergeable state, and how many PRs merged in the last
+--window-hours hours with their median time to merge.
+With --snapshot FILE an existing file is rendered without any API call,
+and a missing one (or any file, with --refresh) is collected and written
+there, so a dashboard or another job can read the same data. --format
+json prints the snapshot's PRs with the computed health instead of the
+text report; progress messages then go to stderr.
 """
 
+import argparse
+import contextlib
+import json
 import os
+import statistics
 import sys
 import requests
-from typing import Dict, List
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 
+from github_client import get_client, get_github_token, map_concurrent
+from pr_snapshot import fetch_open_pr_snapshot
+from pr_store import get_store, load_open_prs
 
-def get_github_token() -> str:
-    """Get GitHub token from environment variables."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if not token:
-        print("❌ Error: No GitHub token found.")
-        print("Please set GH_TOKEN3, GITHUB_TOKEN, or GH_TOKEN environment variable.")
-        sys.exit(1)
-    return token
-
-
-def get_headers(token: str) -> Dict[str, str]:
-    """Get headers for GitHub API requests."""
-    return {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+SNAPSHOT_FORMAT_VERSION = 2
+DEFAULT_WINDOW_HOURS = 24
 
 
 def get_open_prs(owner: str, repo: str, token: str) -> List[Dict]:
     """Fetch all open pull requests."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = get_headers(token)
-    params = {"state": "open", "per_page": 100}
+    url = f"/repos/{owner}/{repo}/pulls"
+    params = {"state": "open"}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return response.json()
+        return list(get_client(token).paginate(url, params=params))
     except requests.exceptions.RequestException:
         pass
 
@@ -56,11 +52,10 @@ def get_open_prs(owner: str, repo: str, token: str) -> List[Dict]:
 
 def get_repo_info(owner: str, repo: str, token: str) -> Dict:
     """Get repository information."""
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    headers = get_headers(token)
+    url = f"/repos/{owner}/{repo}"
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_client(token).get(url)
         if response.status_code == 200:
             data = response.json()
             return {
@@ -76,71 +71,126 @@ def get_repo_info(owner: str, repo: str, token: str) -> Dict:
     return {}
 
 
-def get_closed_prs_last_day(owner: str, repo: str, token: str) -> int:
-    """Get count of PRs closed in last 24 hours."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = get_headers(token)
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 
-    since = (datetime.utcnow() - timedelta(days=1)).isoformat() + "Z"
-    params = {"state": "closed", "per_page": 100, "since": since}
+def get_merge_stats(
+    owner: str,
+    repo: str,
+    token: str,
+    hours: float = DEFAULT_WINDOW_HOURS,
+    now: Optional[datetime] = None,
+) -> Dict:
+    """Count PRs merged in the last ``hours`` and their median time to merge.
 
+    Closed PRs are listed most recently updated first. A PR merged inside
+    the window was updated no earlier than it merged, so listing stops at
+    the first PR last updated before the window starts.
+    """
+    start = (now or datetime.now(timezone.utc)) - timedelta(hours=hours)
+    params = {"state": "closed", "sort": "updated", "direction": "desc"}
+    durations: List[float] = []
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return len(response.json())
+        for pr in get_client(token).paginate(
+            f"/repos/{owner}/{repo}/pulls", params=params
+        ):
+            if not pr.get("updated_at") or parse_time(pr["updated_at"]) < start:
+                break
+            if not pr.get("merged_at"):
+                continue
+            merged_at = parse_time(pr["merged_at"])
+            if merged_at >= start:
+                created_at = parse_time(pr.get("created_at") or pr["merged_at"])
+                durations.append((merged_at - created_at).total_seconds() / 3600)
     except requests.exceptions.RequestException:
         pass
 
-    return 0
+    return {
+        "window_hours": hours,
+        "merged": len(durations),
+        "median_hours_to_merge": (
+            round(statistics.median(durations), 2) if durations else None
+        ),
+    }
+
+
+def summarize_pr(data: Dict) -> Dict:
+    """Build the report fields for one PR from REST or snapshot data."""
+    created = datetime.fromisoformat(data.get("created_at", "").replace("Z", "+00:00"))
+    age_days = (datetime.now(created.tzinfo) - created).days
+
+    return {
+        "number": data.get("number"),
+        "title": data.get("title"),
+        "created_at": data.get("created_at"),
+        "age_days": age_days,
+        "mergeable": data.get("mergeable"),
+        "mergeable_state": data.get("mergeable_state"),
+        "draft": data.get("draft"),
+        "url": data.get("html_url"),
+    }
 
 
 def get_pr_details(owner: str, repo: str, pr_number: int, token: str) -> Dict:
     """Get detailed PR information."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    headers = get_headers(token)
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}"
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_client(token).get(url)
         if response.status_code == 200:
-            data = response.json()
-            created = datetime.fromisoformat(
-                data.get("created_at", "").replace("Z", "+00:00")
-            )
-            age_days = (datetime.now(created.tzinfo) - created).days
-
-            return {
-                "number": data.get("number"),
-                "title": data.get("title"),
-                "created_at": data.get("created_at"),
-                "age_days": age_days,
-                "mergeable": data.get("mergeable"),
-                "mergeable_state": data.get("mergeable_state"),
-                "draft": data.get("draft"),
-                "url": data.get("html_url"),
-            }
+            return summarize_pr(response.json())
     except requests.exceptions.RequestException:
         pass
 
     return {}
 
 
-def analyze_system_health(owner: str, repo: str, token: str) -> Dict:
-    """Analyze overall health of the merge system."""
-    prs = get_open_prs(owner, repo, token)
+def is_daily_pr(pr: Dict) -> bool:
+    """Return whether a PR was opened by the daily contribution workflow."""
+    title = pr.get("title") or ""
+    return "Daily Update" in title or "daily-contribution" in title
 
-    daily_prs = [
-        pr
-        for pr in prs
-        if "Daily Update" in pr["title"] or "daily-contribution" in pr["title"]
-    ]
 
-    if not daily_prs:
-        return {
-            "status": "OK",
-            "message": "No daily contribution PRs found",
-            "details": {},
-        }
+def get_daily_pr_details(owner: str, repo: str, token: str) -> List[Dict]:
+    """Return report details for every open daily PR.
 
+    Reads the PR state store first and only fetches details for PRs with
+    no cached verdict for their head and the current ``main``. Without the
+    store, uses one paginated GraphQL snapshot and falls back to one REST
+    call per PR, run in parallel, if the snapshot is unavailable.
+    """
+    stored = load_open_prs(owner, repo, token)
+    if stored is not None:
+        daily = [pr for pr in stored if is_daily_pr(pr)]
+        unknown = [pr for pr in daily if pr.get("mergeable") is None]
+        fetched = map_concurrent(
+            lambda pr: get_pr_details(owner, repo, pr["number"], token), unknown
+        )
+        store = get_store(owner, repo)
+        for pr, details in zip(unknown, fetched):
+            if details:
+                store.record_mergeability(
+                    pr["head"]["sha"],
+                    details.get("mergeable"),
+                    details.get("mergeable_state"),
+                )
+        by_number = {pr["number"]: details for pr, details in zip(unknown, fetched)}
+        return [by_number.get(pr["number"]) or summarize_pr(pr) for pr in daily]
+
+    snapshot = fetch_open_pr_snapshot(owner, repo, token)
+    if snapshot is not None:
+        return [summarize_pr(pr) for pr in snapshot if is_daily_pr(pr)]
+
+    prs = get_open_prs(owner, repo, token)
+    return map_concurrent(
+        lambda pr: get_pr_details(owner, repo, pr["number"], token),
+        [pr for pr in prs if is_daily_pr(pr)],
+    )
+
+
+def assess_health(daily_prs: List[Dict]) -> Dict:
+    """Compute the health summary from report details of the daily PRs."""
     # Analyze states
     clean = 0
     dirty = 0
@@ -150,9 +200,7 @@ def analyze_system_health(owner: str, repo: str, token: str) -> Dict:
     oldest_dirty = None
     dirty_count_24h = 0
 
-    for pr in daily_prs:
-        details = get_pr_details(owner, repo, pr["number"], token)
-
+    for details in daily_prs:
         if details.get("draft"):
             draft += 1
             continue
@@ -178,7 +226,10 @@ def analyze_system_health(owner: str, repo: str, token: str) -> Dict:
             unknown += 1
 
     # Determine health
-    if dirty == 0:
+    if not daily_prs:
+        status = "OK"
+        message = "No daily contribution PRs found"
+    elif dirty == 0:
         status = "EXCELLENT"
         message = "All PRs are clean and ready to merge!"
     elif dirty <= len(daily_prs) * 0.2:  # <= 20% dirty
@@ -201,7 +252,62 @@ def analyze_system_health(owner: str, repo: str, token: str) -> Dict:
         "draft": draft,
         "dirty_24h": dirty_count_24h,
         "oldest_dirty": oldest_dirty,
-        "closed_last_24h": get_closed_prs_last_day(owner, repo, token),
+    }
+
+
+def analyze_system_health(owner: str, repo: str, token: str) -> Dict:
+    """Analyze overall health of the merge system."""
+    return assess_health(get_daily_pr_details(owner, repo, token))
+
+
+def collect_snapshot(
+    owner: str, repo: str, token: str, hours: float = DEFAULT_WINDOW_HOURS
+) -> Dict:
+    """Fetch everything the report shows."""
+    return {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "repository": f"{owner}/{repo}",
+        "repo_info": get_repo_info(owner, repo, token),
+        "prs": get_daily_pr_details(owner, repo, token),
+        "merges": get_merge_stats(owner, repo, token, hours),
+    }
+
+
+def load_snapshot(path: str, repository: str) -> Optional[Dict]:
+    """Return the snapshot saved at ``path``, or None if it is not usable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        snapshot.get("version") != SNAPSHOT_FORMAT_VERSION
+        or snapshot.get("repository") != repository
+    ):
+        return None
+    return snapshot
+
+
+def save_snapshot(path: str, snapshot: Dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def build_json_report(snapshot: Dict) -> Dict:
+    """Return the machine-readable report for ``snapshot``."""
+    return {
+        "generated_at": snapshot["generated_at"],
+        "repository": snapshot["repository"],
+        "repo_info": snapshot["repo_info"],
+        "health": assess_health(snapshot["prs"]),
+        "merges": snapshot["merges"],
+        "prs": snapshot["prs"],
     }
 
 
@@ -218,24 +324,22 @@ def print_section(title: str):
     print("-" * 80)
 
 
-def main():
-    """Main function."""
-    owner = os.environ.get("GITHUB_REPOSITORY_OWNER", "ramincsy")
-    repo = os.environ.get("GITHUB_REPOSITORY_NAME", "Auto")
-
-    token = get_github_token()
+def print_report(snapshot: Dict) -> None:
+    """Print the human-readable report for ``snapshot``."""
+    owner, repo = snapshot["repository"].split("/", 1)
+    repo_info = snapshot["repo_info"]
 
     print_header("🔍 PR AUTO-MERGE SYSTEM STATUS REPORT")
 
     # Repository info
-    repo_info = get_repo_info(owner, repo, token)
     print(f"Repository: {owner}/{repo}")
     print(f"URL: {repo_info.get('url', 'N/A')}")
     print(f"Default Branch: {repo_info.get('default_branch', 'main')}")
     print(f"Stars: {repo_info.get('stars', 0)}")
 
     # System health
-    health = analyze_system_health(owner, repo, token)
+    health = assess_health(snapshot["prs"])
+    merges = snapshot["merges"]
 
     print_section("📊 SYSTEM HEALTH")
     print(f"Status: {health['status']}")
@@ -247,7 +351,9 @@ def main():
     print(f"  ⚠️  Dirty (conflicts): {health['dirty']}")
     print(f"  🔄 Unknown (checking): {health['unknown']}")
     print(f"  📋 Draft: {health['draft']}")
-    print(f"  ✨ Merged (last 24h): {health['closed_last_24h']}")
+    print(f"  ✨ Merged (last {merges['window_hours']:g}h): {merges['merged']}")
+    if merges["median_hours_to_merge"] is not None:
+        print(f"  ⏱️  Median time to merge: {merges['median_hours_to_merge']:g}h")
 
     # Oldest dirty PR
     if health["oldest_dirty"]:
@@ -260,7 +366,11 @@ def main():
     # Recommendations
     print_section("💡 RECOMMENDATIONS")
 
-    if health["status"] == "EXCELLENT":
+    if health["status"] == "OK":
+        print("✅ Nothing to merge")
+        print("   - No open daily PRs")
+
+    elif health["status"] == "EXCELLENT":
         print("✅ System is working perfectly!")
         print("   - All daily PRs are clean")
         print("   - Auto-merge should complete successfully")
@@ -268,8 +378,7 @@ def main():
     elif health["status"] == "GOOD":
         print("✅ System is mostly healthy")
         print(f"   - {health['dirty']} PR(s) have conflicts")
-        print("   - Run: python scripts/resolve_conflicts.py --auto-resolve")
-        print("   - Then: python scripts/auto_merge_prs.py")
+        print("   - Run: python scripts/auto_merge_prs.py --local-resolve")
 
     elif health["status"] == "WARNING":
         print("⚠️  System needs attention")
@@ -296,9 +405,7 @@ def main():
     print("Auto-resolve:          python scripts/resolve_conflicts.py --auto-resolve")
     print("Force merge:           python scripts/resolve_conflicts.py --force-merge")
     print("Auto-merge clean:      python scripts/auto_merge_prs.py")
-    print(
-        "Full pipeline:         python scripts/resolve_conflicts.py --auto-resolve && python scripts/auto_merge_prs.py"
-    )
+    print("Full pipeline:         python scripts/auto_merge_prs.py --local-resolve")
 
     # Schedule info
     print_section("⏰ AUTOMATED SCHEDULE")
@@ -317,9 +424,56 @@ def main():
 
     # Footer
     print("\n" + "=" * 80)
+    print(f"  Data Collected: {snapshot['generated_at']}")
     print(f"  Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80 + "\n")
 
 
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="PR merge system status report")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument(
+        "--snapshot",
+        metavar="FILE",
+        help="render this snapshot if it exists, otherwise collect and write it",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="collect a new snapshot even if FILE exists",
+    )
+    parser.add_argument(
+        "--window-hours",
+        type=float,
+        default=DEFAULT_WINDOW_HOURS,
+        help="count merges in this many past hours (default: 24)",
+    )
+    args = parser.parse_args()
+
+    owner = os.environ.get("GITHUB_REPOSITORY_OWNER", "ramincsy")
+    repo = os.environ.get("GITHUB_REPOSITORY_NAME", "Auto")
+
+    snapshot = None
+    if args.snapshot and not args.refresh:
+        snapshot = load_snapshot(args.snapshot, f"{owner}/{repo}")
+        if snapshot and snapshot["merges"]["window_hours"] != args.window_hours:
+            snapshot = None
+    if snapshot is None:
+        # Keep stdout for the JSON document.
+        progress = sys.stderr if args.format == "json" else sys.stdout
+        with contextlib.redirect_stdout(progress):
+            snapshot = collect_snapshot(
+                owner, repo, get_github_token(), args.window_hours
+            )
+        if args.snapshot:
+            save_snapshot(args.snapshot, snapshot)
+
+    if args.format == "json":
+        print(json.dumps(build_json_report(snapshot), indent=2))
+    else:
+        print_report(snapshot)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Persistent PR state so each run only looks at PRs that changed.
+
+Every scheduled run used to list and inspect every open PR from scratch.
+The store keeps one row per PR in SQLite: head and base SHA, files, how
+many runs failed to merge it and why. A sync lists PRs with
+``sort=updated&direction=desc`` and stops at the first PR not updated since
+the previous sync, so an idle repository costs two requests (the listing
+and the ``main`` tip). A PR whose head moved loses its stored files;
+everything else is read back for free.
+
+Mergeability verdicts are cached separately, keyed by the ``main`` SHA and
+the head SHA they were computed for, with the time they were computed.
+While neither SHA moves GitHub's answer cannot change, so the details call
+is skipped. Each sync reads the ``main`` tip and drops verdicts computed
+against an older one. Only states decided by the two commits are cached:
+``clean``, ``dirty`` and ``behind``; ``blocked`` and ``unstable`` also
+depend on reviews and checks.
+
+The database lives under ``.cache`` so the Actions cache restores it
+between runs. A missing or unreadable file just means a full sync.
+
+Environment Variables:
+    GITHUB_PR_STORE: database path, or "off" to disable
+        (defaults to .cache/pr-state.sqlite)
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import requests
+
+from github_client import get_client
+
+DEFAULT_STORE_PATH = os.path.join(".cache", "pr-state.sqlite")
+SCHEMA_VERSION = 3
+BASE_BRANCH = "main"
+CACHEABLE_STATES = {"clean", "dirty", "behind"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prs (
+    number INTEGER PRIMARY KEY,
+    node_id TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'open',
+    draft INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT,
+    html_url TEXT,
+    user_login TEXT,
+    head_ref TEXT,
+    head_sha TEXT,
+    base_sha TEXT,
+    auto_merge_method TEXT,
+    files TEXT,
+    changed_files INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS mergeability (
+    base_sha TEXT NOT NULL,
+    head_sha TEXT NOT NULL,
+    mergeable INTEGER NOT NULL,
+    mergeable_state TEXT NOT NULL,
+    computed_at TEXT NOT NULL,
+    PRIMARY KEY (base_sha, head_sha)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+TABLES = ("prs", "mergeability", "meta")
+
+_stores: Dict[str, "PRStore"] = {}
+
+
+def get_store_path() -> Optional[str]:
+    """Return the configured database path, or None when the store is off."""
+    path = os.environ.get("GITHUB_PR_STORE", DEFAULT_STORE_PATH).strip()
+    if path.lower() in {"", "0", "off", "false", "no"}:
+        return None
+    return path
+
+
+class PRStore:
+    """SQLite-backed PR state for one repository."""
+
+    def __init__(self, path: str, repository: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.base_sha: Optional[str] = None
+        try:
+            self.db = self._open(path)
+        except sqlite3.DatabaseError:
+            # A corrupt file from the cache is worth no more than a full sync.
+            os.remove(path)
+            self.db = self._open(path)
+        if self.get_meta("repository") != repository:
+            for table in TABLES:
+                self.db.execute(f"DELETE FROM {table}")
+            self.set_meta("repository", repository)
+            self.db.commit()
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path)
+        db.row_factory = sqlite3.Row
+        if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            db.executescript("".join(f"DROP TABLE IF EXISTS {t};" for t in TABLES))
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.executescript(SCHEMA)
+        return db
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def sync(self, owner: str, repo: str, token: str) -> int:
+        """Pull PRs updated since the last sync; return how many changed.
+
+        The first sync lists open PRs only; later syncs list every state so
+        PRs closed or merged elsewhere drop out of ``open_prs``.
+        """
+        self.refresh_base(owner, repo, token)
+        watermark = self.get_meta("updated_at")
+        params = {
+            "state": "all" if watermark else "open",
+            "sort": "updated",
+            "direction": "desc",
+        }
+        newest = watermark or ""
+        changed = 0
+        for pr in get_client(token).paginate(
+            f"/repos/{owner}/{repo}/pulls", params=params
+        ):
+            updated_at = pr.get("updated_at") or ""
+            # ISO 8601 timestamps in UTC compare correctly as strings.
+            if watermark and updated_at < watermark:
+                break
+            changed += self.upsert(pr)
+            newest = max(newest, updated_at)
+        if newest:
+            self.set_meta("updated_at", newest)
+        self.db.commit()
+        return changed
+
+    def refresh_base(self, owner: str, repo: str, token: str) -> Optional[str]:
+        """Read the ``main`` tip and drop verdicts computed against another.
+
+        Without a known tip no verdict is served or recorded.
+        """
+        response = get_client(token).get(
+            f"/repos/{owner}/{repo}/branches/{BASE_BRANCH}"
+        )
+        self.base_sha = None
+        if response.status_code == 200:
+            self.base_sha = response.json().get("commit", {}).get("sha")
+        if self.base_sha:
+            self.db.execute(
+                "DELETE FROM mergeability WHERE base_sha != ?", (self.base_sha,)
+            )
+            self.db.commit()
+        return self.base_sha
+
+    def upsert(self, pr: Dict) -> bool:
+        """Store a PR from a REST listing; return True if it is new or moved."""
+        head = pr.get("head") or {}
+        base_sha = (pr.get("base") or {}).get("sha")
+        row = self.db.execute(
+            "SELECT head_sha, base_sha, updated_at FROM prs WHERE number = ?",
+            (pr["number"],),
+        ).fetchone()
+        values = {
+            "number": pr["number"],
+            "node_id": pr.get("node_id"),
+            "title": pr.get("title") or "",
+            "state": pr.get("state") or "open",
+            "draft": int(bool(pr.get("draft"))),
+            "created_at": pr.get("created_at"),
+            "updated_at": pr.get("updated_at"),
+            "html_url": pr.get("html_url"),
+            "user_login": (pr.get("user") or {}).get("login"),
+            "head_ref": head.get("ref"),
+            "head_sha": head.get("sha"),
+            "base_sha": base_sha,
+            "auto_merge_method": (pr.get("auto_merge") or {}).get("merge_method"),
+        }
+        if row is None:
+            columns = ", ".join(values)
+            placeholders = ", ".join(f":{name}" for name in values)
+            self.db.execute(
+                f"INSERT INTO prs ({columns}) VALUES ({placeholders})", values
+            )
+            return True
+
+        assignments = [f"{name} = :{name}" for name in values if name != "number"]
+        if row["head_sha"] != values["head_sha"]:
+            assignments += ["files = NULL", "changed_files = NULL"]
+        moved = (row["head_sha"], row["base_sha"]) != (head.get("sha"), base_sha)
+        self.db.execute(
+            f"UPDATE prs SET {', '.join(assignments)} WHERE number = :number", values
+        )
+        return moved or row["updated_at"] != values["updated_at"]
+
+    def open_prs(self) -> List[Dict]:
+        """Return open PRs as REST-style dicts, oldest first.
+
+        ``files`` is only present when the file list for the current head is
+        known, and ``mergeable``, ``mergeable_state`` and
+        ``mergeability_computed_at`` only when a verdict for the current head
+        and ``main`` is cached.
+        """
+        rows = self.db.execute(
+            "SELECT prs.*, m.mergeable, m.mergeable_state, m.computed_at "
+            "FROM prs LEFT JOIN mergeability AS m "
+            "ON m.head_sha = prs.head_sha AND m.base_sha = ? "
+            "WHERE state = 'open' ORDER BY created_at, number",
+            (self.base_sha,),
+        ).fetchall()
+        prs = []
+        for row in rows:
+            pr = {
+                "number": row["number"],
+                "node_id": row["node_id"],
+                "title": row["title"],
+                "state": row["state"],
+                "draft": bool(row["draft"]),
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "html_url": row["html_url"],
+                "user": {"login": row["user_login"]},
+                "head": {"ref": row["head_ref"], "sha": row["head_sha"]},
+                "base": {"sha": row["base_sha"]},
+                "auto_merge": (
+                    {"merge_method": row["auto_merge_method"]}
+                    if row["auto_merge_method"]
+                    else None
+                ),
+                "attempts": row["attempts"],
+                "last_error": row["last_error"],
+            }
+            if row["files"] is not None:
+                pr["files"] = json.loads(row["files"])
+                pr["changed_files"] = row["changed_files"]
+            if row["computed_at"] is not None:
+                pr["mergeable"] = bool(row["mergeable"])
+                pr["mergeable_state"] = row["mergeable_state"]
+                pr["mergeability_computed_at"] = row["computed_at"]
+            prs.append(pr)
+        return prs
+
+    def record_files(self, number: int, files: List[str]) -> None:
+        self.db.execute(
+            "UPDATE prs SET files = ?, changed_files = ? WHERE number = ?",
+            (json.dumps(files), len(files), number),
+        )
+        self.db.commit()
+
+    def record_mergeability(
+        self,
+        head_sha: Optional[str],
+        mergeable: Optional[bool],
+        mergeable_state: Optional[str],
+    ) -> None:
+        """Cache GitHub's verdict for ``head_sha`` against the current ``main``.
+
+        Call this only for verdicts read before the run moved ``main``.
+        """
+        if (
+            not self.base_sha
+            or not head_sha
+            or mergeable is None
+            or mergeable_state not in CACHEABLE_STATES
+        ):
+            return
+        computed_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.db.execute(
+            "INSERT OR REPLACE INTO mergeability "
+            "(base_sha, head_sha, mergeable, mergeable_state, computed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.base_sha, head_sha, int(mergeable), mergeable_state, computed_at),
+        )
+        self.db.commit()
+
+    def record_outcome(self, number: int, outcome: str, error: str = "") -> None:
+        """Record a merge run's outcome: merged, or one more failed attempt."""
+        if outcome == "merged":
+            self.db.execute(
+                "UPDATE prs SET state = 'closed', last_error = NULL WHERE number = ?",
+                (number,),
+            )
+        else:
+            self.db.execute(
+                "UPDATE prs SET attempts = attempts + 1, last_error = ? "
+                "WHERE number = ?",
+                (error or outcome, number),
+            )
+        self.db.commit()
+
+    def record_tracked(self, tracked) -> None:
+        """Save a ``merge_tracker.TrackedPR``'s outcome.
+
+        Its mergeability is not cached: the run may have moved ``main``
+        since the tip was read.
+        """
+        state = tracked.mergeable_state
+        if tracked.outcome in {"merged", "conflict", "failed"}:
+            self.record_outcome(
+                tracked.number, tracked.outcome, f"{tracked.outcome} ({state})"
+            )
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def get_store(owner: str, repo: str) -> Optional[PRStore]:
+    """Return the shared store for ``owner/repo``, or None when it is off."""
+    path = get_store_path()
+    if path is None:
+        return None
+    store = _stores.get(path)
+    if store is None:
+        store = PRStore(path, f"{owner}/{repo}")
+        _stores[path] = store
+        atexit.register(store.close)
+    return store
+
+
+def load_open_prs(owner: str, repo: str, token: str) -> Optional[List[Dict]]:
+    """Sync the store and return its open PRs, or None if it is unavailable."""
+    store = get_store(owner, repo)
+    if store is None:
+        return None
+    try:
+        changed = store.sync(owner, repo, token)
+    except requests.exceptions.RequestException as exc:
+        print(f"PR state sync failed: {exc}")
+        return None
+    prs = store.open_prs()
+    print(f"PR state store: {changed} PR(s) changed since the last run")
+    return prs
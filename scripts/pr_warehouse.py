@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Local history of PRs, reviews and merge attempts, with canned reports.
+
+Questions about the past (merges per day, time to merge, why merges fail)
+used to mean another loop over the API. The warehouse keeps every PR the
+repository ever had in SQLite:
+
+- ``pulls``: one row per PR with its created, closed and merged times,
+- ``reviews``: the reviews on each PR,
+- ``merge_attempts``: every outcome the merge pipeline reached for a PR
+  (merged, conflict, failed) with the mergeable state at the time, which
+  GitHub does not keep.
+
+A sync lists PRs of every state with ``sort=updated&direction=desc`` and
+stops at the first PR not updated since the previous sync, then fetches
+reviews only for the PRs that changed. The first sync reads the whole
+history; later ones cost a listing page and one request per changed PR.
+
+Reports, over the last ``--days`` days:
+
+- ``throughput``: PRs merged per day,
+- ``time-to-merge``: percentiles of hours from creation to merge,
+- ``conflicts``: share of PRs the pipeline tried that hit a conflict,
+- ``failures``: failed merge attempts grouped by reason.
+
+Usage:
+    python scripts/pr_warehouse.py sync
+    python scripts/pr_warehouse.py report throughput [--days 30] [--format json]
+
+Reading a report makes no API call. The database lives under ``.cache``
+next to the PR state store, so the Actions cache keeps it between runs.
+
+Environment Variables:
+    GITHUB_PR_WAREHOUSE: database path, or "off" to disable
+        (defaults to .cache/pr-warehouse.sqlite)
+"""
+
+import argparse
+import atexit
+import json
+import math
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import requests
+
+from github_client import get_client, get_github_token, map_concurrent
+
+DEFAULT_WAREHOUSE_PATH = os.path.join(".cache", "pr-warehouse.sqlite")
+SCHEMA_VERSION = 1
+DEFAULT_DAYS = 30
+PERCENTILES = (50, 90, 95)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pulls (
+    number INTEGER PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'open',
+    draft INTEGER NOT NULL DEFAULT 0,
+    user_login TEXT,
+    head_ref TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    merged_at TEXT
+);
+CREATE INDEX IF NOT EXISTS pulls_merged_at ON pulls (merged_at);
+CREATE TABLE IF NOT EXISTS reviews (
+    number INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    state TEXT,
+    user_login TEXT,
+    submitted_at TEXT,
+    PRIMARY KEY (number, id)
+);
+CREATE TABLE IF NOT EXISTS merge_attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    number INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    reason TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+TABLES = ("pulls", "reviews", "merge_attempts", "meta")
+REPORTS = ("throughput", "time-to-merge", "conflicts", "failures")
+
+_warehouses: Dict[str, "PRWarehouse"] = {}
+
+
+def get_warehouse_path() -> Optional[str]:
+    """Return the configured database path, or None when it is off."""
+    path = os.environ.get("GITHUB_PR_WAREHOUSE", DEFAULT_WAREHOUSE_PATH).strip()
+    if path.lower() in {"", "0", "off", "false", "no"}:
+        return None
+    return path
+
+
+def iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Return the nearest-rank ``p``th percentile of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class PRWarehouse:
+    """SQLite-backed PR history for one repository."""
+
+    def __init__(self, path: str, repository: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        try:
+            self.db = self._open(path)
+        except sqlite3.DatabaseError:
+            os.remove(path)
+            self.db = self._open(path)
+        if self.get_meta("repository") != repository:
+            for table in TABLES:
+                self.db.execute(f"DELETE FROM {table}")
+            self.set_meta("repository", repository)
+            self.db.commit()
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path)
+        db.row_factory = sqlite3.Row
+        if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            db.executescript("".join(f"DROP TABLE IF EXISTS {t};" for t in TABLES))
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.executescript(SCHEMA)
+        return db
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    # -- sync --------------------------------------------------------------
+
+    def sync(self, owner: str, repo: str, token: str) -> int:
+        """Pull PRs and reviews updated since the last sync; return the count."""
+        client = get_client(token)
+        watermark = self.get_meta("updated_at")
+        params = {"state": "all", "sort": "updated", "direction": "desc"}
+        newest = watermark or ""
+        changed: List[Dict] = []
+        for pr in client.paginate(f"/repos/{owner}/{repo}/pulls", params=params):
+            updated_at = pr.get("updated_at") or ""
+            # ISO 8601 timestamps in UTC compare correctly as strings.
+            if watermark and updated_at < watermark:
+                break
+            changed.append(pr)
+            newest = max(newest, updated_at)
+
+        all_reviews = map_concurrent(
+            lambda pr: list(
+                client.paginate(f"/repos/{owner}/{repo}/pulls/{pr['number']}/reviews")
+            ),
+            changed,
+        )
+        for pr, reviews in zip(changed, all_reviews):
+            self.upsert(pr, reviews)
+        if newest:
+            self.set_meta("updated_at", newest)
+        self.db.commit()
+        return len(changed)
+
+    def upsert(self, pr: Dict, reviews: List[Dict]) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO pulls (number, title, state, draft, user_login, "
+            "head_ref, created_at, updated_at, closed_at, merged_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                pr["number"],
+                pr.get("title") or "",
+                pr.get("state") or "open",
+                int(bool(pr.get("draft"))),
+                (pr.get("user") or {}).get("login"),
+                (pr.get("head") or {}).get("ref"),
+                pr.get("created_at"),
+                pr.get("updated_at"),
+                pr.get("closed_at"),
+                pr.get("merged_at"),
+            ),
+        )
+        self.db.execute("DELETE FROM reviews WHERE number = ?", (pr["number"],))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO reviews "
+            "(number, id, state, user_login, submitted_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    pr["number"],
+                    review.get("id"),
+                    review.get("state"),
+                    (review.get("user") or {}).get("login"),
+                    review.get("submitted_at"),
+                )
+                for review in reviews
+            ],
+        )
+
+    def record_outcome(self, number: int, outcome: str, reason: str = "") -> None:
+        """Record one merge pipeline outcome for PR ``number``."""
+        self.db.execute(
+            "INSERT INTO merge_attempts (number, outcome, reason, recorded_at) "
+            "VALUES (?, ?, ?, ?)",
+            (number, outcome, reason or None, iso(datetime.now(timezone.utc))),
+        )
+        self.db.commit()
+
+    # -- reports -----------------------------------------------------------
+
+    def merge_times(self, since: str) -> List[float]:
+        """Hours from creation to merge for PRs merged since ``since``."""
+        rows = self.db.execute(
+            "SELECT created_at, merged_at FROM pulls "
+            "WHERE merged_at >= ? AND created_at IS NOT NULL",
+            (since,),
+        ).fetchall()
+        return [
+            (
+                parse_time(row["merged_at"]) - parse_time(row["created_at"])
+            ).total_seconds()
+            / 3600
+            for row in rows
+        ]
+
+    def throughput(self, since: str) -> Dict:
+        rows = self.db.execute(
+            "SELECT substr(merged_at, 1, 10) AS day, COUNT(*) AS merged FROM pulls "
+            "WHERE merged_at >= ? GROUP BY day ORDER BY day",
+            (since,),
+        ).fetchall()
+        days = {row["day"]: row["merged"] for row in rows}
+        return {"merged": sum(days.values()), "per_day": days}
+
+    def time_to_merge(self, since: str) -> Dict:
+        hours = self.merge_times(since)
+        report = {"merged": len(hours)}
+        for p in PERCENTILES:
+            value = percentile(hours, p)
+            report[f"p{p}_hours"] = round(value, 2) if value is not None else None
+        report["max_hours"] = round(max(hours), 2) if hours else None
+        return report
+
+    def conflicts(self, since: str) -> Dict:
+        row = self.db.execute(
+            "SELECT COUNT(DISTINCT number) AS attempted, "
+            "COUNT(DISTINCT CASE WHEN outcome = 'conflict' THEN number END) "
+            "AS conflicted FROM merge_attempts WHERE recorded_at >= ?",
+            (since,),
+        ).fetchone()
+        attempted, conflicted = row["attempted"], row["conflicted"]
+        return {
+            "attempted": attempted,
+            "conflicted": conflicted,
+            "conflict_rate": round(conflicted / attempted, 3) if attempted else None,
+        }
+
+    def failures(self, since: str) -> Dict:
+        rows = self.db.execute(
+            "SELECT outcome, COALESCE(reason, 'unknown') AS reason, COUNT(*) AS count "
+            "FROM merge_attempts WHERE outcome != 'merged' AND recorded_at >= ? "
+            "GROUP BY outcome, reason ORDER BY count DESC, outcome, reason",
+            (since,),
+        ).fetchall()
+        return {
+            "total": sum(row["count"] for row in rows),
+            "reasons": [
+                {
+                    "outcome": row["outcome"],
+                    "reason": row["reason"],
+                    "count": row["count"],
+                }
+                for row in rows
+            ],
+        }
+
+    def report(self, name: str, days: float = DEFAULT_DAYS) -> Dict:
+        """Run the canned report ``name`` over the last ``days`` days."""
+        since = iso(datetime.now(timezone.utc) - timedelta(days=days))
+        method = getattr(self, name.replace("-", "_"))
+        return {"report": name, "days": days, "since": since, **method(since)}
+
+    def achievements(self) -> Dict:
+        """All-time numbers behind the GitHub achievements."""
+        merged = self.db.execute(
+            "SELECT COUNT(*) FROM pulls WHERE merged_at IS NOT NULL"
+        ).fetchone()[0]
+        hours = self.merge_times("")
+        unreviewed = self.db.execute(
+            "SELECT COUNT(*) FROM pulls WHERE merged_at IS NOT NULL AND number NOT IN "
+            "(SELECT number FROM reviews)"
+        ).fetchone()[0]
+        approvals = self.db.execute(
+            "SELECT COUNT(*) FROM reviews WHERE state = 'APPROVED'"
+        ).fetchone()[0]
+        return {
+            "merged": merged,
+            "fastest_merge_minutes": round(min(hours) * 60, 1) if hours else None,
+            "merged_without_review": unreviewed,
+            "approved_reviews": approvals,
+            "synced_until": self.get_meta("updated_at"),
+        }
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def get_warehouse(owner: str, repo: str) -> Optional[PRWarehouse]:
+    """Return the shared warehouse for ``owner/repo``, or None when it is off."""
+    path = get_warehouse_path()
+    if path is None:
+        return None
+    warehouse = _warehouses.get(path)
+    if warehouse is None:
+        warehouse = PRWarehouse(path, f"{owner}/{repo}")
+        _warehouses[path] = warehouse
+        atexit.register(warehouse.close)
+    return warehouse
+
+
+def load_achievements(owner: str, repo: str) -> Optional[Dict]:
+    """Return achievement numbers from a synced warehouse, without API calls."""
+    path = get_warehouse_path()
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        warehouse = get_warehouse(owner, repo)
+        stats = warehouse.achievements()
+    except sqlite3.DatabaseError:
+        return None
+    return stats if stats["synced_until"] else None
+
+
+def print_report(report: Dict) -> None:
+    name = report["report"]
+    print(f"{name} over the last {report['days']:g} day(s) (since {report['since']})")
+    if name == "throughput":
+        for day, merged in report["per_day"].items():
+            print(f"  {day}  {merged:4d}  {'█' * min(merged, 60)}")
+        print(f"  Total merged: {report['merged']}")
+    elif name == "time-to-merge":
+        print(f"  Merged: {report['merged']}")
+        for key in [f"p{p}_hours" for p in PERCENTILES] + ["max_hours"]:
+            value = report[key]
+            print(f"  {key}: {'n/a' if value is None else f'{value:g}h'}")
+    elif name == "conflicts":
+        rate = report["conflict_rate"]
+        print(f"  PRs attempted: {report['attempted']}")
+        print(f"  PRs with conflicts: {report['conflicted']}")
+        print(f"  Conflict rate: {'n/a' if rate is None else f'{rate:.1%}'}")
+    else:
+        for item in report["reasons"]:
+            print(f"  {item['count']:4d}  {item['outcome']} ({item['reason']})")
+        print(f"  Total failed attempts: {report['total']}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Local PR history and reports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("sync", help="pull PRs and reviews changed since last sync")
+    report_parser = commands.add_parser("report", help="print a canned report")
+    report_parser.add_argument("name", choices=REPORTS)
+    report_parser.add_argument("--days", type=float, default=DEFAULT_DAYS)
+    report_parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    owner, repo = os.environ.get("GITHUB_REPOSITORY", "ramincsy/Auto").split("/", 1)
+    warehouse = get_warehouse(owner, repo)
+    if warehouse is None:
+        print("The PR warehouse is disabled (GITHUB_PR_WAREHOUSE=off).")
+        sys.exit(1)
+
+    if args.command == "sync":
+        try:
+            changed = warehouse.sync(owner, repo, get_github_token())
+        except requests.exceptions.RequestException as exc:
+            print(f"PR warehouse sync failed: {exc}")
+            sys.exit(1)
+        print(f"PR warehouse: {changed} PR(s) changed since the last sync")
+        return
+
+    report = warehouse.report(args.name, args.days)
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Rate-limit accounting for the shared GitHub API client.
+
+Every response carries ``X-RateLimit-Resource``, ``-Limit``, ``-Remaining``
+and ``-Reset`` headers. The limiter keeps the latest budget per resource
+(core, search, graphql), slows requests down when a budget runs low so it
+lasts until the reset, and turns primary or secondary rate-limit responses
+into a wait-and-retry instead of a failed PR.
+
+Long loops can ask ``client.rate_limiter.is_low()`` and stop cleanly while
+there is still budget left for the summary and the next run.
+
+Environment Variables:
+    GITHUB_RATE_LIMIT_RESERVE: requests to keep in reserve (default 50)
+    GITHUB_RATE_LIMIT_MAX_WAIT: longest wait in seconds for a reset (default 300)
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+DEFAULT_RESERVE = 50
+DEFAULT_MAX_WAIT = 300
+# Below this share of the limit, requests are spread over the time to reset.
+PACE_FRACTION = 0.1
+MAX_PACE_DELAY = 5.0
+# GitHub asks for at least a minute when a secondary limit has no Retry-After.
+SECONDARY_LIMIT_WAIT = 60
+
+
+def resource_for_url(url: str) -> str:
+    """Return the rate-limit resource a request URL is billed against."""
+    path = url.split("?", 1)[0].rstrip("/")
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class RateBudget:
+    """Latest known budget for one rate-limit resource."""
+
+    def __init__(self, resource: str, limit: int, remaining: int, reset: float):
+        self.resource = resource
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+
+    def as_dict(self) -> Dict:
+        return {
+            "resource": self.resource,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset": self.reset,
+        }
+
+
+class RateLimiter:
+    """Track per-resource budgets and pace requests ahead of exhaustion."""
+
+    def __init__(
+        self,
+        reserve: Optional[int] = None,
+        max_wait: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.reserve = (
+            reserve
+            if reserve is not None
+            else _env_int("GITHUB_RATE_LIMIT_RESERVE", DEFAULT_RESERVE)
+        )
+        self.max_wait = (
+            max_wait
+            if max_wait is not None
+            else _env_int("GITHUB_RATE_LIMIT_MAX_WAIT", DEFAULT_MAX_WAIT)
+        )
+        self.clock = clock
+        self.sleep = sleep
+        self.budgets: Dict[str, RateBudget] = {}
+        self.blocked_until = 0.0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, response: requests.Response, resource: str = "core") -> None:
+        """Record the budget advertised by a response."""
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource", resource)
+        try:
+            budget = RateBudget(
+                resource,
+                int(headers.get("X-RateLimit-Limit", 0)),
+                int(headers["X-RateLimit-Remaining"]),
+                float(headers.get("X-RateLimit-Reset", 0)),
+            )
+        except ValueError:
+            return
+        with self._lock:
+            self.budgets[resource] = budget
+
+    def remaining(self, resource: str = "core") -> Optional[int]:
+        """Return the remaining requests for ``resource``, if known."""
+        budget = self.budgets.get(resource)
+        return budget.remaining if budget else None
+
+    def is_low(self, resource: str = "core", reserve: Optional[int] = None) -> bool:
+        """Return True when callers should checkpoint and stop."""
+        remaining = self.remaining(resource)
+        threshold = self.reserve if reserve is None else reserve
+        return remaining is not None and remaining <= threshold
+
+    def delay_for(self, resource: str = "core") -> float:
+        """Return how long to wait before the next request to ``resource``."""
+        now = self.clock()
+        delay = max(self.blocked_until - now, 0.0)
+        budget = self.budgets.get(resource)
+        if budget is None or budget.limit <= 0:
+            return delay
+
+        window = max(budget.reset - now, 0.0)
+        if budget.remaining <= 0:
+            if window <= self.max_wait:
+                delay = max(delay, window + 1)
+        elif budget.remaining <= budget.limit * PACE_FRACTION:
+            delay = max(delay, min(window / budget.remaining, MAX_PACE_DELAY))
+        return delay
+
+    def wait_for_budget(self, resource: str = "core") -> None:
+        """Sleep as long as :meth:`delay_for` asks before sending a request.
+
+        Safe to call from several threads sharing one client.
+        """
+        with self._lock:
+            delay = self.delay_for(resource)
+            # Reserve one request so parallel callers see the budget shrink
+            # before their responses come back.
+            budget = self.budgets.get(resource)
+            if budget is not None and budget.remaining > 0:
+                budget.remaining -= 1
+            if delay > 0:
+                self.waited += delay
+        if delay > 0:
+            self.sleep(delay)
+
+    def retry_delay(self, response: requests.Response) -> Optional[float]:
+        """Return seconds to wait before retrying a rate-limited response.
+
+        Returns None when the response is not rate limited, or when the
+        reset is further away than ``max_wait``.
+        """
+        if response.status_code not in {403, 429}:
+            return None
+
+        delay: Optional[float] = None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = SECONDARY_LIMIT_WAIT
+        elif response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset = float(response.headers.get("X-RateLimit-Reset", 0))
+            except ValueError:
+                reset = 0.0
+            delay = max(reset - self.clock(), 0.0) + 1
+        elif "secondary rate limit" in response.text.lower():
+            delay = SECONDARY_LIMIT_WAIT
+
+        if delay is None or delay > self.max_wait:
+            return None
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + delay)
+        return delay
+
+    def summary(self) -> Dict[str, Dict]:
+        return {name: budget.as_dict() for name, budget in self.budgets.items()}
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Git merge driver for the daily sections at the end of README.md.
+
+``generate_content.ensure_daily_entry`` appends a ``## YYYY-MM-DD (period)``
+section to the end of README.md, so two daily PRs made from the same main
+always conflict there even though neither changed the other's lines. This
+driver merges the daily sections as an ordered, deduplicated union keyed by
+date header:
+
+- the text before the first daily header must merge trivially (one side
+  changed it, or both made the same change),
+- a section either side added is kept; one both sides added with different
+  bullets keeps our version; one either side removed is dropped,
+- sections are ordered by date, then period.
+
+Anything else falls back to ``git merge-file``, leaving the usual conflict
+markers. ``.gitattributes`` assigns the driver to README.md; the scripts pass
+the driver definition to git with ``-c`` (see ``driver_args``), and it can be
+registered in a local clone with:
+
+    git config merge.daily-readme.driver "python scripts/readme_merge.py %O %A %B"
+
+Usage (as called by git):
+    python scripts/readme_merge.py <base> <ours> <theirs>
+"""
+
+import re
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DRIVER = "daily-readme"
+ATTRIBUTES_FILE = Path(__file__).resolve().parent.parent / ".gitattributes"
+
+HEADER_RE = re.compile(
+    r"^## (?:📅 )?(?P<date>\d{4}-\d{2}-\d{2})(?: \((?P<period>[^)]+)\))?\s*$"
+)
+PERIOD_ORDER = {None: 0, "morning": 1, "afternoon": 2}
+
+SectionKey = Tuple[str, Optional[str]]
+
+
+def driver_args() -> List[str]:
+    """Return ``git -c`` options that enable the driver for README.md."""
+    script = shlex.quote(str(Path(__file__).resolve()))
+    python = shlex.quote(sys.executable or "python3")
+    return [
+        "-c",
+        f"merge.{DRIVER}.name=Union of README daily sections",
+        "-c",
+        f"merge.{DRIVER}.driver={python} {script} %O %A %B",
+        "-c",
+        f"core.attributesFile={ATTRIBUTES_FILE}",
+    ]
+
+
+def split_sections(text: str) -> Tuple[str, Dict[SectionKey, str]]:
+    """Split README text into its preamble and daily sections by key."""
+    lines = text.splitlines(keepends=True)
+    start = next(
+        (i for i, line in enumerate(lines) if HEADER_RE.match(line)), len(lines)
+    )
+    preamble = "".join(lines[:start])
+    sections: Dict[SectionKey, List[str]] = {}
+    key: Optional[SectionKey] = None
+    for line in lines[start:]:
+        match = HEADER_RE.match(line)
+        if match:
+            key = (match["date"], match["period"])
+            # A repeated header keeps the first section; later copies drop.
+            sections.setdefault(key, [])
+            if sections[key]:
+                key = None
+                continue
+        elif line.startswith("## "):
+            raise ValueError(f"non-daily section after the daily log: {line!r}")
+        if key is not None:
+            sections[key].append(line)
+    return preamble, {
+        key: "".join(body).rstrip("\n") + "\n" for key, body in sections.items()
+    }
+
+
+def _pick(base: Optional[str], ours: str, theirs: str) -> Optional[str]:
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    return None
+
+
+def union_merge(base: str, ours: str, theirs: str) -> Optional[str]:
+    """Return the merged README, or None if it needs a human."""
+    try:
+        base_pre, base_sections = split_sections(base)
+        our_pre, our_sections = split_sections(ours)
+        their_pre, their_sections = split_sections(theirs)
+    except ValueError:
+        return None
+
+    preamble = _pick(base_pre, our_pre, their_pre)
+    if preamble is None:
+        return None
+
+    merged: Dict[SectionKey, str] = {}
+    for key in {**our_sections, **their_sections}:
+        mine, other = our_sections.get(key), their_sections.get(key)
+        if key in base_sections and (mine is None or other is None):
+            continue  # one side removed it
+        if mine is None or other is None:
+            merged[key] = mine or other
+        else:
+            merged[key] = _pick(base_sections.get(key), mine, other) or mine
+
+    ordered = sorted(
+        merged, key=lambda key: (key[0], PERIOD_ORDER.get(key[1], len(PERIOD_ORDER)))
+    )
+    if not ordered:
+        return preamble
+    if preamble and not preamble.endswith("\n\n"):
+        preamble = preamble.rstrip("\n") + "\n\n"
+    return preamble + "\n".join(merged[key] for key in ordered)
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3:
+        print(__doc__.strip().splitlines()[-1], file=sys.stderr)
+        return 2
+    base_path, ours_path, theirs_path = argv
+    texts = [Path(path).read_text(encoding="utf-8") for path in argv]
+    merged = union_merge(*texts)
+    if merged is not None:
+        Path(ours_path).write_text(merged, encoding="utf-8")
+        return 0
+    result = subprocess.run(
+        ["git", "merge-file", "-L", "ours", "-L", "base", "-L", "theirs"]
+        + [ours_path, base_path, theirs_path]
+    )
+    return 1 if result.returncode else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Retries and a circuit breaker for transient GitHub failures.
+
+A dropped connection or a 5xx from GitHub usually goes away on its own, so
+the shared client retries it with exponential backoff and full jitter
+instead of failing the PR. Only requests that are safe to repeat are
+retried: reads, and writes the caller marks with ``retry=True`` because they
+carry an expected head SHA (a merge or branch update that already happened
+is rejected instead of applied twice).
+
+During an outage the circuit breaker opens after a run of consecutive
+failures and fails requests immediately with ``CircuitOpenError`` until a
+cooldown passes, so a job stops early instead of spending its remaining time
+on requests that cannot succeed.
+
+Environment Variables:
+    GITHUB_RETRY_ATTEMPTS: retries per request (default 3)
+    GITHUB_RETRY_BASE_DELAY: first backoff ceiling in seconds (default 1)
+    GITHUB_CIRCUIT_THRESHOLD: consecutive failures that open the circuit
+        (default 5)
+    GITHUB_CIRCUIT_COOLDOWN: seconds before a trial request (default 60)
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+MAX_BACKOFF = 30.0
+DEFAULT_THRESHOLD = 5
+DEFAULT_COOLDOWN = 60.0
+
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """The circuit breaker is open; the request was not sent."""
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: float = MAX_BACKOFF,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.attempts = int(
+            attempts
+            if attempts is not None
+            else _env_number("GITHUB_RETRY_ATTEMPTS", DEFAULT_ATTEMPTS)
+        )
+        self.base_delay = (
+            base_delay
+            if base_delay is not None
+            else _env_number("GITHUB_RETRY_BASE_DELAY", DEFAULT_BASE_DELAY)
+        )
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.rng = rng
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (starting at 1)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling * self.rng()
+
+    @staticmethod
+    def should_retry(method: str, retry: Optional[bool]) -> bool:
+        """Return True when a request may be sent again after a failure."""
+        if retry is not None:
+            return retry
+        return method.upper() in IDEMPOTENT_METHODS
+
+
+class CircuitBreaker:
+    """Open after ``threshold`` consecutive failures; probe after ``cooldown``."""
+
+    def __init__(
+        self,
+        threshold: Optional[int] = None,
+        cooldown: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = int(
+            threshold
+            if threshold is not None
+            else _env_number("GITHUB_CIRCUIT_THRESHOLD", DEFAULT_THRESHOLD)
+        )
+        self.cooldown = (
+            cooldown
+            if cooldown is not None
+            else _env_number("GITHUB_CIRCUIT_COOLDOWN", DEFAULT_COOLDOWN)
+        )
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Return True while requests are being refused."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            return self.clock() - self.opened_at < self.cooldown or self.trial_in_flight
+
+    def before_request(self) -> None:
+        """Raise ``CircuitOpenError`` unless a request may be sent now.
+
+        Once the cooldown has passed a single trial request is let through;
+        its outcome closes or re-opens the circuit.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self.clock() - self.opened_at < self.cooldown or self.trial_in_flight:
+                raise CircuitOpenError(
+                    f"GitHub API circuit open after {self.failures} consecutive "
+                    "failures"
+                )
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+            self.trial_in_flight = False
@@ -25,64 +25,35 @@ import sys
 import requests
 from typing import List, Dict, Optional
 
-
-def get_github_token() -> str:
-    """Get GitHub token from environment variables."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if not token:
-        print("❌ Error: No GitHub token found.")
-        print("Please set GH_TOKEN3, GITHUB_TOKEN, or GH_TOKEN environment variable.")
-        print("\nExample:")
-        print("  export GH_TOKEN3='your_token_here'")
-        print("  python scripts/review_and_merge_prs.py")
-        sys.exit(1)
-    return token
+from github_client import (
+    GitHubAPIError,
+    get_client,
+    get_github_token,
+    map_concurrent,
+)
+from pr_snapshot import fetch_open_pr_snapshot
+from pr_store import get_store, load_open_prs
+from pr_warehouse import load_achievements
 
 
 def get_open_prs(owner: str, repo: str, token: str) -> List[Dict]:
     """Fetch all open pull requests."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-    params = {"state": "open", "per_page": 100}
-
-    all_prs = []
-    page = 1
-
-    while True:
-        params["page"] = page
+    url = f"/repos/{owner}/{repo}/pulls"
+    params = {"state": "open"}
 
+    try:
+        return list(get_client(token).paginate(url, params=params))
+    except GitHubAPIError as e:
+        response = e.response
+        print(f"❌ Error fetching PRs: {response.status_code}")
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Network error fetching PRs: {e}")
-            sys.exit(1)
-
-        if response.status_code != 200:
-            print(f"❌ Error fetching PRs: {response.status_code}")
-            try:
-                print(response.json())
-            except ValueError:
-                print(response.text)
-            sys.exit(1)
-
-        prs = response.json()
-        if not prs:
-            break
-
-        all_prs.extend(prs)
-        page += 1
-
-        if len(prs) < 100:
-            break
-
-    return all_prs
+            print(response.json())
+        except ValueError:
+            print(response.text)
+        sys.exit(1)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error fetching PRs: {e}")
+        sys.exit(1)
 
 
 def get_repo_info() -> tuple[str, str]:
@@ -97,57 +68,45 @@ def get_repo_info() -> tuple[str, str]:
 
 
 def get_pr_files(owner: str, repo: str, pr_number: int, token: str) -> List[Dict]:
-    """Get files changed in a PR."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    """Get files changed in a PR, following every page.
+
+    Returns an empty list if any page fails, so a partial list is never
+    recorded in the state store as the PR's full file list.
+    """
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()
+        return list(get_client(token).paginate(url))
     except requests.exceptions.RequestException:
-        pass
-
-    return []
+        return []
 
 
 def check_pr_mergeable(
     owner: str, repo: str, pr_number: int, token: str
-) -> Optional[bool]:
-    """Check if PR is mergeable (no conflicts)."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+) -> tuple[Optional[bool], Optional[str]]:
+    """Check if PR is mergeable (no conflicts); also return its state."""
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}"
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_client(token).get(url)
         if response.status_code == 200:
             data = response.json()
-            return data.get("mergeable")
+            return data.get("mergeable"), data.get("mergeable_state")
     except requests.exceptions.RequestException:
         pass
 
-    return None
+    return None, None
 
 
 def merge_pr(
     owner: str, repo: str, pr_number: int, token: str, merge_method: str = "merge"
 ) -> tuple[bool, str]:
     """Merge a pull request. Returns (success, message)."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/merge"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}/merge"
     data = {"merge_method": merge_method}  # "merge", "squash", or "rebase"
 
     try:
-        response = requests.put(url, headers=headers, json=data, timeout=30)
+        response = get_client(token).put(url, json=data)
         if response.status_code == 200:
             return True, "Success"
         else:
@@ -165,11 +124,19 @@ def analyze_pr(pr: Dict, owner: str, repo: str, token: str) -> Dict:
     """Analyze a PR and provide recommendations."""
     pr_number = pr["number"]
 
-    # Get files changed
-    files = get_pr_files(owner, repo, pr_number, token)
+    if "files" in pr:
+        # Snapshot and state store entries already carry files.
+        files = [{"filename": path} for path in pr["files"]]
+    else:
+        # Get files changed
+        files = get_pr_files(owner, repo, pr_number, token)
 
-    # Check if mergeable
-    mergeable = check_pr_mergeable(owner, repo, pr_number, token)
+    # Snapshot entries carry mergeability; the store has it when cached for
+    # the current head and main.
+    if "mergeable" in pr:
+        mergeable, mergeable_state = pr["mergeable"], pr.get("mergeable_state")
+    else:
+        mergeable, mergeable_state = check_pr_mergeable(owner, repo, pr_number, token)
 
     # Analyze PR
     analysis = {
@@ -177,9 +144,10 @@ def analyze_pr(pr: Dict, owner: str, repo: str, token: str) -> Dict:
         "title": pr["title"],
         "created_at": pr["created_at"],
         "user": pr["user"]["login"],
-        "files_count": len(files),
+        "files_count": pr.get("changed_files", len(files)),
         "files": [f["filename"] for f in files],
         "mergeable": mergeable,
+        "mergeable_state": mergeable_state,
         "is_daily_update": "Daily Update" in pr["title"]
         or "daily-contribution" in pr["title"],
         "recommendation": "unknown",
@@ -246,12 +214,29 @@ def display_pr_analysis(analyses: List[Dict]) -> None:
             print()
 
 
-def show_achievement_progress(merged_count: int) -> None:
-    """Show progress towards GitHub achievements."""
+def show_achievement_progress(merged_count: int, stats: Optional[Dict] = None) -> None:
+    """Show progress towards GitHub achievements.
+
+    ``stats`` are the all-time numbers from a synced PR warehouse (see
+    pr_warehouse.py); without them only this run's merges are known.
+    """
     print("\n" + "=" * 80)
     print("🎯 GITHUB ACHIEVEMENTS PROGRESS")
     print("=" * 80 + "\n")
 
+    quickdraw = yolo = None
+    quickdraw_note = "Merge a PR quickly after creation"
+    yolo_note = "Merge a PR without requesting review"
+    if stats:
+        # The warehouse was synced before this run's merges.
+        merged_count += stats["merged"]
+        fastest = stats["fastest_merge_minutes"]
+        if fastest is not None:
+            quickdraw = fastest <= 30
+            quickdraw_note = f"Fastest merge so far: {fastest:g} minute(s)"
+        yolo = stats["merged_without_review"] > 0
+        yolo_note = f"{stats['merged_without_review']} PR(s) merged without review"
+
     achievements = [
         {
             "name": "Pull Shark",
@@ -265,15 +250,15 @@ def show_achievement_progress(merged_count: int) -> None:
             "name": "Quickdraw",
             "emoji": "⚡",
             "requirement": "Merge PR within 30 minutes",
-            "note": "Merge a PR quickly after creation",
-            "achieved": None,
+            "note": quickdraw_note,
+            "achieved": quickdraw,
         },
         {
             "name": "YOLO",
             "emoji": "🎉",
             "requirement": "Merge without review",
-            "note": "Merge a PR without requesting review",
-            "achieved": None,
+            "note": yolo_note,
+            "achieved": yolo,
         },
     ]
 
@@ -305,7 +290,12 @@ def main():
     token = get_github_token()
 
     print(f"📋 Fetching open pull requests for {owner}/{repo}...")
-    open_prs = get_open_prs(owner, repo, token)
+    open_prs = load_open_prs(owner, repo, token)
+    if open_prs is None:
+        open_prs = fetch_open_pr_snapshot(owner, repo, token)
+    if open_prs is None:
+        open_prs = get_open_prs(owner, repo, token)
+    store = get_store(owner, repo)
 
     if not open_prs:
         print("✅ No open pull requests found.")
@@ -313,13 +303,22 @@ def main():
 
     print(f"\n🔍 Analyzing {len(open_prs)} pull request(s)...")
 
-    # Analyze each PR
-    analyses = []
-    for pr in sorted(open_prs, key=lambda item: item.get("created_at", "")):
-        print(f"  Analyzing PR #{pr['number']}...", end=" ")
-        analysis = analyze_pr(pr, owner, repo, token)
-        analyses.append(analysis)
-        print("✅")
+    # Analyze PRs in parallel; the analysis only reads from the API
+    open_prs = sorted(open_prs, key=lambda item: item.get("created_at", ""))
+    analyses = map_concurrent(lambda pr: analyze_pr(pr, owner, repo, token), open_prs)
+    # Remember what was fetched, from the main thread.
+    if store:
+        for pr, analysis in zip(open_prs, analyses):
+            if "files" not in pr and analysis["files"]:
+                store.record_files(pr["number"], analysis["files"])
+            if "mergeable" not in pr:
+                store.record_mergeability(
+                    pr["head"]["sha"],
+                    analysis["mergeable"],
+                    analysis["mergeable_state"],
+                )
+    for analysis in analyses:
+        print(f"  Analyzing PR #{analysis['number']}... ✅")
 
     # Display analysis
     display_pr_analysis(analyses)
@@ -369,7 +368,7 @@ def main():
             print(f"\n⚠️  {failed_count} pull request(s) failed to merge.")
 
         # Show achievement progress
-        show_achievement_progress(merged_count)
+        show_achievement_progress(merged_count, load_achievements(owner, repo))
     else:
         print("\n💡 To automatically merge ready PRs, run:")
         print("   python scripts/review_and_merge_prs.py --auto-merge")
@@ -11,25 +11,14 @@ Use --approve only when you explicitly want an approval review event.
 
 import os
 import sys
-import requests
 from datetime import datetime
 
+from github_client import GitHubAPIError, get_client, get_github_token
 
-def get_github_token():
-    """Get GitHub token from environment."""
-    token = (
-        os.environ.get("GH_TOKEN3")
-        or os.environ.get("GITHUB_TOKEN")
-        or os.environ.get("GH_TOKEN")
-    )
-    if token and not os.environ.get("GH_TOKEN3"):
-        print(
-            "⚠️ Warning: Using fallback GitHub token. Set GH_TOKEN3 to a personal access token so reviews and PR creation count on your GitHub profile."
-        )
-    if not token:
-        print("❌ Error: No GitHub token found.")
-        sys.exit(1)
-    return token
+FALLBACK_TOKEN_WARNING = (
+    "Using fallback GitHub token. Set GH_TOKEN3 to a personal access token so "
+    "reviews and PR creation count on your GitHub profile."
+)
 
 
 def get_repo_info():
@@ -81,30 +70,22 @@ def get_date_string():
 
 def get_contribution_prs(owner, repo, token, date_str):
     """Get all contribution PRs for today."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls"
 
-    params = {"state": "open", "per_page": 100}
+    params = {"state": "open"}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code != 200:
-            print(f"❌ Error fetching PRs: {response.status_code}")
-            return []
-
-        all_prs = response.json()
-
         # Filter for contribution PRs from today
         contribution_prs = []
-        for pr in all_prs:
+        for pr in get_client(token).paginate(url, params=params):
             title = pr.get("title", "")
             if "Contribution #" in title and date_str in title:
                 contribution_prs.append(pr)
 
         return contribution_prs
+    except GitHubAPIError as e:
+        print(f"❌ Error fetching PRs: {e.response.status_code}")
+        return []
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         return []
@@ -112,11 +93,7 @@ def get_contribution_prs(owner, repo, token, date_str):
 
 def submit_review(owner, repo, token, pr_number, approve=False):
     """Submit a transparent automated review."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
 
     event = "APPROVE" if approve else "COMMENT"
     data = {
@@ -131,7 +108,7 @@ It does not replace a human review of correctness, safety, or content quality.
     }
 
     try:
-        response = requests.post(url, json=data, headers=headers, timeout=10)
+        response = get_client(token).post(url, json=data, timeout=10)
         if response.status_code == 200:
             action = "approved" if approve else "reviewed"
             print(f"    ✅ PR #{pr_number} {action} with an automated note")
@@ -149,7 +126,7 @@ It does not replace a human review of correctness, safety, or content quality.
 
 def main():
     """Main function."""
-    token = get_github_token()
+    token = get_github_token(fallback_warning=FALLBACK_TOKEN_WARNING)
     owner, repo = get_repo_info()
     date_str = get_date_string()
     approve = should_approve()
@@ -4,6 +4,7 @@ Comprehensive test of GitHub automation system for ramincsy/Auto repository.
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -52,6 +53,23 @@ scripts_to_test = [
     "scripts/merge_daily_updates.py",
 ]
 
+# Token handling, auth headers and timeouts live in the shared API client,
+# and merge logic may live in other shared modules the script imports.
+SHARED_CLIENT = "scripts/github_client.py"
+
+
+def read_script_source(script):
+    """Return a script's source, prefixed by the shared modules it imports."""
+    with open(script, "r", encoding="utf-8") as f:
+        content = f.read()
+    modules = re.findall(r"^from (\w+) import", content, re.MULTILINE)
+    for module in dict.fromkeys(modules):
+        path = Path(script).parent / f"{module}.py"
+        if path.exists():
+            content = read_script_source(str(path)) + "\n" + content
+    return content
+
+
 print("\n1.1 Testing error handling without token...")
 # Clear token
 os.environ.pop("GH_TOKEN3", None)
@@ -73,8 +91,7 @@ for script in scripts_to_test:
     print(f"\nTesting: {script}")
 
     # Read the script
-    with open(script, "r", encoding="utf-8") as f:
-        content = f.read()
+    content = read_script_source(script)
 
     # Check 1: GH_TOKEN3 priority
     checks = {
@@ -189,8 +206,7 @@ for script in scripts_to_test:
     if not Path(script).exists():
         continue
 
-    with open(script, "r", encoding="utf-8") as f:
-        content = f.read()
+    content = read_script_source(script)
 
     # Check token priority order
     if "GH_TOKEN3" in content:
@@ -230,8 +246,7 @@ print("=" * 80)
 
 print("\n4.1 Checking auto_merge_prs.py implementation...")
 
-with open("scripts/auto_merge_prs.py", "r", encoding="utf-8") as f:
-    auto_merge_content = f.read()
+auto_merge_content = read_script_source("scripts/auto_merge_prs.py")
 
 checks = {
     "Filters daily PRs": "Daily Update" in auto_merge_content
@@ -295,11 +310,12 @@ merge_checks = {
     "Schedule 1 hour after afternoon": "'0 13 * * *'" in merge_content
     or '"0 13 * * *"' in merge_content,
     "Uses GH_TOKEN3": "GH_TOKEN3" in merge_content,
-    "Runs conflict resolution first": "resolve_conflicts.py" in merge_content,
-    "Then runs auto-merge": "auto_merge_prs.py" in merge_content,
+    "Runs the merge pipeline": "auto_merge_prs.py" in merge_content,
+    "Resolves conflicts in the same pass": "--local-resolve" in merge_content,
     "Installs requests package": "pip install requests" in merge_content
     or "requests" in merge_content,
-    "Has error handling": "continue-on-error" in merge_content,
+    "Has error handling": "continue-on-error" in merge_content
+    or "if: always()" in merge_content,
 }
 
 for check_name, result in merge_checks.items():
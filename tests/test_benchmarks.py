@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the benchmark harness in benchmarks/run_benchmarks.py.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import run_benchmarks  # noqa: E402
+
+
+def test_run_scenario_counts_requests_and_virtual_sleep():
+    run = run_benchmarks.run_scenario("auto_merge_prs", 4)
+    assert run["exit_code"] == 0
+    assert run["requests"] == sum(
+        endpoint["requests"] for endpoint in run["endpoints"].values()
+    )
+    assert run["merged"] > 0
+    # Mergeability polling advances the virtual clock, not the real one.
+    assert run["sleep_time"] > run["wall_time"]
+
+
+def test_exit_codes_ignore_return_values_and_stale_scenarios_do_work():
+    # close_old_prs returns how many PRs it closed; that is not an exit code.
+    assert run_benchmarks.run_scenario("close_old_prs", 4)["exit_code"] == 0
+    run = run_benchmarks.run_scenario("resolve_conflicts", 4)
+    assert run["exit_code"] == 0
+    assert run["merged"] > 0
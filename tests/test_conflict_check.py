@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for local conflict prediction in scripts/conflict_check.py, using a
+bare repository on disk as the remote.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from conflict_check import CLEAN, DIRTY, LocalConflictChecker  # noqa: E402
+
+
+def git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def commit_file(cwd, name, content, message):
+    (Path(cwd) / name).write_text(content)
+    git(cwd, "add", name)
+    git(cwd, "commit", "-q", "-m", message)
+    return git(cwd, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    """A bare origin whose PR #2 conflicts with a later change to main."""
+    for key in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{key}_NAME", "Test")
+        monkeypatch.setenv(f"{key}_EMAIL", "test@example.com")
+    origin = tmp_path / "origin.git"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(origin))
+    seed = tmp_path / "seed"
+    git(tmp_path, "clone", "-q", str(origin), str(seed))
+    git(seed, "checkout", "-q", "-b", "main")
+    commit_file(seed, "README.md", "# Log\n", "Initial commit")
+    git(seed, "push", "-q", "origin", "main")
+
+    heads = {}
+    for number, content in ((1, None), (2, "# Two\n")):
+        git(seed, "checkout", "-q", "-B", f"pr-{number}", "main")
+        name = "a.md" if content is None else "README.md"
+        heads[number] = commit_file(seed, name, content or "a\n", f"PR {number}")
+        git(seed, "push", "-q", "origin", f"HEAD:refs/pull/{number}/head")
+    git(seed, "checkout", "-q", "main")
+    commit_file(seed, "README.md", "# Main\n", "Change main")
+    git(seed, "push", "-q", "origin", "main")
+
+    checkout = tmp_path / "checkout"
+    git(tmp_path, "clone", "-q", "--depth", "1", f"file://{origin}", str(checkout))
+    return checkout, heads
+
+
+def test_predicts_clean_conflicting_and_ambiguous_prs(remote):
+    checkout, heads = remote
+    prs = [{"number": n, "head": {"sha": sha}} for n, sha in heads.items()]
+    prs.append({"number": 3, "head": {"sha": heads[1]}})  # no such PR ref
+    prs.append({"number": 1, "head": {"sha": "0" * 40}})  # head moved
+
+    checker = LocalConflictChecker(cwd=str(checkout))
+    assert checker.fetch(prs)
+    assert [checker.predict(pr) for pr in prs] == [CLEAN, DIRTY, None, None]
+
+    checker.close()
+    assert git(checkout, "for-each-ref", "refs/pr-heads") == ""
+
+
+def test_unusable_checkout_falls_back_to_github(tmp_path):
+    checker = LocalConflictChecker(cwd=str(tmp_path))
+    assert not checker.fetch([{"number": 1}])
+    assert checker.predict({"number": 1}) is None
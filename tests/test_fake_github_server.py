@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline GitHub stand-in in scripts/fake_github_server.py.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from fake_github_server import FakeClock, FakeRepository, start_server  # noqa: E402
+from github_client import GitHubClient  # noqa: E402
+from http_cache import HttpCache  # noqa: E402
+from pr_snapshot import OPEN_PRS_QUERY  # noqa: E402
+
+
+@pytest.fixture
+def fake():
+    clock = FakeClock()
+    repo = FakeRepository(mergeable_delay=5, clock=clock.time)
+    repo.add_pr("Daily Update - 2026-04-01 (morning)", ["README.md", "a.md"])
+    repo.add_pr("Daily Update - 2026-04-01 (afternoon)", ["README.md", "b.md"])
+    repo.add_pr("Daily Update - 2026-04-02 (morning)", ["c.md"])
+    server = start_server(repo)
+    client = GitHubClient("fake", api_url=server.url, cache=HttpCache())
+    yield repo, clock, server, client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def pr_url(number, action=""):
+    return f"/repos/ramincsy/Auto/pulls/{number}{action}"
+
+
+def test_listing_pages_and_conditional_requests(fake):
+    _, _, server, client = fake
+    prs = list(client.paginate("/repos/ramincsy/Auto/pulls", per_page=2))
+    assert sorted(pr["number"] for pr in prs) == [1, 2, 3]
+
+    client.get(pr_url(3))
+    cached = client.get(pr_url(3))
+    assert getattr(cached, "from_cache", False)
+    endpoint = server.stats.as_dict()["endpoints"][
+        "GET /repos/{owner}/{repo}/pulls/{n}"
+    ]
+    assert endpoint["statuses"] == {"200": 1, "304": 1}
+
+
+def test_mergeability_is_computed_asynchronously(fake):
+    _, clock, _, client = fake
+    assert client.get(pr_url(1)).json()["mergeable"] is None
+
+    clock.sleep(5)
+    detail = client.get(pr_url(1)).json()
+    assert (detail["mergeable"], detail["mergeable_state"]) == (True, "clean")
+
+    assert client.put(pr_url(1, "/merge"), json={"sha": "bad"}).status_code == 409
+    merged = client.put(pr_url(1, "/merge"), json={"sha": detail["head"]["sha"]})
+    assert merged.status_code == 200
+
+    clock.sleep(5)
+    states = {n: client.get(pr_url(n)).json()["mergeable_state"] for n in (2, 3)}
+    assert states == {2: "dirty", 3: "behind"}
+
+    assert client.post(pr_url(2, "/update-branch")).status_code == 422
+    assert client.post(pr_url(3, "/update-branch")).status_code == 202
+    assert client.get(pr_url(3)).json()["mergeable"] is None
+
+
+def test_graphql_snapshot_query(fake):
+    _, clock, _, client = fake
+    clock.sleep(5)
+    body = client.graphql(OPEN_PRS_QUERY, {"owner": "ramincsy", "repo": "Auto"})
+    nodes = body["data"]["repository"]["pullRequests"]["nodes"]
+    assert [node["number"] for node in nodes] == [1, 2, 3]
+    assert nodes[0]["mergeable"] == "MERGEABLE"
+    assert nodes[0]["files"]["nodes"] == [{"path": "README.md"}, {"path": "a.md"}]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the streamed, cached commit statistics in scripts/git_stats.py.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import git_stats  # noqa: E402
+import validate_system  # noqa: E402
+
+
+def git(repo, *args, date="2025-01-01T12:00:00"):
+    env = {
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+        "GIT_AUTHOR_DATE": date,
+        "GIT_COMMITTER_DATE": date,
+        "PATH": "/usr/bin:/bin:/usr/local/bin",
+    }
+    subprocess.run(["git", *args], cwd=repo, env=env, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    monkeypatch.setenv("GIT_STATS_CACHE", str(tmp_path / "git-stats.json"))
+    return path
+
+
+def commit(repo, message, date="2025-01-01T12:00:00"):
+    git(repo, "commit", "-q", "--allow-empty", "-m", message, date=date)
+
+
+def test_one_pass_counts_merges_co_authors_and_days(repo):
+    commit(repo, "first")
+    git(repo, "checkout", "-q", "-b", "feature")
+    commit(
+        repo, "pair\n\nCo-authored-by: Other <other@example.com>", "2025-01-02T09:00"
+    )
+    git(repo, "checkout", "-q", "main")
+    git(
+        repo,
+        "merge",
+        "-q",
+        "--no-ff",
+        "-m",
+        "Merge pull request #1 from x/feature",
+        "feature",
+        date="2025-01-02T10:00",
+    )
+
+    stats = git_stats.collect_git_stats(str(repo))
+
+    assert stats == {
+        "total_commits": 3,
+        "merge_commits": 1,
+        "merged_prs": 1,
+        "co_authored_commits": 1,
+        "commits_per_day": {"2025-01-01": 1, "2025-01-02": 2},
+    }
+
+
+def test_cache_walks_only_new_commits_and_rewalks_after_a_rewrite(repo, monkeypatch):
+    commit(repo, "first")
+    commit(repo, "second")
+    assert git_stats.collect_git_stats(str(repo))["total_commits"] == 2
+
+    walked = []
+    stream_log = git_stats.stream_log
+
+    def counting_stream_log(revisions, cwd=None):
+        for line in stream_log(revisions, cwd):
+            walked.append(line)
+            yield line
+
+    monkeypatch.setattr(git_stats, "stream_log", counting_stream_log)
+
+    assert git_stats.collect_git_stats(str(repo))["total_commits"] == 2
+    assert walked == []
+
+    commit(repo, "third", "2025-01-03T12:00")
+    stats = git_stats.collect_git_stats(str(repo))
+    assert stats["total_commits"] == 3
+    assert stats["commits_per_day"] == {"2025-01-01": 2, "2025-01-03": 1}
+    assert len(walked) == 1
+
+    walked.clear()
+    git(repo, "reset", "-q", "--hard", "HEAD~2")
+    assert git_stats.collect_git_stats(str(repo))["total_commits"] == 1
+    assert len(walked) == 1
+
+
+def test_validate_system_reports_merged_prs_from_git_stats(repo, monkeypatch, capsys):
+    commit(repo, "first")
+    commit(repo, "Merge pull request #2 from x/daily")
+    commit(repo, "pair\n\nCo-authored-by: Other <other@example.com>")
+    scripts_dir = repo / "scripts"
+    scripts_dir.mkdir()
+    for script in (
+        validate_system.check_scripts()[0] + validate_system.check_scripts()[1]
+    ):
+        (scripts_dir / script).touch()
+    (repo / ".github" / "workflows").mkdir(parents=True)
+    (repo / ".github" / "workflows" / "auto-merge.yml").touch()
+    monkeypatch.chdir(repo)
+    monkeypatch.setenv("GITHUB_PR_WAREHOUSE", "off")
+
+    assert validate_system.main() is True
+
+    output = capsys.readouterr().out
+    assert "Merged PRs: 1" in output
+    assert "Only 1 PRs merged so far" in output
+    assert "(1 co-authored commit(s))" in output
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared GitHub API client in scripts/github_client.py.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import github_client  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in ("GH_TOKEN3", "GITHUB_TOKEN", "GH_TOKEN", "GITHUB_API_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GITHUB_METRICS_DIR", "off")
+    github_client._clients.clear()
+
+
+def test_token_priority(monkeypatch):
+    monkeypatch.setenv("GH_TOKEN", "gh")
+    monkeypatch.setenv("GITHUB_TOKEN", "github")
+    assert github_client.get_github_token() == "github"
+    monkeypatch.setenv("GH_TOKEN3", "gh3")
+    assert github_client.get_github_token() == "gh3"
+
+
+def test_missing_token_exits():
+    with pytest.raises(SystemExit):
+        github_client.get_github_token()
+
+
+def test_url_resolution(monkeypatch):
+    monkeypatch.setenv("GITHUB_API_URL", "http://127.0.0.1:9999/")
+    client = github_client.GitHubClient("t")
+    assert client.url("/repos/o/r/pulls") == "http://127.0.0.1:9999/repos/o/r/pulls"
+    assert client.url("https://example.com/x") == "https://example.com/x"
+
+
+def test_shared_client_reuses_session():
+    client = github_client.get_client("t")
+    assert github_client.get_client("t") is client
+    assert client.session.headers["Authorization"] == "Bearer t"
+    adapter = client.session.get_adapter("https://api.github.com/")
+    assert adapter._pool_maxsize == github_client.DEFAULT_POOL_SIZE
+
+
+class PagedAdapter(BaseAdapter):
+    """Serve ``pages`` of JSON items linked with ``Link: rel="next"``."""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.requested = []
+
+    def send(self, request, **kwargs):
+        match = re.search(r"[?&]page=(\d+)", request.url)
+        page = int(match.group(1)) if match else 1
+        self.requested.append(page)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = 200
+        response._content = json.dumps(self.pages[page - 1]).encode()
+        if page < len(self.pages):
+            next_url = f"https://api.test/repos/o/r/pulls?per_page=2&page={page + 1}"
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return response
+
+    def close(self):
+        pass
+
+
+def test_paginate_follows_links_lazily():
+    client = github_client.GitHubClient("t", api_url="https://api.test")
+    adapter = PagedAdapter([[1, 2], [3, 4], [5]])
+    client.session.mount("https://", adapter)
+
+    assert list(client.paginate("/repos/o/r/pulls", per_page=2)) == [1, 2, 3, 4, 5]
+    assert adapter.requested == [1, 2, 3]
+
+    adapter.requested.clear()
+    for item in client.paginate("/repos/o/r/pulls", per_page=2):
+        if item == 2:
+            break
+    assert adapter.requested == [1]
+
+
+def test_map_concurrent_keeps_order_and_caps_workers(monkeypatch):
+    monkeypatch.setenv("GITHUB_API_CONCURRENCY", "3")
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            active.append(item)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(item)
+        return item * 2
+
+    assert github_client.map_concurrent(work, range(10)) == [i * 2 for i in range(10)]
+    assert 1 < max(peak) <= 3
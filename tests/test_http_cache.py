@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the conditional-request cache in scripts/http_cache.py.
+"""
+
+import sys
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from github_client import GitHubClient  # noqa: E402
+from http_cache import HttpCache  # noqa: E402
+
+
+class ETagAdapter(BaseAdapter):
+    """Serve one JSON body with an ETag and honor If-None-Match."""
+
+    def __init__(self, body=b'[{"number": 1}]', etag='"v1"'):
+        super().__init__()
+        self.body = body
+        self.etag = etag
+        self.seen = []
+
+    def send(self, request, **kwargs):
+        self.seen.append(request)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers["ETag"] = self.etag
+        if request.headers.get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = self.body
+        return response
+
+    def close(self):
+        pass
+
+
+def make_client(cache):
+    client = GitHubClient("t", api_url="https://api.test", cache=cache)
+    adapter = ETagAdapter()
+    client.session.mount("https://", adapter)
+    return client, adapter
+
+
+def test_not_modified_replays_cached_body():
+    client, adapter = make_client(HttpCache())
+    first = client.get("/repos/o/r/pulls", params={"state": "open"})
+    second = client.get("/repos/o/r/pulls", params={"state": "open"})
+
+    assert first.json() == second.json() == [{"number": 1}]
+    assert "If-None-Match" not in adapter.seen[0].headers
+    assert adapter.seen[1].headers["If-None-Match"] == '"v1"'
+    assert getattr(second, "from_cache", False)
+    assert client.cache.hits == 1
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = HttpCache(max_entries=2)
+    client, _ = make_client(cache)
+    for number in (1, 2, 3):
+        client.get(f"/repos/o/r/pulls/{number}")
+    assert [key.rsplit("/", 1)[-1] for key in cache.entries] == ["2", "3"]
+
+    small = HttpCache(max_bytes=len(b'[{"number": 1}]') * 2)
+    client, _ = make_client(small)
+    for number in (1, 2, 3):
+        client.get(f"/repos/o/r/pulls/{number}")
+    assert len(small.entries) == 2
+
+
+def test_cache_round_trips_through_disk(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = HttpCache(str(path))
+    client, _ = make_client(cache)
+    client.get("/repos/o/r/pulls/1")
+    client.close()
+
+    restored = HttpCache(str(path))
+    client, adapter = make_client(restored)
+    response = client.get("/repos/o/r/pulls/1")
+    assert adapter.seen[0].headers["If-None-Match"] == '"v1"'
+    assert response.json() == [{"number": 1}]
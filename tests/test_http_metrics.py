@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-endpoint API metrics in scripts/http_metrics.py.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from http_metrics import HttpMetrics, endpoint_template, percentile  # noqa: E402
+
+
+def test_endpoint_templates():
+    base = "https://api.github.com/repos/ramincsy/Auto"
+    assert (
+        endpoint_template("PUT", f"{base}/pulls/42/merge")
+        == "PUT /repos/{owner}/{repo}/pulls/{n}/merge"
+    )
+    assert (
+        endpoint_template("GET", f"{base}/pulls?state=open&page=3")
+        == "GET /repos/{owner}/{repo}/pulls"
+    )
+    assert (
+        endpoint_template("GET", f"{base}/branches/daily-2026-04-01")
+        == "GET /repos/{owner}/{repo}/branches/{branch}"
+    )
+
+
+def test_percentiles_use_nearest_rank():
+    samples = [float(n) for n in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summary_outputs(tmp_path):
+    metrics = HttpMetrics(script="auto_merge_prs")
+    url = "https://api.github.com/repos/o/r/pulls/{}"
+    metrics.record("GET", url.format(1), 200, 0.02, 0, 500)
+    metrics.record("GET", url.format(2), 304, 0.3, 0, 0)
+    metrics.record("PUT", url.format(1) + "/merge", 405, 0.2, 30, 80)
+
+    summary = metrics.as_dict()
+    detail = summary["endpoints"]["GET /repos/{owner}/{repo}/pulls/{n}"]
+    assert detail["statuses"] == {"200": 1, "304": 1}
+    assert detail["rate_limit_cost"] == 1
+    assert summary["rate_limit_cost"] == 2
+
+    json_path, prom_path = metrics.write(str(tmp_path))
+    assert json.loads(Path(json_path).read_text()) == summary
+    prom = Path(prom_path).read_text()
+    labels = 'script="auto_merge_prs",endpoint="GET /repos/{owner}/{repo}/pulls/{n}"'
+    assert f'github_api_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in prom
+    assert f'github_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in prom
+    assert f"github_api_rate_limit_cost_total{{{labels}}} 1" in prom
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass merge pipeline in scripts/merge_pipeline.py.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import github_client  # noqa: E402
+import merge_scheduler  # noqa: E402
+import pr_store  # noqa: E402
+from fake_github_server import FakeClock, FakeRepository, start_server  # noqa: E402
+from github_client import GitHubClient  # noqa: E402
+from merge_pipeline import MergePipeline, needs_update  # noqa: E402
+from merge_tracker import DEFERRED, MERGED, SKIPPED  # noqa: E402
+from native_auto_merge import AUTO_MERGE  # noqa: E402
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    clock = FakeClock()
+    repo = FakeRepository(mergeable_delay=3, clock=clock.time)
+    server = start_server(repo)
+    client = GitHubClient("fake", api_url=server.url)
+    monkeypatch.setitem(github_client._clients, "fake", client)
+    monkeypatch.setenv("GITHUB_PR_STORE", "off")
+    monkeypatch.setenv("GITHUB_MERGE_CHECKPOINT", "off")
+    monkeypatch.setenv("GITHUB_PR_WAREHOUSE", "off")
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    yield repo, server
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def requests_to(server, route):
+    endpoints = server.stats.as_dict()["endpoints"]
+    return endpoints.get(route, {}).get("requests", 0)
+
+
+def test_pipeline_lists_once_and_merges_every_daily_pr(fake):
+    repo, server = fake
+    for name in ("a.md", "b.md", "README.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+    repo.add_pr("Refactor the scripts", ["scripts/x.py"])
+
+    report = MergePipeline("ramincsy", "Auto", "fake").run()
+
+    assert report.outcomes == {1: MERGED, 2: MERGED, 3: MERGED}
+    assert repo.prs[4].state == "open"
+    assert requests_to(server, "POST /graphql") == 1
+    assert requests_to(server, "GET /repos/{owner}/{repo}/pulls") == 0
+
+
+def test_select_limits_the_later_stages_to_stale_prs(fake):
+    repo, server = fake
+    repo.add_pr("Daily Update - a", ["a.md"])
+    repo.add_pr("Daily Update - b", ["b.md"])
+    repo.advance_main(["z.md"], "unrelated change")
+    repo.add_pr("Daily Update - c", ["c.md"])
+    for pr in repo.prs.values():
+        pr.ready_at = 0
+
+    report = MergePipeline("ramincsy", "Auto", "fake").run(select=needs_update)
+
+    assert [pr["number"] for pr in report.conflicted] == [1, 2]
+    assert [pr["number"] for pr in report.ready] == [3]
+    assert report.outcomes == {1: MERGED, 2: MERGED}
+    assert repo.prs[3].state == "open"
+
+
+def test_work_past_the_deadline_is_checkpointed_and_resumed(
+    fake, tmp_path, monkeypatch, capsys
+):
+    repo, server = fake
+    for name in ("a.md", "b.md", "c.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+    repo.advance_main(["z.md"], "unrelated change")
+    for pr in repo.prs.values():
+        pr.ready_at = 0
+    path = tmp_path / "checkpoint.json"
+    monkeypatch.setenv("GITHUB_MERGE_CHECKPOINT", str(path))
+    # Enough time for one update-branch cycle.
+    monkeypatch.setenv(
+        "GITHUB_MERGE_DEADLINE", str(time.time() + merge_scheduler.SAFETY_MARGIN + 8)
+    )
+
+    report = MergePipeline("ramincsy", "Auto", "fake").run()
+    assert report.outcomes == {1: MERGED, 2: DEFERRED, 3: DEFERRED}
+    assert path.exists()
+
+    monkeypatch.delenv("GITHUB_MERGE_DEADLINE")
+    server.stats.reset()
+    report = MergePipeline("ramincsy", "Auto", "fake").run()
+    assert report.outcomes == {2: MERGED, 3: MERGED}
+    assert "Resuming 2 PR(s) in 1 batch(es)" in capsys.readouterr().out
+    assert not path.exists()
+
+
+def test_optimistic_mode_merges_without_probing_and_falls_back(fake):
+    repo, server = fake
+    for name in ("a.md", "b.md", "c.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+
+    repo.strict = False
+    report = MergePipeline("ramincsy", "Auto", "fake", optimistic=True).run()
+    assert report.outcomes == {1: MERGED, 2: MERGED, 3: MERGED}
+    assert requests_to(server, "GET /repos/{owner}/{repo}/pulls/{n}") == 0
+    assert requests_to(server, "PUT /repos/{owner}/{repo}/pulls/{n}/merge") == 3
+
+    # With up-to-date branches required, the second merge is rejected as
+    # behind and the rest go through update-branch as usual.
+    for name in ("d.md", "e.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+    repo.strict = True
+    server.stats.reset()
+    report = MergePipeline("ramincsy", "Auto", "fake", optimistic=True).run()
+    assert report.outcomes == {4: MERGED, 5: MERGED}
+    assert requests_to(server, "PUT /repos/{owner}/{repo}/pulls/{n}/merge") == 3
+    assert (
+        requests_to(server, "POST /repos/{owner}/{repo}/pulls/{n}/update-branch") == 1
+    )
+
+
+def test_native_auto_merge_hands_off_waiting_prs_and_loops_over_the_rest(fake):
+    repo, server = fake
+    repo.strict = False
+    clean = repo.add_pr("Daily Update - a", ["a.md"])
+    clean.ready_at = 0
+    repo.add_pr("Daily Update - b", ["b.md"])
+    repo.add_pr("Daily Update - c", ["c.md"])
+    draft = repo.add_pr("Daily Update - d", ["d.md"], draft=True)
+
+    report = MergePipeline("ramincsy", "Auto", "fake", native_auto_merge=True).run()
+
+    # #1 is clean already and #4 is a draft: GitHub would refuse both.
+    assert report.outcomes == {1: MERGED, 2: AUTO_MERGE, 3: AUTO_MERGE, 4: SKIPPED}
+    assert repo.prs[2].auto_merge_method == "merge"
+    assert requests_to(server, "POST /graphql") == 2
+    assert draft.auto_merge_method is None
+
+    # GitHub merges them on its own once they are clean.
+    time.sleep(repo.mergeable_delay)
+    repo.mergeable_delay = 0
+    assert (
+        MergePipeline("ramincsy", "Auto", "fake", native_auto_merge=True)
+        .run(select=lambda pr: not pr["draft"])
+        .outcomes
+        == {}
+    )
+    assert repo.prs[2].merged and repo.prs[3].merged
+
+
+def test_native_auto_merge_falls_back_when_the_repository_forbids_it(fake):
+    repo, server = fake
+    repo.allow_auto_merge = False
+    for name in ("a.md", "b.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+
+    report = MergePipeline("ramincsy", "Auto", "fake", native_auto_merge=True).run()
+
+    assert report.outcomes == {1: MERGED, 2: MERGED}
+
+
+def test_optimistic_runs_hand_off_only_prs_known_to_be_waiting(fake):
+    repo, server = fake
+    repo.strict = False
+    for name in ("a.md", "b.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+
+    # Both states are still unknown: the merges are tried directly instead.
+    report = MergePipeline(
+        "ramincsy", "Auto", "fake", optimistic=True, native_auto_merge=True
+    ).run()
+
+    assert report.outcomes == {1: MERGED, 2: MERGED}
+    assert requests_to(server, "POST /graphql") == 1
+
+
+def test_optimistic_runs_with_the_store_hand_off_blocked_prs(
+    fake, tmp_path, monkeypatch
+):
+    repo, server = fake
+    repo.strict = False
+    repo.add_pr("Daily Update - a", ["a.md"])
+    repo.add_pr("Daily Update - b", ["b.md"]).blocked = True
+    for pr in repo.prs.values():
+        pr.ready_at = 0
+    monkeypatch.setattr(pr_store, "_stores", {})
+    monkeypatch.setenv("GITHUB_PR_STORE", str(tmp_path / "pr-state.sqlite"))
+
+    # The store's REST listing has no merge states; the snapshot fills them.
+    report = MergePipeline(
+        "ramincsy", "Auto", "fake", optimistic=True, native_auto_merge=True
+    ).run()
+
+    assert report.outcomes == {1: MERGED, 2: AUTO_MERGE}
+    assert repo.prs[2].auto_merge_method == "merge"
+    assert requests_to(server, "GET /repos/{owner}/{repo}/pulls/{n}") == 0
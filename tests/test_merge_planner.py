@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the overlap-aware merge planner in scripts/merge_planner.py.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from merge_planner import estimate_creation_order, plan_merges  # noqa: E402
+
+
+def make_pr(number, files, changed_files=None):
+    pr = {
+        "number": number,
+        "created_at": f"2026-04-{number:02d}T00:00:00Z",
+        "files": files,
+    }
+    if changed_files is not None:
+        pr["changed_files"] = changed_files
+    return pr
+
+
+def numbers(plan):
+    return [[pr["number"] for pr in batch] for batch in plan.batches]
+
+
+def test_non_overlapping_prs_share_a_batch_in_creation_order():
+    prs = [
+        make_pr(1, ["README.md", "a.md"]),
+        make_pr(2, ["b.md"]),
+        make_pr(3, ["README.md", "c.md"]),
+        make_pr(4, ["d.md"]),
+        make_pr(5, ["c.md"]),
+        make_pr(6, ["e.md"], changed_files=150),
+    ]
+    plan = plan_merges(list(reversed(prs)))
+    # 5 overlaps 3, so it waits for 3's batch even though batch 1 is free.
+    assert numbers(plan) == [[1, 2, 4], [3], [5], [6]]
+
+
+def test_batching_updates_each_overlapping_pr_once():
+    prs = [make_pr(n, ["README.md" if n % 2 else f"{n}.md"]) for n in range(1, 9)]
+    plan = plan_merges(prs)
+    planned = plan.cost()
+    baseline = estimate_creation_order(prs)
+    # Four README PRs: 3 updates planned; 1 + 2 + 3 merging oldest first.
+    assert (planned["updates"], baseline["updates"]) == (3, 6)
+    assert planned["api_calls"] < baseline["api_calls"]
+    assert plan.describe()[0] == "Merge plan: 8 PR(s) in 4 batch(es)"
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the deadline-aware scheduler and checkpoint in
+scripts/merge_scheduler.py.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from merge_scheduler import (  # noqa: E402
+    SAFETY_MARGIN,
+    Checkpoint,
+    MergeScheduler,
+    estimate_cost,
+    get_deadline,
+)
+
+
+def make_pr(number, state="unknown", sha=None):
+    return {
+        "number": number,
+        "mergeable_state": state,
+        "head": {"sha": sha or f"sha-{number}"},
+    }
+
+
+def test_cheapest_then_oldest_work_is_started_while_it_fits():
+    batch = [make_pr(1, "behind"), make_pr(2, "clean"), make_pr(3), make_pr(4)]
+    hints = {4: "clean"}
+    budget = (
+        estimate_cost(batch[3], "clean")
+        + estimate_cost(batch[1])
+        + estimate_cost(batch[2])
+        + 0.1
+    )
+    scheduler = MergeScheduler(SAFETY_MARGIN + budget, clock=lambda: 0.0)
+
+    now, later = scheduler.schedule(batch, hints)
+    assert [pr["number"] for pr in now] == [4, 2, 3]
+    assert [pr["number"] for pr in later] == [1]
+
+    assert MergeScheduler(SAFETY_MARGIN, clock=lambda: 0.0).schedule(batch, {})[0] == []
+
+
+def test_deadline_takes_the_earlier_of_timeout_and_environment(monkeypatch):
+    monkeypatch.setenv("GITHUB_MERGE_TIMEOUT", "600")
+    monkeypatch.setenv("GITHUB_MERGE_DEADLINE", "1300")
+    assert get_deadline(clock=lambda: 1000.0) == 1300.0
+    monkeypatch.setenv("GITHUB_MERGE_DEADLINE", "not a time")
+    assert get_deadline(clock=lambda: 1000.0) == 1600.0
+
+
+def test_checkpoint_resumes_open_prs_in_batch_order(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    updated = make_pr(4, "behind")
+    updated["branch_updated"] = True
+    Checkpoint(path, "ramincsy/Auto").save(
+        [[make_pr(1, "behind"), make_pr(2, "dirty")], [], [make_pr(3), updated]]
+    )
+    assert Checkpoint(path, "someone/else").resume([make_pr(1)]) == []
+
+    # #2 merged elsewhere and #3 was pushed to since the checkpoint.
+    prs = [make_pr(1), make_pr(3, sha="moved"), make_pr(4), make_pr(5)]
+    batches = Checkpoint(path, "ramincsy/Auto").resume(prs)
+    assert [[pr["number"] for pr in batch] for batch in batches] == [[1], [3, 4]]
+    states = {pr["number"]: pr["mergeable_state"] for pr in prs}
+    assert states == {1: "behind", 3: "unknown", 4: "unknown", 5: "unknown"}
+
+    Checkpoint(path, "ramincsy/Auto").save([[], []])
+    assert not Path(path).exists()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent mergeability tracker in scripts/merge_tracker.py.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from fake_github_server import FakeClock, FakeRepository, start_server  # noqa: E402
+from github_client import GitHubClient  # noqa: E402
+from merge_tracker import (  # noqa: E402
+    CONFLICT,
+    FAILED,
+    MERGED,
+    SKIPPED,
+    MergeTracker,
+)
+
+
+@pytest.fixture
+def fake():
+    clock = FakeClock()
+    repo = FakeRepository(mergeable_delay=3, clock=clock.time)
+    server = start_server(repo)
+    client = GitHubClient("fake", api_url=server.url)
+    yield repo, clock, client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def make_tracker(client, clock):
+    pulls = "/repos/ramincsy/Auto/pulls"
+
+    def get_details(number):
+        response = client.get(f"{pulls}/{number}")
+        return response.json() if response.status_code == 200 else {}
+
+    def update_branch(number, sha):
+        response = client.post(
+            f"{pulls}/{number}/update-branch", json={"expected_head_sha": sha}
+        )
+        return response.status_code == 202
+
+    def merge(number, sha):
+        response = client.put(f"{pulls}/{number}/merge", json={"sha": sha})
+        return response.status_code
+
+    return MergeTracker(
+        get_details, update_branch, merge, clock=clock.time, sleep=clock.sleep
+    )
+
+
+def test_stale_prs_are_updated_and_merged_together(fake):
+    repo, clock, client = fake
+    for name in ("a.md", "b.md", "c.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+    repo.add_pr("Daily Update - conflict", ["x.md"])
+    repo.add_pr("Daily Update - draft", ["d.md"], draft=True)
+    repo.advance_main(["x.md"], "unrelated change")
+
+    tracker = make_tracker(client, clock)
+    for number in repo.prs:
+        tracker.add(number)
+    outcomes = tracker.run()
+
+    assert outcomes == {1: MERGED, 2: MERGED, 3: MERGED, 4: CONFLICT, 5: SKIPPED}
+    # The old loop slept at least 10 s per updated PR on top of its polling.
+    assert clock.slept < 40
+
+
+def test_prs_known_to_be_stale_skip_the_first_poll(fake):
+    repo, clock, client = fake
+    repo.add_pr("Daily Update - a", ["a.md"])
+    repo.advance_main(["z.md"], "unrelated change")
+    clock.sleep(3)
+
+    tracker = make_tracker(client, clock)
+    tracker.add(1, mergeable_state="behind")
+    assert tracker.run() == {1: MERGED}
+    assert tracker.prs[0].updates == 1
+
+
+def test_predicted_states_skip_polling_and_updates(fake):
+    repo, clock, client = fake
+    repo.strict = False
+    repo.add_pr("Daily Update - a", ["a.md"])
+    repo.add_pr("Daily Update - b", ["b.md"])
+    repo.add_pr("Daily Update - conflict", ["x.md"])
+    repo.advance_main(["x.md"], "unrelated change")
+
+    tracker = make_tracker(client, clock)
+    for number, predicted in ((1, "clean"), (2, "clean"), (3, "dirty")):
+        tracker.add(number, head_sha=repo.prs[number].head_sha, predicted=predicted)
+
+    assert tracker.run() == {1: MERGED, 2: MERGED, 3: CONFLICT}
+    assert clock.slept == 0
+    assert all(pr.updates == 0 for pr in tracker.prs)
+
+
+def test_failed_predicted_merges_fall_back_to_polling(fake):
+    repo, clock, client = fake
+    repo.add_pr("Daily Update - a", ["a.md"])
+    repo.advance_main(["z.md"], "unrelated change")
+
+    # Branches must be up to date, which a local merge cannot see.
+    tracker = make_tracker(client, clock)
+    tracker.add(1, head_sha=repo.prs[1].head_sha, predicted="clean")
+    assert tracker.run() == {1: MERGED}
+    assert tracker.prs[0].updates == 1
+
+
+def test_merge_refusals_other_than_405_or_409_are_failures(fake):
+    repo, clock, client = fake
+    repo.add_pr("Daily Update - a", ["a.md"])
+    repo.add_pr("Daily Update - b", ["b.md"])
+    polled = []
+
+    def get_details(number):
+        polled.append(number)
+        return {}
+
+    tracker = MergeTracker(
+        get_details,
+        lambda number, sha: False,
+        lambda number, sha: {1: 403, 2: None}[number],
+        clock=clock.time,
+        sleep=clock.sleep,
+    )
+    for number in repo.prs:
+        tracker.add(number, head_sha=repo.prs[number].head_sha, predicted="clean")
+
+    assert tracker.run() == {1: FAILED, 2: FAILED}
+    assert polled == []
+    assert clock.slept == 0
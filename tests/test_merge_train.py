@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the local merge train in scripts/merge_train.py, using a bare
+repository on disk as the remote.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from merge_train import run_merge_train  # noqa: E402
+
+
+def git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def commit_file(cwd, name, content, message):
+    (Path(cwd) / name).write_text(content)
+    git(cwd, "add", name)
+    git(cwd, "commit", "-q", "-m", message)
+    return git(cwd, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    """A bare origin with main and four PR heads; #3 and #4 conflict."""
+    for key, value in {
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }.items():
+        monkeypatch.setenv(key, value)
+    origin = tmp_path / "origin.git"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(origin))
+    seed = tmp_path / "seed"
+    git(tmp_path, "clone", "-q", str(origin), str(seed))
+    git(seed, "checkout", "-q", "-b", "main")
+    commit_file(seed, "README.md", "# Log\n", "Initial commit")
+    git(seed, "push", "-q", "origin", "main")
+
+    heads = {}
+    for number, (name, content) in enumerate(
+        [
+            ("a.md", "a\n"),
+            ("b.md", "b\n"),
+            ("README.md", "# Three\n"),
+            ("README.md", "# Four\n"),
+        ],
+        1,
+    ):
+        git(seed, "checkout", "-q", "-B", f"pr-{number}", "main")
+        heads[number] = commit_file(seed, name, content, f"Contribution {number}")
+        git(seed, "push", "-q", "origin", f"HEAD:refs/pull/{number}/head")
+
+    checkout = tmp_path / "checkout"
+    git(tmp_path, "clone", "-q", "--depth", "1", f"file://{origin}", str(checkout))
+    return origin, checkout, heads
+
+
+def make_prs(heads):
+    return [
+        {
+            "number": n,
+            "title": f"Contribution {n}",
+            "head": {"ref": f"pr-{n}", "sha": sha},
+        }
+        for n, sha in heads.items()
+    ]
+
+
+def test_train_pushes_clean_prs_once_and_leaves_conflicts(remote):
+    origin, checkout, heads = remote
+    result = run_merge_train(make_prs(heads), cwd=str(checkout))
+
+    assert result.pushed
+    assert result.merged == [1, 2, 3]
+    assert result.conflicts == [4]
+    assert git(origin, "rev-parse", "main") == result.commit
+    for number in result.merged:
+        git(origin, "merge-base", "--is-ancestor", heads[number], "main")
+    log = git(origin, "log", "--first-parent", "--format=%s", "main")
+    assert log.splitlines()[:3] == [
+        "Merge pull request #3 from pr-3",
+        "Merge pull request #2 from pr-2",
+        "Merge pull request #1 from pr-1",
+    ]
+    # Temporary refs and the worktree are cleaned up.
+    assert git(checkout, "for-each-ref", "refs/pr-heads") == ""
+    assert len(git(checkout, "worktree", "list").splitlines()) == 1
+
+
+def test_moved_or_missing_heads_are_skipped(remote):
+    origin, checkout, heads = remote
+    prs = make_prs(heads)
+    prs[0]["head"]["sha"] = "0" * 40
+    prs.append({"number": 5, "title": "Contribution 5", "head": {}})
+    # Someone else pushes to main after the checkout was cloned.
+    other = Path(checkout).parent / "other"
+    git(other.parent, "clone", "-q", str(origin), str(other))
+    commit_file(other, "c.md", "c\n", "Direct push")
+    git(other, "push", "-q", "origin", "main")
+
+    result = run_merge_train(prs, cwd=str(checkout))
+    assert result.skipped == [1, 5]
+    # The train is built on the freshly fetched main, so the push succeeds.
+    assert result.pushed
+    assert result.merged == [2, 3]
+
+
+def test_rejected_push_merges_nothing(remote):
+    origin, checkout, heads = remote
+    hook = origin / "hooks" / "pre-receive"
+    hook.write_text("#!/bin/sh\necho 'protected branch' >&2\nexit 1\n")
+    hook.chmod(0o755)
+
+    result = run_merge_train(make_prs(heads), cwd=str(checkout))
+    assert result.integrated == [1, 2, 3]
+    assert not result.pushed
+    assert result.merged == []
+    assert git(origin, "rev-list", "--count", "main") == "1"
+
+
+def test_readme_daily_sections_merge_as_a_union(remote):
+    origin, checkout, heads = remote
+    seed = Path(checkout).parent / "seed"
+    for number in (6, 7):
+        git(seed, "checkout", "-q", "-B", f"pr-{number}", "main")
+        content = f"# Log\n\n## 2026-04-0{number} (morning)\n- entry\n"
+        heads[number] = commit_file(seed, "README.md", content, f"Daily {number}")
+        git(seed, "push", "-q", "origin", f"HEAD:refs/pull/{number}/head")
+
+    result = run_merge_train(make_prs({n: heads[n] for n in (6, 7)}), cwd=str(checkout))
+    assert result.merged == [6, 7]
+    assert git(origin, "show", "main:README.md").count("(morning)") == 2
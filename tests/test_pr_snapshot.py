@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the GraphQL open-PR snapshot in scripts/pr_snapshot.py.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import pr_snapshot  # noqa: E402
+
+
+def make_node(number, mergeable="MERGEABLE", state="CLEAN"):
+    return {
+        "number": number,
+        "title": f"Daily Update #{number}",
+        "createdAt": "2026-01-01T00:00:00Z",
+        "isDraft": False,
+        "mergeable": mergeable,
+        "mergeStateStatus": state,
+        "headRefName": f"daily-contribution-{number}",
+        "headRefOid": f"sha{number}",
+        "url": f"https://github.com/o/r/pull/{number}",
+        "author": None,
+        "files": {"totalCount": 1, "nodes": [{"path": "README.md"}]},
+    }
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.cursors = []
+
+    def graphql(self, query, variables):
+        self.cursors.append(variables["cursor"])
+        return self.pages[len(self.cursors) - 1]
+
+
+def page(nodes, end_cursor=None):
+    connection = {
+        "nodes": nodes,
+        "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+    }
+    return {"data": {"repository": {"pullRequests": connection}}}
+
+
+def test_snapshot_follows_cursors_and_normalizes(monkeypatch):
+    client = FakeClient(
+        [
+            page([make_node(1), make_node(2, "CONFLICTING", "DIRTY")], "c1"),
+            page([make_node(3, "UNKNOWN", "UNKNOWN")]),
+        ]
+    )
+    monkeypatch.setattr(pr_snapshot, "get_client", lambda token: client)
+
+    snapshot = pr_snapshot.fetch_open_pr_snapshot("o", "r", "t")
+
+    assert client.cursors == [None, "c1"]
+    assert [pr["mergeable"] for pr in snapshot] == [True, False, None]
+    assert [pr["mergeable_state"] for pr in snapshot] == ["clean", "dirty", "unknown"]
+    assert snapshot[0]["head"] == {"ref": "daily-contribution-1", "sha": "sha1"}
+    assert snapshot[0]["files"] == ["README.md"]
+    assert snapshot[0]["user"] == {"login": "ghost"}
+
+
+def test_snapshot_errors_return_none(monkeypatch):
+    client = FakeClient([{"errors": [{"message": "Bad credentials"}]}])
+    monkeypatch.setattr(pr_snapshot, "get_client", lambda token: client)
+    assert pr_snapshot.fetch_open_pr_snapshot("o", "r", "t") is None
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON output and snapshot file of scripts/pr_status_report.py.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import github_client  # noqa: E402
+import pr_status_report  # noqa: E402
+from fake_github_server import FakeClock, FakeRepository, start_server  # noqa: E402
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    clock = FakeClock()
+    repo = FakeRepository(mergeable_delay=0, strict=False, clock=clock.time)
+    server = start_server(repo)
+    # Clients come from the real get_client, metrics included; exit_clients
+    # stands in for the atexit hook that closes them.
+    monkeypatch.setattr(github_client, "_clients", {})
+    monkeypatch.setattr(github_client.atexit, "register", lambda func: None)
+    monkeypatch.setenv("GITHUB_API_URL", server.url)
+    monkeypatch.setenv("GITHUB_HTTP_CACHE", "off")
+    monkeypatch.setenv("GITHUB_METRICS_DIR", "off")
+    monkeypatch.setenv("GH_TOKEN3", "fake")
+    monkeypatch.setenv("GITHUB_PR_STORE", "off")
+    yield repo, server, clock
+    exit_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def exit_clients():
+    while github_client._clients:
+        _, client = github_client._clients.popitem()
+        client.close()
+
+
+def run_report(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, "argv", ["pr_status_report.py", *args])
+    pr_status_report.main()
+    exit_clients()
+    return capsys.readouterr()
+
+
+def test_json_report_is_written_to_and_rendered_from_a_snapshot(
+    fake, tmp_path, monkeypatch, capsys
+):
+    repo, server, _ = fake
+    repo.add_pr("Daily Update - a", ["README.md"])
+    repo.add_pr("Daily Update - b", ["README.md"])
+    repo.merge(repo.prs[1], None)
+    path = tmp_path / "status.json"
+
+    first = run_report(monkeypatch, capsys, "--format", "json", "--snapshot", str(path))
+    report = json.loads(first.out)
+    assert report["health"]["dirty"] == 1
+    assert report["merges"]["window_hours"] == 24
+    assert [pr["number"] for pr in report["prs"]] == [2]
+    assert path.exists()
+
+    server.stats.reset()
+    again = run_report(monkeypatch, capsys, "--format", "json", "--snapshot", str(path))
+    assert json.loads(again.out) == report
+    assert server.stats.as_dict()["total_requests"] == 0
+
+    text = run_report(monkeypatch, capsys, "--snapshot", str(path))
+    assert "Dirty (conflicts): 1" in text.out
+    assert server.stats.as_dict()["total_requests"] == 0
+
+
+def test_report_without_daily_prs_renders(fake, monkeypatch, capsys):
+    output = run_report(monkeypatch, capsys).out
+    assert "Status: OK" in output
+    assert "Total Daily PRs: 0" in output
+
+
+def test_merge_stats_stop_at_the_window_and_report_the_median(fake):
+    repo, server, clock = fake
+    for index in range(120):
+        repo.merge(repo.add_pr(f"Daily Update - old {index}", [f"old{index}.md"]), None)
+    clock.sleep(48 * 3600)
+    recent = [repo.add_pr(f"Daily Update - {name}", [name]) for name in "abc"]
+    repo.add_pr("Daily Update - closed", ["d.md"]).state = "closed"
+    for pr in recent:
+        clock.sleep(3600)
+        repo.merge(pr, None)
+    now = pr_status_report.parse_time(repo.timestamp(clock.time()))
+    server.stats.reset()
+
+    stats = pr_status_report.get_merge_stats("ramincsy", "Auto", "fake", 24, now)
+
+    assert stats == {"window_hours": 24, "merged": 3, "median_hours_to_merge": 2}
+    assert server.stats.as_dict()["total_requests"] == 1
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental SQLite PR state store in scripts/pr_store.py.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import pr_store  # noqa: E402
+import review_and_merge_prs  # noqa: E402
+from fake_github_server import (  # noqa: E402
+    FakeClock,
+    FakeRepository,
+    make_sha,
+    start_server,
+)
+from github_client import GitHubClient  # noqa: E402
+
+REPOSITORY = "ramincsy/Auto"
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    clock = FakeClock()
+    repo = FakeRepository(clock=clock.time)
+    server = start_server(repo)
+    client = GitHubClient("fake", api_url=server.url)
+    monkeypatch.setattr(pr_store, "get_client", lambda token: client)
+    yield repo, clock, server
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def requests_made(server):
+    return server.stats.as_dict()["total_requests"]
+
+
+def test_second_sync_only_reads_changed_prs(fake, tmp_path):
+    repo, clock, server = fake
+    repo.seed(150)
+    path = str(tmp_path / "state.sqlite")
+    store = pr_store.PRStore(path, REPOSITORY)
+    assert store.sync("ramincsy", "Auto", "fake") == 150
+    # Two listing pages and the main tip.
+    assert requests_made(server) == 3
+
+    store.record_files(1, ["README.md"])
+    store.record_files(3, ["a.md"])
+    store.record_mergeability(repo.prs[1].head_sha, True, "clean")
+    store.record_mergeability(repo.prs[3].head_sha, False, "dirty")
+    store.record_outcome(3, "conflict", "conflict (dirty)")
+    store.close()
+
+    clock.sleep(60)
+    moved = repo.prs[1]
+    moved.head_sha = make_sha("head", 1, 1)
+    moved.updated_at = clock.time()
+    closed = repo.prs[2]
+    closed.state = "closed"
+    closed.updated_at = clock.time()
+    server.stats.reset()
+
+    store = pr_store.PRStore(path, REPOSITORY)
+    assert store.sync("ramincsy", "Auto", "fake") == 2
+    # The first page reaches PRs older than the last sync, so it stops there.
+    assert requests_made(server) == 2
+
+    prs = {pr["number"]: pr for pr in store.open_prs()}
+    assert len(prs) == 149 and 2 not in prs
+    assert "mergeable" not in prs[1] and "files" not in prs[1]
+    assert prs[3]["mergeable"] is False and prs[3]["files"] == ["a.md"]
+    assert (prs[3]["attempts"], prs[3]["last_error"]) == (1, "conflict (dirty)")
+
+    store.record_outcome(3, "merged")
+    assert 3 not in {pr["number"] for pr in store.open_prs()}
+
+
+def test_mergeability_is_cached_until_main_advances(fake, tmp_path):
+    repo, clock, server = fake
+    repo.seed(3)
+    store = pr_store.PRStore(str(tmp_path / "state.sqlite"), REPOSITORY)
+    store.sync("ramincsy", "Auto", "fake")
+    store.record_mergeability(repo.prs[1].head_sha, True, "clean")
+    store.record_mergeability(repo.prs[2].head_sha, True, "blocked")
+    store.record_mergeability(repo.prs[3].head_sha, None, "unknown")
+
+    store.sync("ramincsy", "Auto", "fake")
+    prs = {pr["number"]: pr for pr in store.open_prs()}
+    assert (prs[1]["mergeable"], prs[1]["mergeable_state"]) == (True, "clean")
+    assert prs[1]["mergeability_computed_at"].endswith("Z")
+    # Review- and check-dependent or unknown states are not cached.
+    assert "mergeable" not in prs[2] and "mergeable" not in prs[3]
+
+    repo.advance_main(["other.md"], "Direct push")
+    store.sync("ramincsy", "Auto", "fake")
+    assert all("mergeable" not in pr for pr in store.open_prs())
+    assert store.db.execute("SELECT COUNT(*) FROM mergeability").fetchone()[0] == 0
+
+
+def test_store_is_rebuilt_for_another_repository_or_a_corrupt_file(tmp_path):
+    path = tmp_path / "state.sqlite"
+    store = pr_store.PRStore(str(path), REPOSITORY)
+    store.upsert({"number": 1, "head": {"sha": "a"}, "base": {"sha": "b"}})
+    store.db.commit()
+    store.close()
+
+    assert pr_store.PRStore(str(path), "someone/else").open_prs() == []
+
+    path.write_bytes(b"not a database" * 100)
+    assert pr_store.PRStore(str(path), REPOSITORY).open_prs() == []
+
+
+def test_store_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("GITHUB_PR_STORE", "off")
+    assert pr_store.get_store("ramincsy", "Auto") is None
+    assert pr_store.load_open_prs("ramincsy", "Auto", "fake") is None
+
+
+def test_file_lists_past_the_first_page_are_read_in_full(fake, monkeypatch):
+    repo, _, server = fake
+    client = GitHubClient("fake", api_url=server.url)
+    monkeypatch.setattr(review_and_merge_prs, "get_client", lambda token: client)
+    paths = [f"updates/{index}.md" for index in range(130)]
+    pr = repo.add_pr("Daily Update - wide", paths)
+
+    files = review_and_merge_prs.get_pr_files("ramincsy", "Auto", pr.number, "fake")
+
+    assert [item["filename"] for item in files] == paths
+    assert requests_made(server) == 2
+    client.close()
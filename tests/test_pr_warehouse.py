@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the PR history warehouse in scripts/pr_warehouse.py.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import github_client  # noqa: E402
+from fake_github_server import FakeClock, FakeRepository, start_server  # noqa: E402
+from github_client import GitHubClient  # noqa: E402
+from pr_warehouse import PRWarehouse, iso, percentile  # noqa: E402
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    clock = FakeClock()
+    repo = FakeRepository(mergeable_delay=0, strict=False, clock=clock.time)
+    server = start_server(repo)
+    client = GitHubClient("fake", api_url=server.url)
+    monkeypatch.setitem(github_client._clients, "fake", client)
+    yield repo, server, clock
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def make_pr(number, created, merged=None):
+    return {
+        "number": number,
+        "title": f"Daily Update #{number}",
+        "state": "closed" if merged else "open",
+        "created_at": iso(created),
+        "updated_at": iso(merged or created),
+        "merged_at": iso(merged) if merged else None,
+    }
+
+
+def test_sync_only_reads_prs_changed_since_the_last_sync(fake):
+    repo, server, clock = fake
+    for name in ("a.md", "b.md", "c.md"):
+        repo.add_pr(f"Daily Update - {name}", [name])
+    repo.prs[1].reviews.append({"id": 1, "state": "APPROVED"})
+    clock.sleep(600)
+    repo.merge(repo.prs[1], None)
+    warehouse = PRWarehouse(":memory:", "ramincsy/Auto")
+
+    assert warehouse.sync("ramincsy", "Auto", "fake") == 3
+    assert warehouse.achievements()["approved_reviews"] == 1
+    assert warehouse.achievements()["fastest_merge_minutes"] == 10
+
+    clock.sleep(60)
+    repo.merge(repo.prs[2], None)
+    server.stats.reset()
+    # #2 changed; #1 is read again since it was updated at the watermark.
+    assert warehouse.sync("ramincsy", "Auto", "fake") == 2
+    # One listing page and the reviews of those two PRs.
+    assert server.stats.as_dict()["total_requests"] == 3
+    assert warehouse.achievements()["merged"] == 2
+    assert warehouse.achievements()["merged_without_review"] == 1
+
+
+def test_canned_reports():
+    warehouse = PRWarehouse(":memory:", "ramincsy/Auto")
+    now = datetime.now(timezone.utc)
+    for number, hours in enumerate([1, 2, 3, 10], 1):
+        created = now - timedelta(days=2, hours=hours)
+        warehouse.upsert(make_pr(number, created, now - timedelta(days=2)), [])
+    warehouse.upsert(make_pr(5, now - timedelta(days=60), now - timedelta(days=59)), [])
+    warehouse.record_outcome(1, "merged", "clean")
+    warehouse.record_outcome(2, "conflict", "dirty")
+    warehouse.record_outcome(2, "merged", "squash")
+    warehouse.record_outcome(3, "failed", "blocked")
+    warehouse.record_outcome(4, "conflict", "dirty")
+
+    throughput = warehouse.report("throughput", days=30)
+    assert throughput["merged"] == 4
+    assert list(throughput["per_day"].values()) == [4]
+
+    times = warehouse.report("time-to-merge", days=30)
+    assert (times["p50_hours"], times["p95_hours"], times["max_hours"]) == (2, 10, 10)
+
+    conflicts = warehouse.report("conflicts", days=30)
+    assert (conflicts["attempted"], conflicts["conflicted"]) == (4, 2)
+    assert conflicts["conflict_rate"] == 0.5
+
+    failures = warehouse.report("failures", days=30)
+    assert failures["reasons"][0] == {
+        "outcome": "conflict",
+        "reason": "dirty",
+        "count": 2,
+    }
+    assert failures["total"] == 3
+
+    assert percentile([], 50) is None
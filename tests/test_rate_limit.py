@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for rate-limit accounting in scripts/rate_limit.py.
+"""
+
+import sys
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from rate_limit import RateLimiter, resource_for_url  # noqa: E402
+
+
+def make_response(status=200, headers=None, body=b""):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = body
+    return response
+
+
+def budget_headers(remaining, limit=5000, reset=1000, resource="core"):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def test_resource_for_url():
+    assert resource_for_url("https://api.github.com/graphql") == "graphql"
+    assert resource_for_url("https://api.github.com/search/issues?q=x") == "search"
+    assert resource_for_url("https://api.github.com/repos/o/r/pulls") == "core"
+
+
+def test_budget_tracking_and_pacing():
+    limiter = RateLimiter(reserve=10, max_wait=600, clock=lambda: 0.0)
+    limiter.update(make_response(headers=budget_headers(4000)))
+    assert limiter.remaining() == 4000
+    assert limiter.delay_for("core") == 0
+    assert not limiter.is_low()
+
+    # 100 requests left for 1000 s: spread them out, capped per request.
+    limiter.update(make_response(headers=budget_headers(100)))
+    assert 0 < limiter.delay_for("core") <= 10
+
+    limiter.update(make_response(headers=budget_headers(5)))
+    assert limiter.is_low()
+
+    # Exhausted with the reset in reach: wait for it.
+    limiter.update(make_response(headers=budget_headers(0, reset=100)))
+    assert limiter.delay_for("core") == 101
+    # Other resources keep their own budget.
+    assert limiter.delay_for("search") == 0
+
+
+def test_retry_delay_for_secondary_limits():
+    now = [0.0]
+    limiter = RateLimiter(max_wait=120, clock=lambda: now[0])
+    assert limiter.retry_delay(make_response(404)) is None
+    assert limiter.retry_delay(make_response(429, {"Retry-After": "30"})) == 30
+    assert limiter.delay_for("core") == 30
+
+    body = b'{"message": "You have exceeded a secondary rate limit."}'
+    assert limiter.retry_delay(make_response(403, body=body)) == 60
+    # A reset further away than max_wait is not worth waiting for.
+    primary = budget_headers(0, reset=3600)
+    assert limiter.retry_delay(make_response(403, primary)) is None
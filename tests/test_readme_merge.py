@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the README daily-log union driver in scripts/readme_merge.py and
+the local branch updates in scripts/local_update.py that use it.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from local_update import update_branches_locally  # noqa: E402
+from readme_merge import union_merge  # noqa: E402
+
+PREAMBLE = "# Auto\n\nIntro.\n\n"
+
+
+def section(date, period=None, bullet="Studied"):
+    header = f"## {date} ({period})" if period else f"## 📅 {date}"
+    return f"{header}\n- {bullet}\n"
+
+
+def readme(*sections, preamble=PREAMBLE):
+    return preamble + "\n".join(sections)
+
+
+def test_sections_from_both_sides_are_unioned_in_date_order():
+    base = readme(section("2026-04-01"))
+    ours = readme(section("2026-04-01"), section("2026-04-03", "morning"))
+    theirs = readme(
+        section("2026-04-01"),
+        section("2026-04-02", "afternoon"),
+        section("2026-04-02", "morning"),
+        section("2026-04-03", "morning", bullet="Other bullets"),
+    )
+    assert union_merge(base, ours, theirs) == readme(
+        section("2026-04-01"),
+        section("2026-04-02", "morning"),
+        section("2026-04-02", "afternoon"),
+        section("2026-04-03", "morning"),
+    )
+
+
+def test_removed_sections_and_preamble_edits_are_kept():
+    base = readme(section("2026-04-01"), section("2026-04-02"))
+    ours = readme(section("2026-04-02"), section("2026-04-03"))
+    theirs = readme(
+        section("2026-04-01"), section("2026-04-02"), preamble="# Auto\n\nNew.\n\n"
+    )
+    assert union_merge(base, ours, theirs) == readme(
+        section("2026-04-02"), section("2026-04-03"), preamble="# Auto\n\nNew.\n\n"
+    )
+
+
+def test_conflicting_preamble_edits_need_a_human():
+    base = readme(section("2026-04-01"))
+    ours = readme(section("2026-04-01"), preamble="# Ours\n\n")
+    theirs = readme(section("2026-04-01"), preamble="# Theirs\n\n")
+    assert union_merge(base, ours, theirs) is None
+    assert union_merge(base, base + "## Notes\n", theirs) is None
+
+
+def git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def commit_readme(cwd, content, message):
+    (Path(cwd) / "README.md").write_text(content)
+    git(cwd, "commit", "-q", "-am", message)
+    return git(cwd, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    """Two daily PRs that each appended a section; #1 is merged into main."""
+    for key in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{key}_NAME", "Test")
+        monkeypatch.setenv(f"{key}_EMAIL", "test@example.com")
+    origin = tmp_path / "origin.git"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(origin))
+    seed = tmp_path / "seed"
+    git(tmp_path, "clone", "-q", str(origin), str(seed))
+    git(seed, "checkout", "-q", "-b", "main")
+    (seed / "README.md").write_text(readme(section("2026-04-01")))
+    git(seed, "add", "README.md")
+    git(seed, "commit", "-q", "-m", "Initial commit")
+
+    heads = {}
+    for number, date in ((1, "2026-04-02"), (2, "2026-04-03"), (3, "2026-04-04")):
+        git(seed, "checkout", "-q", "-B", f"daily-{number}", "main")
+        content = readme(section("2026-04-01"), section(date, "morning"))
+        if number == 3:
+            content = content.replace("Intro.", "Rewritten intro.")
+        heads[number] = commit_readme(seed, content, f"Daily Update {date}")
+    git(seed, "push", "-q", "origin", "daily-1:main", "daily-2", "daily-3")
+    git(seed, "checkout", "-q", "main")
+    git(seed, "reset", "-q", "--hard", "daily-1")
+    main_readme = readme(section("2026-04-01"), section("2026-04-02", "morning"))
+    commit_readme(seed, main_readme.replace("Intro.", "Main."), "Edit intro")
+    git(seed, "push", "-q", "origin", "main")
+    for number in (2, 3):
+        git(seed, "push", "-q", "origin", f"daily-{number}:refs/pull/{number}/head")
+
+    checkout = tmp_path / "checkout"
+    git(tmp_path, "clone", "-q", "--depth", "1", f"file://{origin}", str(checkout))
+    return origin, checkout, heads
+
+
+def test_conflicted_daily_prs_are_resolved_and_pushed(remote):
+    origin, checkout, heads = remote
+    prs = [
+        {"number": n, "head_ref": f"daily-{n}", "head_sha": heads[n]} for n in (2, 3)
+    ]
+    updated = update_branches_locally(prs, cwd=str(checkout))
+
+    # #3 also rewrote the intro main changed, so only #2 can be resolved.
+    assert list(updated) == [2]
+    assert git(origin, "rev-parse", "daily-2") == updated[2]
+    assert git(origin, "rev-parse", "daily-3") == heads[3]
+    git(origin, "merge-base", "--is-ancestor", "main", "daily-2")
+    assert git(origin, "show", "daily-2:README.md") + "\n" == readme(
+        section("2026-04-01"),
+        section("2026-04-02", "morning"),
+        section("2026-04-03", "morning"),
+        preamble=PREAMBLE.replace("Intro.", "Main."),
+    )
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for retries and the circuit breaker in scripts/retry.py.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from github_client import GitHubClient  # noqa: E402
+from retry import CircuitBreaker, CircuitOpenError, RetryPolicy  # noqa: E402
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Answer requests with the next status code, or raise for ``None``."""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request.method)
+        status = self.statuses.pop(0)
+        if status is None:
+            raise requests.exceptions.ConnectionError("connection reset")
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = status
+        response._content = b"{}"
+        return response
+
+    def close(self):
+        pass
+
+
+def make_client(statuses, threshold=5, clock=None):
+    sleeps = []
+    client = GitHubClient(
+        "t",
+        api_url="https://api.test",
+        retry_policy=RetryPolicy(attempts=3, sleep=sleeps.append, rng=lambda: 1.0),
+        circuit_breaker=CircuitBreaker(
+            threshold=threshold, cooldown=60, clock=clock or (lambda: 0.0)
+        ),
+    )
+    adapter = ScriptedAdapter(statuses)
+    client.session.mount("https://", adapter)
+    return client, adapter, sleeps
+
+
+def test_reads_retry_with_exponential_backoff(capsys):
+    client, adapter, sleeps = make_client([502, None, 200])
+    assert client.get("/repos/o/r/pulls/1").status_code == 200
+    assert len(adapter.sent) == 3
+    assert sleeps == [1.0, 2.0]
+    # Retry messages must not end up in a script's (JSON) output.
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert "retry 2/3" in output.err
+
+
+def test_writes_retry_only_when_marked_safe():
+    client, adapter, _ = make_client([502, 200])
+    assert client.put("/repos/o/r/pulls/1/merge", json={}).status_code == 502
+    assert len(adapter.sent) == 1
+
+    response = client.put("/repos/o/r/pulls/1/merge", json={"sha": "abc"}, retry=True)
+    assert response.status_code == 200
+
+
+def test_circuit_opens_and_probes_after_cooldown():
+    now = [0.0]
+    client, adapter, _ = make_client(
+        [503] * 4 + [200], threshold=3, clock=lambda: now[0]
+    )
+    assert client.get("/repos/o/r/pulls/1").status_code == 503
+    assert client.unavailable
+    with pytest.raises(CircuitOpenError):
+        client.get("/repos/o/r/pulls/2")
+    assert len(adapter.sent) == 3
+
+    now[0] = 61.0
+    assert client.get("/repos/o/r/pulls/2").status_code == 503
+    assert client.unavailable
+    now[0] = 122.0
+    assert client.get("/repos/o/r/pulls/2").status_code == 200
+    assert not client.unavailable